@@ -1,24 +1,85 @@
+import numpy as np
 import pandas as pd
 
-def df_quartile(df, criterion, porc=0.25, quartile="first", ascending=True):
+# Porcentajes de las particiones B/W generadas por main.py (2C, 4C, 8C, 16C)
+PORCENTAJES_PARTICIONES = (0.50, 0.25, 0.125, 0.0625)
+
+
+def escalera_potencias(profundidad=4, base=2):
     """
-    Extrae un cuartil/segmento de un DataFrame basado en una columna criterio.
-    
-    Parámetros:
-    - df: DataFrame de pandas con los datos
-    - criterion: Nombre de la columna por la cual ordenar y segmentar
-    - porc: Porcentaje para determinar el tamaño del segmento (como decimal, ej: 0.25 para 25%)
-    - quartile: Tipo de segmento ('first', 'second', 'third', 'fourth', 'center')
-    - ascending: True para orden ascendente, False para descendente
-    
-    Retorna:
-    - DataFrame con el segmento solicitado
+    Escalera de fracciones 1/base, 1/base**2, ..., 1/base**profundidad
+    (ej. profundidad=10 llega hasta 1/1024).
+    """
+    return tuple(1 / base ** i for i in range(1, profundidad + 1))
+
+
+def validar_escalera(escalera):
+    """
+    Verifica que las fracciones estén en (0, 1], sin repetidos, y las
+    retorna ordenadas de mayor a menor.
+    """
+    fracciones = sorted({float(f) for f in escalera}, reverse=True)
+    if not fracciones:
+        raise ValueError("La escalera de fracciones está vacía")
+    if fracciones[-1] <= 0 or fracciones[0] > 1:
+        raise ValueError("Las fracciones de la escalera deben estar en (0, 1]")
+    return tuple(fracciones)
+
+
+def nombre_particion(lado, fraccion):
+    """
+    Nombre de una partición: 'B' o 'W' seguido de 1/fraccion y 'C' cuando es
+    entero (0.25 -> 'B4C'); si no, el porcentaje seguido de 'P' (0.3 -> 'B30P').
+    """
+    divisor = 1 / fraccion
+    if abs(divisor - round(divisor)) < 1e-9:
+        return f"{lado}{int(round(divisor))}C"
+    return f"{lado}{fraccion * 100:g}P".replace('.', '_')
+
+
+def fraccion_particion(nombre):
+    """Operación inversa de nombre_particion: 'B4C' -> 0.25, 'W30P' -> 0.3"""
+    cuerpo = nombre[1:] if nombre[:1] in ('B', 'W') else nombre
+    if cuerpo.endswith('C'):
+        return 1 / int(cuerpo[:-1])
+    if cuerpo.endswith('P'):
+        return float(cuerpo[:-1].replace('_', '.')) / 100
+    raise ValueError(f"Nombre de partición no reconocido: {nombre}")
+
+
+def nombres_escalera(escalera=PORCENTAJES_PARTICIONES, intercalar=True):
+    """
+    Nombres de todas las particiones de la escalera.
+
+    intercalar=True:  ['B2C', 'W2C', 'B4C', 'W4C', ...]
+    intercalar=False: ['B2C', 'B4C', ..., 'W2C', 'W4C', ...]
+    """
+    escalera = validar_escalera(escalera)
+    if intercalar:
+        return [nombre_particion(lado, f) for f in escalera for lado in ('B', 'W')]
+    return [nombre_particion(lado, f) for lado in ('B', 'W') for f in escalera]
+
+
+def pares_escalera(escalera=PORCENTAJES_PARTICIONES):
+    """Pares (Bk, Wk) de la escalera: [('B2C', 'W2C'), ('B4C', 'W4C'), ...]"""
+    return [(nombre_particion('B', f), nombre_particion('W', f)) for f in validar_escalera(escalera)]
+
+
+def texto_escalera(escalera=PORCENTAJES_PARTICIONES):
+    """Leyenda de la escalera: '2C=50%, 4C=25%, 8C=12.5%, 16C=6.25%'"""
+    return ", ".join(f"{nombre_particion('', f)}={f * 100:g}%" for f in validar_escalera(escalera))
+
+
+def _limites_segmento(total_filas, porc, quartile):
+    """
+    Calcula los límites [inicio, fin) de un segmento dentro de una tabla ordenada.
+
+    Mantiene exactamente la aritmética histórica de df_quartile, incluido el
+    desplazamiento de una fila en 'fourth'.
     """
-    
     # 1. Calcular el tamaño base del segmento
-    total_filas = len(df)
     tamaño_q = int(total_filas * porc)
-    
+
     # 2. Determinar los índices de inicio y fin (inclusivos) del segmento
     if quartile == "first" or quartile == "primero":
         indice_inicio = 0
@@ -37,19 +98,225 @@ def df_quartile(df, criterion, porc=0.25, quartile="first", ascending=True):
         indice_fin_inclusivo = int(2.5 * tamaño_q) - 1
     else:
         raise ValueError("quartile debe ser: 'first', 'second', 'third', 'fourth', o 'center'")
-    
-    # 3. Ordenar la tabla de datos
-    df_ordenado = df.sort_values(by=criterion, ascending=ascending).reset_index(drop=True)
-
 
     # Asegurar que los índices estén dentro del rango válido
     indice_fin_inclusivo = min(indice_fin_inclusivo, total_filas - 1)
     indice_inicio = max(0, indice_inicio)
-    
-    if indice_inicio <= indice_fin_inclusivo:
-        df_resultado = df_ordenado.iloc[indice_inicio:indice_fin_inclusivo + 1].copy()
-    else:
+
+    if indice_inicio > indice_fin_inclusivo:
+        return 0, 0
+    return indice_inicio, indice_fin_inclusivo + 1
+
+
+class MotorParticiones:
+    """
+    Ordena una sola vez la columna criterio y entrega cada segmento como una
+    vista (slice) sobre ese único orden.
+
+    Todas las particiones B/W son prefijos del orden descendente/ascendente,
+    así que construirlas con el motor cuesta un solo argsort en lugar de un
+    sort_values y una copia por partición.
+    """
+
+    def __init__(self, df, criterion):
+        self.df = df
+        self.criterion = criterion
+
+        valores = df[criterion].to_numpy()
+        if valores.dtype.kind in 'biuf':
+            # np.argsort deja los NaN al final, igual que sort_values
+            self._orden_asc = np.argsort(valores, kind='stable')
+            self._n_validos = len(valores)
+            if valores.dtype.kind == 'f':
+                self._n_validos -= int(np.isnan(valores).sum())
+        else:
+            serie = df[criterion].reset_index(drop=True)
+            self._orden_asc = serie.sort_values(kind='stable').index.to_numpy()
+            self._n_validos = int(serie.notna().sum())
+        self._orden_desc = None
+
+    def __len__(self):
+        return len(self._orden_asc)
+
+    @property
+    def n_validos(self):
+        """Número de filas con valor no faltante en el criterio"""
+        return self._n_validos
+
+    def orden(self, ascending=True):
+        """
+        Retorna las posiciones de las filas en el orden solicitado.
+
+        Los valores faltantes quedan siempre al final, como en sort_values.
+        """
+        if ascending:
+            return self._orden_asc
+        if self._orden_desc is None:
+            if self._n_validos == len(self._orden_asc):
+                # Sin faltantes el orden descendente es una vista invertida
+                self._orden_desc = self._orden_asc[::-1]
+            else:
+                self._orden_desc = np.concatenate([
+                    self._orden_asc[:self._n_validos][::-1],
+                    self._orden_asc[self._n_validos:]
+                ])
+        return self._orden_desc
+
+    def limites(self, porc=0.25, quartile="first"):
+        """Límites [inicio, fin) del segmento dentro del orden"""
+        return _limites_segmento(len(self), porc, quartile)
+
+    def indices(self, porc=0.25, quartile="first", ascending=True):
+        """
+        Retorna las posiciones (iloc) de las filas del segmento.
+
+        El resultado es una vista sobre el orden compartido, no una copia.
+        """
+        inicio, fin = self.limites(porc, quartile)
+        return self.orden(ascending)[inicio:fin]
+
+    def segmento(self, porc=0.25, quartile="first", ascending=True):
+        """
+        Materializa el segmento como DataFrame, con el mismo formato que
+        devolvía df_quartile (índice consecutivo desde la posición de inicio).
+        """
+        inicio, fin = self.limites(porc, quartile)
+        if inicio >= fin:
+            # Retornar DataFrame vacío si los índices no son válidos
+            return pd.DataFrame(columns=self.df.columns)
+
+        df_resultado = self.df.iloc[self.orden(ascending)[inicio:fin]]
+        df_resultado.index = pd.RangeIndex(inicio, fin)
+        return df_resultado
+
+    def particiones(self, porcentajes=PORCENTAJES_PARTICIONES, quartile="first"):
+        """
+        Retorna un diccionario {nombre: posiciones} con las particiones B
+        (mayores, orden descendente) y W (menores, orden ascendente) de
+        cualquier escalera de fracciones.
+
+        Todas son vistas del mismo orden: O(n log n) una vez más O(1) por
+        partición.
+        """
+        resultado = {}
+        for porc in validar_escalera(porcentajes):
+            resultado[nombre_particion('B', porc)] = self.indices(porc, quartile, ascending=False)
+            resultado[nombre_particion('W', porc)] = self.indices(porc, quartile, ascending=True)
+        return resultado
+
+
+def seleccionar_segmento(df, criterion, porc=0.25, quartile="first", ascending=True, ordenar=True):
+    """
+    Extrae el mismo segmento que df_quartile mediante selección parcial
+    (np.argpartition) en tiempo lineal, sin ordenar toda la tabla.
+
+    Parámetros:
+    - df, criterion, porc, quartile, ascending: igual que en df_quartile
+    - ordenar: si es True, ordena solo las k filas seleccionadas (O(k log k));
+      si es False, se devuelven en un orden arbitrario
+
+    Nota: ante empates exactamente en el borde del segmento, las filas
+    elegidas entre las empatadas pueden diferir de las del ordenamiento
+    completo; los valores del criterio son siempre los mismos. Los NaN
+    quedan al final en su orden original, como en sort_values.
+    """
+    total_filas = len(df)
+    inicio, fin = _limites_segmento(total_filas, porc, quartile)
+    if inicio >= fin:
         # Retornar DataFrame vacío si los índices no son válidos
-        df_resultado = pd.DataFrame(columns=df.columns)
-    
+        return pd.DataFrame(columns=df.columns)
+
+    valores = df[criterion].to_numpy()
+    if valores.dtype.kind not in 'biuf':
+        # Sin orden numérico directo: recurrir al ordenamiento completo
+        return MotorParticiones(df, criterion).segmento(porc, quartile, ascending)
+
+    invertir = False
+    if ascending:
+        claves, a, b = valores, inicio, fin
+    elif valores.dtype.kind == 'f':
+        # Negar mantiene los NaN al final, igual que sort_values
+        claves, a, b = -valores, inicio, fin
+    else:
+        # Enteros/booleanos (sin faltantes): el segmento descendente es el
+        # segmento ascendente espejado
+        claves, a, b = valores, total_filas - fin, total_filas - inicio
+        invertir = True
+
+    faltantes = None
+    if valores.dtype.kind == 'f':
+        nulos = np.isnan(valores)
+        if nulos.any():
+            # Los NaN van al final en su orden original, igual que sort_values:
+            # solo se seleccionan los valores presentes
+            posiciones, faltantes = np.flatnonzero(~nulos), np.flatnonzero(nulos)
+            a_faltantes = max(a - len(posiciones), 0)
+            b_faltantes = max(b - len(posiciones), 0)
+            b = min(b, len(posiciones))
+
+    if faltantes is None:
+        kth = sorted({a, b - 1})
+        indices = np.argpartition(claves, kth)[a:b]
+    elif a < b:
+        kth = sorted({a, b - 1})
+        indices = posiciones[np.argpartition(claves[posiciones], kth)[a:b]]
+    else:
+        indices = posiciones[:0]
+    if ordenar:
+        indices = indices[np.argsort(claves[indices], kind='stable')]
+    if faltantes is not None:
+        indices = np.concatenate([indices, faltantes[a_faltantes:b_faltantes]])
+    if invertir:
+        indices = indices[::-1]
+
+    df_resultado = df.iloc[indices]
+    df_resultado.index = pd.RangeIndex(inicio, fin)
     return df_resultado
+
+
+def particionar(df, criterion, porcentajes=PORCENTAJES_PARTICIONES, quartile="first"):
+    """
+    Construye todas las particiones B/W de una escalera de fracciones con un
+    único ordenamiento.
+
+    Retorna un diccionario {nombre: DataFrame} (ej. 'B2C', 'W2C', ...).
+    """
+    motor = MotorParticiones(df, criterion)
+    resultado = {}
+    for porc in validar_escalera(porcentajes):
+        resultado[nombre_particion('B', porc)] = motor.segmento(porc, quartile, ascending=False)
+        resultado[nombre_particion('W', porc)] = motor.segmento(porc, quartile, ascending=True)
+    return resultado
+
+
+def df_quartile(df, criterion, porc=0.25, quartile="first", ascending=True, motor=None,
+                metodo="orden", ordenar=True):
+    """
+    Extrae un cuartil/segmento de un DataFrame basado en una columna criterio.
+
+    Parámetros:
+    - df: DataFrame de pandas con los datos
+    - criterion: Nombre de la columna por la cual ordenar y segmentar
+    - porc: Porcentaje para determinar el tamaño del segmento (como decimal, ej: 0.25 para 25%)
+    - quartile: Tipo de segmento ('first', 'second', 'third', 'fourth', 'center')
+    - ascending: True para orden ascendente, False para descendente
+    - motor: MotorParticiones ya construido sobre (df, criterion) para reutilizar
+      el ordenamiento entre llamadas (opcional)
+    - metodo: 'orden' (ordenamiento completo, O(n log n)) o 'seleccion'
+      (selección parcial con np.argpartition, O(n)); si se pasa un motor se
+      reutiliza su orden
+    - ordenar: con metodo='seleccion', ordena solo las filas del segmento
+
+    Retorna:
+    - DataFrame con el segmento solicitado
+    """
+    if metodo not in ("orden", "seleccion"):
+        raise ValueError("metodo debe ser: 'orden' o 'seleccion'")
+
+    if metodo == "seleccion" and motor is None:
+        return seleccionar_segmento(df, criterion, porc, quartile, ascending, ordenar)
+
+    if motor is None:
+        motor = MotorParticiones(df, criterion)
+
+    return motor.segmento(porc, quartile, ascending)
@@ -0,0 +1,152 @@
+# almacen_particiones.py
+import numpy as np
+import pandas as pd
+import json
+import os
+from alg import MotorParticiones, PORCENTAJES_PARTICIONES, validar_escalera, nombre_particion
+from columnar import EscritorColumnar, abrir_columnas
+
+# Carpeta por defecto del almacén dentro de data/
+CARPETA_ALMACEN = os.path.join('data', 'almacen')
+ARCHIVO_PARTICIONES = 'particiones.json'
+ARCHIVO_ORDEN = 'orden_original.npy'
+
+
+def existe_almacen(carpeta=CARPETA_ALMACEN):
+    """Indica si hay un almacén de particiones en la carpeta"""
+    return os.path.exists(os.path.join(carpeta, ARCHIVO_PARTICIONES))
+
+
+def guardar_almacen(df, criterion='target_y', carpeta=CARPETA_ALMACEN,
+                    porcentajes=PORCENTAJES_PARTICIONES, dtype='float64'):
+    """
+    Guarda la tabla base una sola vez y describe cada partición B/W como un
+    rango de filas sobre ella.
+
+    La tabla se almacena ordenada de forma descendente por el criterio, de
+    modo que Bk son las primeras filas y Wk las últimas (leídas en sentido
+    inverso). Solo se guardan las columnas numéricas.
+
+    Retorna:
+    - diccionario {nombre: (inicio, fin, invertido)}
+    """
+    df_numerico = df.select_dtypes(include=[np.number])
+    motor = MotorParticiones(df_numerico, criterion)
+    orden = np.asarray(motor.orden(ascending=False))
+    n_filas = len(orden)
+    n_validos = motor.n_validos
+
+    # Tabla base (una sola copia) en orden descendente del criterio
+    escritor = EscritorColumnar(carpeta, df_numerico.columns, n_filas, dtype=dtype)
+    tam_bloque = 1_000_000
+    for inicio in range(0, n_filas, tam_bloque):
+        bloque = df_numerico.iloc[orden[inicio:inicio + tam_bloque]]
+        escritor.escribir(bloque.to_numpy(dtype=dtype))
+    escritor.cerrar(metadatos={'criterio': criterion})
+
+    # Posición original de cada fila almacenada (para restaurar el orden)
+    np.save(os.path.join(carpeta, ARCHIVO_ORDEN), orden)
+
+    porcentajes = validar_escalera(porcentajes)
+    particiones = {'df_original': (0, n_filas, False)}
+    for porc in porcentajes:
+        inicio, fin = motor.limites(porc, "first")
+        if fin > n_validos:
+            raise ValueError(f"La partición {porc} incluye filas con '{criterion}' faltante")
+        particiones[nombre_particion('B', porc)] = (inicio, fin, False)
+        # Wk en orden ascendente: las últimas filas válidas leídas al revés
+        particiones[nombre_particion('W', porc)] = (n_validos - fin, n_validos - inicio, True)
+
+    descripcion = {
+        'criterio': criterion,
+        'n_filas': n_filas,
+        'porcentajes': list(porcentajes),
+        'particiones': {
+            nombre: {'inicio': int(i), 'fin': int(f), 'invertido': inv}
+            for nombre, (i, f, inv) in particiones.items()
+        }
+    }
+    with open(os.path.join(carpeta, ARCHIVO_PARTICIONES), 'w', encoding='utf-8') as f:
+        json.dump(descripcion, f, indent=2)
+
+    print(f"Almacén de particiones guardado: {carpeta} "
+          f"({n_filas} filas, {len(particiones)} particiones)")
+    return particiones
+
+
+def escalera_actual(carpeta=CARPETA_ALMACEN):
+    """
+    Escalera de fracciones con la que se generaron las particiones: la del
+    almacén si existe, o la escalera por defecto de main.py.
+    """
+    if existe_almacen(carpeta):
+        return validar_escalera(leer_particiones(carpeta)['porcentajes'])
+    return PORCENTAJES_PARTICIONES
+
+
+def leer_particiones(carpeta=CARPETA_ALMACEN):
+    """Lee la descripción de particiones del almacén"""
+    with open(os.path.join(carpeta, ARCHIVO_PARTICIONES), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def leer_orden_original(carpeta=CARPETA_ALMACEN):
+    """
+    Posición original de cada fila almacenada: la fila i de la tabla base
+    era la fila orden[i] del DataFrame que recibió guardar_almacen
+    """
+    return np.load(os.path.join(carpeta, ARCHIVO_ORDEN))
+
+
+def cargar_particion(nombre, carpeta=CARPETA_ALMACEN, columnas=None, descripcion=None,
+                     orden_original=True):
+    """
+    Materializa una partición como DataFrame sin copiar datos: cada columna
+    es una vista del archivo mapeado en memoria (solo lectura).
+
+    La tabla base está en orden descendente del criterio. Para 'df_original'
+    con orden_original=True las filas se devuelven en el orden de la tabla
+    que se guardó (con orden_original.npy); esto sí copia las columnas.
+    """
+    if descripcion is None:
+        descripcion = leer_particiones(carpeta)
+    if nombre not in descripcion['particiones']:
+        raise KeyError(f"Partición '{nombre}' no encontrada en {carpeta}")
+
+    rango = descripcion['particiones'][nombre]
+    corte = slice(rango['inicio'], rango['fin'])
+
+    if nombre == 'df_original' and orden_original:
+        # Fila almacenada que ocupaba cada posición original
+        orden = leer_orden_original(carpeta)
+        inverso = np.empty_like(orden)
+        inverso[orden] = np.arange(len(orden))
+        return pd.DataFrame({col: mapa[inverso]
+                             for col, mapa in abrir_columnas(carpeta, columnas).items()})
+
+    vistas = {}
+    for col, mapa in abrir_columnas(carpeta, columnas).items():
+        vista = mapa[corte]
+        vistas[col] = vista[::-1] if rango['invertido'] else vista
+
+    # copy=False conserva un bloque por columna apuntando al memmap
+    return pd.DataFrame(vistas, copy=False)
+
+
+def cargar_almacen(carpeta=CARPETA_ALMACEN, nombres=None, columnas=None, orden_original=True):
+    """
+    Carga varias particiones del almacén como vistas (df_original en su
+    orden original salvo orden_original=False; ver cargar_particion).
+
+    Retorna:
+    - diccionario {nombre: DataFrame}
+    """
+    descripcion = leer_particiones(carpeta)
+    if nombres is None:
+        nombres = list(descripcion['particiones'])
+
+    return {
+        nombre: cargar_particion(nombre, carpeta, columnas, descripcion, orden_original)
+        for nombre in nombres
+        if nombre in descripcion['particiones']
+    }
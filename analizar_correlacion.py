@@ -4,6 +4,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 from analizar_datasets import dataframes
+from alg import nombres_escalera
+from almacen_particiones import escalera_actual
 from typing import List, Tuple
 
 def configurar_estilos():
@@ -272,7 +274,7 @@ def main():
     print("=" * 70)
     
     # CONFIGURACIÓN
-    DATASETS_A_ANALIZAR = ['df_original', 'B2C', 'B4C', 'B8C', 'B16C', 'W2C', 'W4C', 'W8C', 'W16C']  # Matriz .npz
+    DATASETS_A_ANALIZAR = ['df_original'] + nombres_escalera(escalera_actual(), intercalar=False)  # Matriz .npz
     
     # Configurar estilos
     configurar_estilos()
@@ -1,61 +1,179 @@
+import numpy as np
 import pandas as pd
+import mmap
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from almacen_particiones import existe_almacen, leer_particiones, cargar_particion, CARPETA_ALMACEN
+from columnar import cargar_tabla
+from alg import nombres_escalera
+
+# Datasets del pipeline (nombre -> archivo CSV dentro de data/) cuando no hay almacén
+NOMBRES_DATASETS = ['df_original'] + nombres_escalera()
+
+# Límite de memoria por defecto de la caché del registro (bytes)
+MAX_BYTES_CACHE = 512 * 2**20
+
+
+def _mapeado(arreglo):
+    """True si el arreglo es una vista de un archivo mapeado en memoria"""
+    while arreglo is not None:
+        if isinstance(arreglo, (np.memmap, mmap.mmap)):
+            return True
+        arreglo = getattr(arreglo, 'base', None)
+    return False
+
+
+def bytes_propios(df):
+    """
+    Bytes que el DataFrame ocupa en memoria propia: omite las columnas que
+    son vistas de archivos mapeados (almacén de particiones, columnar), que
+    el sistema operativo puede liberar y no cuentan para la caché.
+    """
+    total = 0
+    for j in range(df.shape[1]):
+        columna = df.iloc[:, j]
+        if not _mapeado(columna.to_numpy(copy=False)):
+            total += int(columna.memory_usage(index=False))
+    return total
+
+
+class RegistroDatasets(Mapping):
+    """
+    Registro perezoso de los datasets del pipeline.
+
+    Cada partición se carga la primera vez que se accede a ella y queda
+    memorizada; cuando la caché supera max_bytes de memoria propia (ver
+    bytes_propios; las columnas mapeadas no cuentan) o max_entradas, se desaloja
+    la usada hace más tiempo (LRU). Se registran los tiempos de carga y los
+    aciertos/fallos de la caché.
+    """
+
+    def __init__(self, carpeta_datos='data', max_bytes=MAX_BYTES_CACHE, max_entradas=None,
+                 con_etiqueta=False):
+        self.carpeta_datos = carpeta_datos
+        self.max_bytes = max_bytes
+        self.max_entradas = max_entradas
+        self.con_etiqueta = con_etiqueta
+
+        self._cache = OrderedDict()
+        self._tamanos = {}
+        self.tiempos = {}
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def _carpeta_almacen(self):
+        return os.path.join(self.carpeta_datos, os.path.basename(CARPETA_ALMACEN))
+
+    def nombres(self):
+        """Nombres disponibles, sin cargar ningún dataset"""
+        if existe_almacen(self._carpeta_almacen()):
+            return list(leer_particiones(self._carpeta_almacen())['particiones'])
+        return [
+            nombre for nombre in NOMBRES_DATASETS
+            if os.path.exists(os.path.join(self.carpeta_datos, f"{nombre}.csv"))
+            or os.path.exists(os.path.join(self.carpeta_datos, 'columnar', nombre))
+        ]
+
+    def _cargar(self, nombre):
+        if existe_almacen(self._carpeta_almacen()):
+            df = cargar_particion(nombre, self._carpeta_almacen())
+        else:
+            df = cargar_tabla(os.path.join(self.carpeta_datos, f"{nombre}.csv"))
+
+        if self.con_etiqueta:
+            # insert no copia las columnas mapeadas
+            df.insert(len(df.columns), 'Label', 'df' if nombre == 'df_original' else nombre)
+        return df
+
+    def _desalojar(self):
+        while len(self._cache) > 1 and (
+            (self.max_bytes is not None and sum(self._tamanos.values()) > self.max_bytes)
+            or (self.max_entradas is not None and len(self._cache) > self.max_entradas)
+        ):
+            nombre, _ = self._cache.popitem(last=False)
+            del self._tamanos[nombre]
+            self.desalojos += 1
+
+    def __getitem__(self, nombre):
+        if nombre in self._cache:
+            self._cache.move_to_end(nombre)
+            self.aciertos += 1
+            return self._cache[nombre]
+
+        if nombre not in self.nombres():
+            raise KeyError(nombre)
+
+        inicio = time.perf_counter()
+        df = self._cargar(nombre)
+        self.tiempos.setdefault(nombre, []).append(time.perf_counter() - inicio)
+        self.fallos += 1
+
+        self._cache[nombre] = df
+        self._tamanos[nombre] = bytes_propios(df)
+        self._desalojar()
+        return df
+
+    def __contains__(self, nombre):
+        return nombre in self._cache or nombre in self.nombres()
+
+    def __iter__(self):
+        return iter(self.nombres())
+
+    def __len__(self):
+        return len(self.nombres())
+
+    def limpiar(self):
+        """Vacía la caché (los contadores y tiempos se conservan)"""
+        self._cache.clear()
+        self._tamanos.clear()
+
+    def reporte_tiempos(self):
+        """
+        Retorna un DataFrame con las cargas realizadas por dataset y el
+        estado de la caché.
+        """
+        filas = []
+        for nombre, tiempos in self.tiempos.items():
+            filas.append({
+                'dataset': nombre,
+                'cargas': len(tiempos),
+                'tiempo_total_s': sum(tiempos),
+                'tiempo_medio_s': sum(tiempos) / len(tiempos),
+                'en_cache': nombre in self._cache,
+                'bytes': self._tamanos.get(nombre, 0)
+            })
+        print(f"Caché: {self.aciertos} aciertos, {self.fallos} fallos, {self.desalojos} desalojos")
+        return pd.DataFrame(filas)
+
+
+# Registro global: los datasets se cargan al primer acceso, no al importar
+dataframes = RegistroDatasets()
 
-# Definir dataframes como variable global al nivel del módulo
-dataframes = {}
 
-# Código de carga que se ejecuta cuando se importa el módulo
 def cargar_datasets():
-    global dataframes
-    
-    # Cargar los diferentes CSV
+    """
+    Carga por adelantado todos los datasets en el registro global
+    (equivalente a la carga al importar de versiones anteriores).
+    """
     try:
-        df_copy = pd.read_csv('data/df_original.csv')
-        B2C = pd.read_csv('data/B2C.csv')
-        W2C = pd.read_csv('data/W2C.csv')
-        B4C = pd.read_csv('data/B4C.csv')
-        W4C = pd.read_csv('data/W4C.csv')
-        B8C = pd.read_csv('data/B8C.csv')
-        W8C = pd.read_csv('data/W8C.csv')
-        B16C = pd.read_csv('data/B16C.csv')
-        W16C = pd.read_csv('data/W16C.csv')
-        
-        # Asignar etiquetas a cada DataFrame
-        df_copy['Label'] = 'df'
-        B2C['Label'] = 'B2C'
-        W2C['Label'] = 'W2C'
-        B4C['Label'] = 'B4C'
-        W4C['Label'] = 'W4C'
-        B8C['Label'] = 'B8C'
-        W8C['Label'] = 'W8C'
-        B16C['Label'] = 'B16C'
-        W16C['Label'] = 'W16C'
-        
-        # Diccionario para procesar cada DataFrame
-        dataframes = {
-            'df_original': df_copy,
-            'B2C': B2C,
-            'W2C': W2C,
-            'B4C': B4C,
-            'W4C': W4C,
-            'B8C': B8C,
-            'W8C': W8C,
-            'B16C': B16C,
-            'W16C': W16C
-        }
-        
+        for nombre in dataframes.nombres():
+            dataframes[nombre]
+
         print("Datasets cargados exitosamente:")
         for nombre, df in dataframes.items():
             print(f"   {nombre}: {df.shape}")
-            
+
     except FileNotFoundError as e:
         print(f"Error: No se encontraron los archivos CSV. Ejecuta primero main.py")
         print(f"Detalle: {e}")
     except Exception as e:
         print(f"Error cargando datasets: {e}")
 
-# Cargar datasets automáticamente cuando se importe el módulo
-cargar_datasets()
-
 if __name__ == "__main__":
     # Código adicional si se ejecuta este archivo directamente
-    print("Ejecutando analizar_datasets.py directamente")
\ No newline at end of file
+    print("Ejecutando analizar_datasets.py directamente")
+    cargar_datasets()
+    print(dataframes.reporte_tiempos().to_string(index=False))
@@ -4,6 +4,8 @@ import networkx as nx
 import os
 import re
 from datetime import datetime
+from alg import nombres_escalera
+from almacen_particiones import escalera_actual
 
 def cargar_arbol_enraizado(ruta_archivo):
     """
@@ -29,17 +31,17 @@ def extraer_configuracion_archivo(nombre_archivo):
     """
     # Patrones para detectar la configuración
     patrones = [
-        r'(B|W)(\d+)C',  # B4C, W2C, etc.
-        r'reducido_(B|W)(\d+)C',  # arbol_reducido_B4C...
-        r'enraizado_(B|W)(\d+)C'  # arbol_enraizado_B4C...
+        r'(B|W)(\d+C|[\d_]+P)',  # B4C, W2C, B30P, etc.
+        r'reducido_(B|W)(\d+C|[\d_]+P)',  # arbol_reducido_B4C...
+        r'enraizado_(B|W)(\d+C|[\d_]+P)'  # arbol_enraizado_B4C...
     ]
     
     for patron in patrones:
         match = re.search(patron, nombre_archivo)
         if match:
             tipo = match.group(1)  # B o W
-            qrtl = match.group(2)  # 2, 4, 8, 16
-            return f"{tipo}{qrtl}C"
+            qrtl = match.group(2)  # 2C, 4C, 8C, 16C, ...
+            return f"{tipo}{qrtl}"
     
     # Si no encuentra patrón, usar el nombre del archivo sin extensión
     return nombre_archivo.replace('.gml', '')
@@ -385,8 +387,8 @@ def procesar_todas_configuraciones(profundidad="prof1", limite_bfs=3, limite_dfs
     print(f"Límite BFS: {limite_bfs} niveles | Límite DFS: {limite_dfs} niveles")
     print("=" * 80)
     
-    # Lista de todas las configuraciones a procesar
-    configuraciones = ['B2C', 'B4C', 'B8C', 'B16C', 'W2C', 'W4C', 'W8C', 'W16C']
+    # Configuraciones descubiertas a partir de la escalera de fracciones
+    configuraciones = nombres_escalera(escalera_actual(), intercalar=False)
     
     resultados_totales = []
     archivos_procesados = []
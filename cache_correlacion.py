@@ -0,0 +1,154 @@
+# cache_correlacion.py
+import numpy as np
+import pandas as pd
+import hashlib
+import json
+import os
+import time
+from matriz_compacta import guardar_matriz_compacta, MatrizCompacta, EXTENSION_TRIANGULO, EXTENSION_ETIQUETAS
+
+# Carpeta de la caché dentro de resultado_correlacion/
+CARPETA_CACHE = os.path.join('resultado_correlacion', 'cache')
+ARCHIVO_INDICE = 'indice.json'
+
+# Límite por defecto del tamaño de la caché en disco (bytes)
+MAX_BYTES_CACHE = 2 * 2**30
+
+# Elementos por trozo al recorrer una columna para el hash
+_TROZO_HASH = 1 << 20
+
+
+def huella_dataframe(df):
+    """
+    Hash blake2b del contenido numérico de un DataFrame (nombres, tipos y
+    valores de cada columna). Las columnas se recorren por trozos, así que
+    no se copia la tabla aunque sus columnas sean vistas de un memmap.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    df_numerico = df.select_dtypes(include=[np.number])
+    h.update(repr(df_numerico.shape).encode())
+    for col in df_numerico.columns:
+        valores = df_numerico[col].to_numpy()
+        h.update(str(col).encode())
+        h.update(valores.dtype.str.encode())
+        for inicio in range(0, len(valores), _TROZO_HASH):
+            h.update(np.ascontiguousarray(valores[inicio:inicio + _TROZO_HASH]).data)
+    return h.hexdigest()
+
+
+def huella_archivo(ruta):
+    """
+    Huella rápida de un archivo sin leerlo: ruta absoluta, tamaño y fecha de
+    modificación. Sirve cuando los datos se identifican por el CSV de origen.
+    """
+    estado = os.stat(ruta)
+    return f"{os.path.abspath(ruta)}:{estado.st_size}:{estado.st_mtime_ns}"
+
+
+class CacheCorrelacion:
+    """
+    Caché en disco de matrices de correlación/distancia direccionada por
+    contenido: la clave combina la huella de los datos de entrada con el
+    método y los parámetros del cálculo.
+
+    Cada entrada se guarda como matriz compacta (ver matriz_compacta.py) y
+    un índice JSON registra tamaño y último uso. Cuando el total supera
+    max_bytes se eliminan las entradas usadas hace más tiempo (LRU).
+    """
+
+    def __init__(self, carpeta=CARPETA_CACHE, max_bytes=MAX_BYTES_CACHE, precision='float64'):
+        if not os.path.exists(carpeta):
+            os.makedirs(carpeta)
+        self.carpeta = carpeta
+        self.max_bytes = max_bytes
+        self.precision = precision
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self._indice = self._leer_indice()
+
+    def _ruta_indice(self):
+        return os.path.join(self.carpeta, ARCHIVO_INDICE)
+
+    def _leer_indice(self):
+        if not os.path.exists(self._ruta_indice()):
+            return {}
+        try:
+            with open(self._ruta_indice(), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            # Un índice dañado solo invalida la caché
+            return {}
+
+    def _guardar_indice(self):
+        temporal = f"{self._ruta_indice()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(self._indice, f, indent=2, ensure_ascii=False)
+        os.replace(temporal, self._ruta_indice())
+
+    @staticmethod
+    def clave(huella, metodo, **parametros):
+        """Clave de una entrada: huella de los datos + método + parámetros"""
+        contenido = json.dumps({'huella': huella, 'metodo': metodo, 'parametros': parametros},
+                               sort_keys=True, default=str)
+        return hashlib.blake2b(contenido.encode(), digest_size=16).hexdigest()
+
+    def _archivos(self, clave):
+        base = os.path.join(self.carpeta, clave)
+        return f"{base}{EXTENSION_TRIANGULO}", f"{base}{EXTENSION_ETIQUETAS}"
+
+    def __contains__(self, clave):
+        return clave in self._indice and os.path.exists(self._archivos(clave)[0])
+
+    def obtener(self, clave):
+        """Retorna la matriz (DataFrame) de la clave, o None si no está"""
+        if clave not in self:
+            self._indice.pop(clave, None)
+            self.fallos += 1
+            return None
+
+        matriz = MatrizCompacta(self._archivos(clave)[0]).a_dataframe()
+        self._indice[clave]['ultimo_uso'] = time.time()
+        self._guardar_indice()
+        self.aciertos += 1
+        return matriz
+
+    def guardar(self, clave, matriz, descripcion=None):
+        """Guarda una matriz (DataFrame simétrico) bajo la clave"""
+        guardar_matriz_compacta(matriz, clave, self.carpeta, dtype=self.precision)
+        self._indice[clave] = {
+            'bytes': sum(os.path.getsize(ruta) for ruta in self._archivos(clave)),
+            'ultimo_uso': time.time(),
+            'descripcion': descripcion or ''
+        }
+        self._desalojar()
+        self._guardar_indice()
+
+    def _desalojar(self):
+        total = sum(entrada['bytes'] for entrada in self._indice.values())
+        for clave in sorted(self._indice, key=lambda c: self._indice[c]['ultimo_uso']):
+            if total <= self.max_bytes or len(self._indice) <= 1:
+                break
+            total -= self._indice.pop(clave)['bytes']
+            for ruta in self._archivos(clave):
+                if os.path.exists(ruta):
+                    os.remove(ruta)
+            self.desalojos += 1
+
+    def limpiar(self):
+        """Elimina todas las entradas de la caché"""
+        for clave in list(self._indice):
+            for ruta in self._archivos(clave):
+                if os.path.exists(ruta):
+                    os.remove(ruta)
+        self._indice = {}
+        self._guardar_indice()
+
+    def reporte(self):
+        """DataFrame con las entradas de la caché y resumen de aciertos/fallos"""
+        print(f"Caché de correlación: {self.aciertos} aciertos, {self.fallos} fallos, "
+              f"{self.desalojos} desalojos, "
+              f"{sum(e['bytes'] for e in self._indice.values()) / 2**20:.1f} MB en disco")
+        return pd.DataFrame([
+            {'clave': clave, **entrada} for clave, entrada in self._indice.items()
+        ])
@@ -0,0 +1,288 @@
+# cache_layout.py
+import numpy as np
+import networkx as nx
+import hashlib
+import json
+import os
+import time
+
+# Carpeta de las posiciones guardadas (una entrada .npz + .json por layout)
+CARPETA_LAYOUT = 'cache_layout'
+
+# Índice de las entradas (una línea JSON por layout guardado, solo se agrega)
+ARCHIVO_INDICE = 'indice.jsonl'
+
+# Layouts disponibles; los de fuerzas aceptan posiciones iniciales (arranque en caliente)
+ALGORITMOS_LAYOUT = {
+    'spring': nx.spring_layout,
+    'kamada_kawai': nx.kamada_kawai_layout,
+    'circular': nx.circular_layout
+}
+ALGORITMOS_FUERZAS = ('spring', 'kamada_kawai')
+
+# Fracción mínima de nodos compartidos (Jaccard) para arrancar desde otro layout
+MIN_SOLAPAMIENTO = 0.5
+
+# Layouts recientes que se revisan al buscar un arranque en caliente
+MAX_CANDIDATOS = 32
+
+# Layouts guardados como máximo (se eliminan los usados hace más tiempo)
+MAX_LAYOUTS = 1000
+
+# Al podar se deja la carpeta en esta fracción de max_layouts, para no
+# volver a podar en cada guardado
+FRACCION_PODA = 0.9
+
+# Índice leído por carpeta: {carpeta: {'posicion', 'id', 'entradas'}}
+_INDICES = {}
+
+
+def _huella_nodos(nodos):
+    h = hashlib.blake2b(digest_size=16)
+    for nodo in sorted(nodos):
+        h.update(nodo.encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def _huella_aristas(G, peso):
+    """Hash de las aristas con su peso (el layout de fuerzas depende del peso)"""
+    h = hashlib.blake2b(digest_size=16)
+    aristas = []
+    for u, v, datos in G.edges(data=True):
+        u, v = str(u), str(v)
+        if not G.is_directed() and v < u:
+            u, v = v, u
+        valor = datos.get(peso, 1) if peso else 1
+        aristas.append((u, v, repr(round(float(valor), 12))))
+    for arista in sorted(aristas):
+        h.update('\0'.join(arista).encode())
+        h.update(b'\n')
+    return h.hexdigest()
+
+
+def clave_layout(G, algoritmo, **parametros):
+    """
+    Clave de un layout: conjunto de nodos, aristas (con peso), algoritmo y
+    parámetros
+    """
+    peso = parametros.get('weight', 'weight')
+    contenido = json.dumps({
+        'nodos': _huella_nodos(str(n) for n in G.nodes()),
+        'aristas': _huella_aristas(G, peso),
+        'algoritmo': algoritmo,
+        'parametros': parametros
+    }, sort_keys=True, default=str)
+    return hashlib.blake2b(contenido.encode(), digest_size=16).hexdigest()
+
+
+def _rutas(carpeta, clave):
+    base = os.path.join(carpeta, clave)
+    return f"{base}.npz", f"{base}.json"
+
+
+def _leer_layout(carpeta, clave):
+    """Nodos (como texto) y posiciones (n, d) de una entrada, o None"""
+    ruta_npz, _ = _rutas(carpeta, clave)
+    try:
+        with np.load(ruta_npz) as datos:
+            return datos['nodos'].tolist(), datos['posiciones']
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _guardar_layout(carpeta, clave, nodos, posiciones, descripcion):
+    """
+    Escribe la entrada con archivos temporales y os.replace, así varios
+    procesos (ver render.py) pueden guardar layouts a la vez sin un índice
+    compartido
+    """
+    if not os.path.exists(carpeta):
+        os.makedirs(carpeta)
+    ruta_npz, ruta_json = _rutas(carpeta, clave)
+    temporal = f"{ruta_npz}.{os.getpid()}.tmp.npz"
+    np.savez(temporal, nodos=np.array(nodos, dtype=str), posiciones=posiciones)
+    os.replace(temporal, ruta_npz)
+    temporal = f"{ruta_json}.{os.getpid()}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(descripcion, f, ensure_ascii=False, default=str)
+    os.replace(temporal, ruta_json)
+
+
+def _registrar_indice(carpeta, clave, algoritmo, n_nodos):
+    """
+    Agrega la entrada al índice con una sola escritura en modo append (una
+    línea corta), segura con varios procesos escribiendo a la vez
+    """
+    linea = json.dumps({'clave': clave, 'algoritmo': algoritmo, 'n_nodos': n_nodos,
+                        'fecha': time.time()}) + '\n'
+    with open(os.path.join(carpeta, ARCHIVO_INDICE), 'a', encoding='utf-8') as f:
+        f.write(linea)
+
+
+def _leer_indice(carpeta):
+    """
+    Entradas del índice {clave: {algoritmo, n_nodos, fecha}}. Se guarda lo
+    leído por carpeta y en cada llamada solo se leen las líneas agregadas
+    desde la anterior; si el archivo se reescribió (poda) se lee de nuevo.
+    """
+    ruta = os.path.join(carpeta, ARCHIVO_INDICE)
+    try:
+        estado = os.stat(ruta)
+    except OSError:
+        _INDICES.pop(carpeta, None)
+        return {}
+    actual = _INDICES.get(carpeta)
+    identidad = (estado.st_dev, estado.st_ino)
+    if actual is None or actual['id'] != identidad or estado.st_size < actual['posicion']:
+        actual = _INDICES[carpeta] = {'posicion': 0, 'id': identidad, 'entradas': {}}
+    if estado.st_size > actual['posicion']:
+        with open(ruta, 'rb') as f:
+            f.seek(actual['posicion'])
+            nuevo = f.read()
+        # Una línea a medio escribir por otro proceso se lee la próxima vez
+        completo = nuevo[:nuevo.rfind(b'\n') + 1]
+        actual['posicion'] += len(completo)
+        for linea in completo.splitlines():
+            try:
+                entrada = json.loads(linea)
+                actual['entradas'][entrada.pop('clave')] = entrada
+            except (ValueError, KeyError, AttributeError):
+                continue
+    return actual['entradas']
+
+
+def _buscar_arranque(carpeta, algoritmo, nodos):
+    """
+    (clave, posiciones) de la entrada reciente del mismo algoritmo que
+    comparte más nodos con el grafo (Jaccard >= MIN_SOLAPAMIENTO), o None.
+    Los candidatos salen del índice, sin abrir cada descripción.
+    """
+    n = len(nodos)
+    conjunto = set(nodos)
+    # Solo tamaños compatibles con el solapamiento mínimo
+    candidatos = sorted(
+        ((entrada.get('fecha', 0), clave) for clave, entrada in _leer_indice(carpeta).items()
+         if entrada.get('algoritmo') == algoritmo and
+         MIN_SOLAPAMIENTO * n <= entrada.get('n_nodos', 0) <= n / MIN_SOLAPAMIENTO),
+        reverse=True)
+
+    mejor, mejor_solapamiento = None, MIN_SOLAPAMIENTO
+    for _, clave in candidatos[:MAX_CANDIDATOS]:
+        entrada = _leer_layout(carpeta, clave)
+        if entrada is None:
+            continue
+        nodos_entrada, posiciones = entrada
+        comunes = conjunto.intersection(nodos_entrada)
+        solapamiento = len(comunes) / len(conjunto.union(nodos_entrada))
+        if solapamiento >= mejor_solapamiento:
+            mejor_solapamiento = solapamiento
+            mejor = (clave, {nodo: posiciones[i] for i, nodo in enumerate(nodos_entrada)
+                             if nodo in comunes})
+    return mejor
+
+
+def _podar(carpeta, max_layouts):
+    """
+    Elimina las entradas usadas hace más tiempo hasta dejar FRACCION_PODA *
+    max_layouts y reescribe el índice con las que quedan. Es lo único que
+    lista la carpeta, así que también recupera entradas que el índice no
+    tenga.
+    """
+    archivos = [f for f in os.listdir(carpeta) if f.endswith('.npz') and '.tmp' not in f]
+    objetivo = int(max_layouts * FRACCION_PODA)
+    archivos.sort(key=lambda f: os.path.getmtime(os.path.join(carpeta, f)))
+    for archivo in archivos[:max(0, len(archivos) - objetivo)]:
+        for ruta in _rutas(carpeta, archivo[:-len('.npz')]):
+            if os.path.exists(ruta):
+                os.remove(ruta)
+
+    indice = _leer_indice(carpeta)
+    lineas = []
+    for archivo in archivos[max(0, len(archivos) - objetivo):]:
+        clave = archivo[:-len('.npz')]
+        entrada = indice.get(clave)
+        if entrada is None:
+            try:
+                with open(_rutas(carpeta, clave)[1], encoding='utf-8') as f:
+                    descripcion = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            entrada = {'algoritmo': descripcion.get('algoritmo'),
+                       'n_nodos': descripcion.get('n_nodos', 0),
+                       'fecha': descripcion.get('fecha', 0)}
+        lineas.append(json.dumps({'clave': clave, **entrada}) + '\n')
+    ruta = os.path.join(carpeta, ARCHIVO_INDICE)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        f.writelines(lineas)
+    os.replace(temporal, ruta)
+    _INDICES.pop(carpeta, None)
+
+
+def posiciones(G, algoritmo='spring', carpeta=CARPETA_LAYOUT, tibio=False, fraccion_tibio=0.3,
+               max_layouts=MAX_LAYOUTS, **parametros):
+    """
+    Posiciones de los nodos de G con caché persistente en disco.
+
+    - Si ya se calculó un layout con los mismos nodos, aristas (y pesos),
+      algoritmo y parámetros, se reutiliza (entre etapas y ejecuciones).
+    - Si no, y tibio=True, un layout de fuerzas arranca desde las
+      posiciones de la entrada guardada que comparte más nodos (por ejemplo
+      el grafo de mst_kruskal para su MST en modularidad_mst) y usa solo
+      fraccion_tibio de las iteraciones. El resultado depende entonces de
+      lo que haya en la caché: es opcional, se guarda con otra clave que
+      el layout completo y su descripción registra la clave de origen
+      ('arranque_desde').
+    - El resultado se guarda para la próxima vez; la carpeta se poda cuando
+      el índice pasa de max_layouts entradas.
+
+    Parámetros:
+    - algoritmo: 'spring', 'kamada_kawai' o 'circular'
+    - parametros: los del layout de networkx (k, iterations, seed, ...)
+
+    Retorna:
+    - diccionario {nodo: array([x, y])}, como nx.spring_layout
+    """
+    if algoritmo not in ALGORITMOS_LAYOUT:
+        raise ValueError(f"algoritmo debe ser uno de: {', '.join(ALGORITMOS_LAYOUT)}")
+
+    nodos = list(G.nodes())
+    if not nodos:
+        return {}
+    texto = [str(n) for n in nodos]
+    original = dict(zip(texto, nodos))
+
+    tibio = tibio and algoritmo in ALGORITMOS_FUERZAS
+    clave = clave_layout(G, algoritmo, **parametros,
+                         **({'fraccion_tibio': fraccion_tibio} if tibio else {}))
+    entrada = _leer_layout(carpeta, clave)
+    if entrada is not None:
+        nodos_entrada, valores = entrada
+        if set(nodos_entrada) == set(texto):
+            os.utime(_rutas(carpeta, clave)[0])
+            return {original[n]: valores[i] for i, n in enumerate(nodos_entrada)}
+
+    opciones = dict(parametros)
+    arranque = _buscar_arranque(carpeta, algoritmo, texto) if tibio else None
+    if arranque is not None:
+        opciones['pos'] = {original[n]: p for n, p in arranque[1].items()}
+        if algoritmo == 'spring':
+            opciones['iterations'] = max(1, int(parametros.get('iterations', 50) * fraccion_tibio))
+
+    resultado = ALGORITMOS_LAYOUT[algoritmo](G, **opciones)
+
+    valores = np.array([resultado[n] for n in nodos], dtype=np.float64)
+    _guardar_layout(carpeta, clave, texto, valores, {
+        'algoritmo': algoritmo,
+        'parametros': parametros,
+        'n_nodos': len(nodos),
+        'n_aristas': G.number_of_edges(),
+        'arranque_tibio': arranque is not None,
+        'arranque_desde': arranque[0] if arranque is not None else None,
+        'fecha': time.time()
+    })
+    _registrar_indice(carpeta, clave, algoritmo, len(nodos))
+    if len(_leer_indice(carpeta)) > max_layouts:
+        _podar(carpeta, max_layouts)
+    return resultado
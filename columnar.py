@@ -0,0 +1,184 @@
+# columnar.py
+import numpy as np
+import pandas as pd
+import json
+import os
+
+# Nombre del archivo de esquema dentro de cada carpeta columnar
+ARCHIVO_ESQUEMA = 'esquema.json'
+
+
+def _nombre_archivo_columna(indice):
+    return f"c{indice:05d}.npy"
+
+
+class EscritorColumnar:
+    """
+    Escribe una tabla numérica por bloques en formato columnar: un archivo
+    .npy (memmap) por columna más un esquema JSON con nombres y tipos.
+
+    El número total de filas debe conocerse de antemano; cada bloque se
+    copia directamente a los archivos mapeados sin pasar por pandas.
+    """
+
+    def __init__(self, carpeta, columnas, n_filas, dtype='float64'):
+        if not os.path.exists(carpeta):
+            os.makedirs(carpeta)
+
+        self.carpeta = carpeta
+        self.columnas = list(columnas)
+        self.n_filas = int(n_filas)
+        self.dtype = np.dtype(dtype)
+        self.posicion = 0
+        self.archivos = {col: _nombre_archivo_columna(j) for j, col in enumerate(self.columnas)}
+        self.mapas = {
+            col: np.lib.format.open_memmap(os.path.join(carpeta, archivo), mode='w+',
+                                           dtype=self.dtype, shape=(self.n_filas,))
+            for col, archivo in self.archivos.items()
+        }
+
+    def escribir_columnas(self, bloque_t):
+        """
+        Escribe un bloque dado por columnas: array (n_columnas, filas_bloque).
+        """
+        filas_bloque = bloque_t.shape[1]
+        fin = self.posicion + filas_bloque
+        if fin > self.n_filas:
+            raise ValueError(f"Se excede el número de filas declarado ({self.n_filas})")
+
+        for j, col in enumerate(self.columnas):
+            self.mapas[col][self.posicion:fin] = bloque_t[j]
+        self.posicion = fin
+
+    def escribir(self, bloque):
+        """Escribe un bloque por filas: array (filas_bloque, n_columnas)"""
+        self.escribir_columnas(np.asarray(bloque).T)
+
+    def cerrar(self, metadatos=None):
+        """Vacía los mapas a disco y escribe el esquema JSON"""
+        if self.posicion != self.n_filas:
+            raise ValueError(f"Se escribieron {self.posicion} filas de {self.n_filas} declaradas")
+
+        for mapa in self.mapas.values():
+            mapa.flush()
+
+        esquema = {
+            'n_filas': self.n_filas,
+            'dtype': self.dtype.name,
+            'columnas': self.columnas,
+            'archivos': self.archivos
+        }
+        if metadatos:
+            esquema.update(metadatos)
+
+        ruta_esquema = os.path.join(self.carpeta, ARCHIVO_ESQUEMA)
+        with open(ruta_esquema, 'w', encoding='utf-8') as f:
+            json.dump(esquema, f, indent=2, ensure_ascii=False)
+
+        self.mapas = {}
+        return ruta_esquema
+
+
+def leer_esquema(carpeta):
+    """Lee el esquema JSON de una carpeta columnar"""
+    with open(os.path.join(carpeta, ARCHIVO_ESQUEMA), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def abrir_columnas(carpeta, columnas=None, esquema=None):
+    """
+    Mapea (sin leer) las columnas solicitadas de una carpeta columnar.
+
+    Retorna:
+    - diccionario {columna: np.memmap de solo lectura}
+    """
+    if esquema is None:
+        esquema = leer_esquema(carpeta)
+    if columnas is None:
+        columnas = esquema['columnas']
+
+    faltantes = [col for col in columnas if col not in esquema['archivos']]
+    if faltantes:
+        raise KeyError(f"Columnas no encontradas en {carpeta}: {faltantes}")
+
+    return {
+        col: np.load(os.path.join(carpeta, esquema['archivos'][col]), mmap_mode='r')
+        for col in columnas
+    }
+
+
+def cargar_columnar(carpeta, columnas=None, como='dataframe'):
+    """
+    Carga una tabla columnar de forma perezosa: solo se mapean las columnas
+    solicitadas y los datos se leen del disco al accederlos.
+
+    Parámetros:
+    - carpeta: carpeta con esquema.json y un .npy por columna
+    - columnas: lista de columnas a mapear (None = todas)
+    - como: 'dataframe' (DataFrame sin copia), 'arrays' (dict de memmaps)
+      o 'matriz' (ndarray 2D filas x columnas; implica una copia)
+    """
+    mapas = abrir_columnas(carpeta, columnas)
+
+    if como == 'arrays':
+        return mapas
+    if como == 'matriz':
+        return np.column_stack(list(mapas.values())) if mapas else np.empty((0, 0))
+    if como == 'dataframe':
+        # copy=False conserva un bloque por columna apuntando al memmap
+        return pd.DataFrame(mapas, copy=False)
+    raise ValueError("como debe ser: 'dataframe', 'arrays' o 'matriz'")
+
+
+def csv_a_columnar(ruta_csv, carpeta, dtype='float64', chunksize=500_000):
+    """
+    Convierte un CSV al formato columnar por bloques (sin cargarlo entero).
+    Solo se conservan las columnas numéricas.
+    """
+    # Primera pasada barata: contar filas leyendo una sola columna
+    n_filas = sum(len(b) for b in pd.read_csv(ruta_csv, usecols=[0], chunksize=chunksize))
+
+    escritor = None
+    for bloque in pd.read_csv(ruta_csv, chunksize=chunksize):
+        bloque = bloque.select_dtypes(include=[np.number])
+        if escritor is None:
+            escritor = EscritorColumnar(carpeta, bloque.columns, n_filas, dtype=dtype)
+        escritor.escribir(bloque.to_numpy(dtype=dtype))
+
+    if escritor is None:
+        raise ValueError(f"El archivo {ruta_csv} no contiene filas")
+
+    return escritor.cerrar(metadatos={'origen': os.path.basename(ruta_csv)})
+
+
+def ruta_columnar(ruta_csv):
+    """Carpeta columnar asociada a un CSV: data/B2C.csv -> data/columnar/B2C"""
+    carpeta, archivo = os.path.split(ruta_csv)
+    return os.path.join(carpeta, 'columnar', os.path.splitext(archivo)[0])
+
+
+def cargar_tabla(ruta_csv, columnas=None, como='dataframe', dtype='float64'):
+    """
+    Cargador compartido para las tablas numéricas del pipeline.
+
+    Si existe la versión columnar del CSV (y no es más antigua que él) se
+    mapea directamente; si no, se convierte una vez y se reutiliza en las
+    siguientes ejecuciones. Varios procesos que mapean la misma carpeta
+    comparten las páginas del sistema operativo en lugar de tener cada uno
+    su propia copia.
+    """
+    carpeta = ruta_columnar(ruta_csv)
+    ruta_esquema = os.path.join(carpeta, ARCHIVO_ESQUEMA)
+
+    vigente = os.path.exists(ruta_esquema)
+    if vigente and os.path.exists(ruta_csv):
+        vigente = (os.path.getmtime(ruta_csv) <= os.path.getmtime(ruta_esquema)
+                   and leer_esquema(carpeta)['dtype'] == np.dtype(dtype).name)
+
+    if not vigente:
+        if not os.path.exists(ruta_csv):
+            raise FileNotFoundError(f"No existe {ruta_csv} ni su versión columnar")
+        print(f"Convirtiendo a formato columnar: {ruta_csv} -> {carpeta}")
+        csv_a_columnar(ruta_csv, carpeta, dtype=dtype)
+
+    return cargar_columnar(carpeta, columnas, como)
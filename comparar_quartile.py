@@ -4,6 +4,9 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 import os
 from datetime import datetime
+from almacen_particiones import existe_almacen, cargar_almacen, escalera_actual
+from alg import nombres_escalera, pares_escalera, texto_escalera, fraccion_particion, nombre_particion
+from columnar import cargar_tabla
 
 def cargar_porciones(base_name="data"):
     """
@@ -14,8 +17,16 @@ def cargar_porciones(base_name="data"):
     """
     porciones = {}
     
-    # Lista de configuraciones
-    configuraciones = ['B2C', 'W2C', 'B4C', 'W4C', 'B8C', 'W8C', 'B16C', 'W16C']
+    # Configuraciones descubiertas a partir de la escalera de fracciones
+    configuraciones = nombres_escalera(escalera_actual())
+    
+    carpeta_almacen = os.path.join(base_name, 'almacen')
+    if existe_almacen(carpeta_almacen):
+        print("Cargando porciones desde el almacén de particiones...")
+        porciones = cargar_almacen(carpeta_almacen, nombres=configuraciones)
+        for config, df in porciones.items():
+            print(f"  ✓ {config}: {df.shape[0]} filas, {df.shape[1]} columnas")
+        return porciones
     
     print("Cargando porciones desde archivos CSV...")
     for config in configuraciones:
@@ -23,7 +34,7 @@ def cargar_porciones(base_name="data"):
         
         if os.path.exists(ruta_archivo):
             try:
-                df = pd.read_csv(ruta_archivo)
+                df = cargar_tabla(ruta_archivo)
                 porciones[config] = df
                 print(f"  ✓ {config}: {df.shape[0]} filas, {df.shape[1]} columnas")
             except Exception as e:
@@ -33,7 +44,7 @@ def cargar_porciones(base_name="data"):
             ruta_alternativa = f"{config}.csv"
             if os.path.exists(ruta_alternativa):
                 try:
-                    df = pd.read_csv(ruta_alternativa)
+                    df = cargar_tabla(ruta_alternativa)
                     porciones[config] = df
                     print(f"  ✓ {config}: {df.shape[0]} filas, {df.shape[1]} columnas")
                 except Exception as e:
@@ -69,12 +80,7 @@ def graficar_comparacion_pares(porciones, columna_objetivo='target_y', carpeta_i
     """
     Grafica comparaciones lado a lado para cada par BiC vs WiC y guarda las imágenes
     """
-    pares = [
-        ('B2C', 'W2C'),
-        ('B4C', 'W4C'), 
-        ('B8C', 'W8C'),
-        ('B16C', 'W16C')
-    ]
+    pares = pares_escalera(escalera_actual())
     
     print("\n📈 Generando gráficos de comparación por pares...")
     
@@ -119,9 +125,12 @@ def graficar_comparacion_pares(porciones, columna_objetivo='target_y', carpeta_i
             plt.tight_layout()
             guardar_figura(fig, f"comparacion_{bic}_vs_{wic}", carpeta_imagenes)
     
-    # Crear también una figura con los 4 pares juntos
-    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    # Crear también una figura con todos los pares juntos (2 por fila)
+    n_filas_fig = max(1, (len(pares) + 1) // 2)
+    fig, axes = plt.subplots(n_filas_fig, 2, figsize=(16, 6 * n_filas_fig))
     axes = axes.flatten()
+    for ax in axes[len(pares):]:
+        ax.axis('off')
     
     for idx, (bic, wic) in enumerate(pares):
         if bic in porciones and wic in porciones:
@@ -163,7 +172,7 @@ def graficar_boxplot_comparativo(porciones, columna_objetivo='target_y', carpeta
     # Preparar datos para boxplot
     datos_boxplot = []
     
-    configuraciones = ['B2C', 'W2C', 'B4C', 'W4C', 'B8C', 'W8C', 'B16C', 'W16C']
+    configuraciones = nombres_escalera(escalera_actual())
     
     for config in configuraciones:
         if config in porciones:
@@ -195,7 +204,7 @@ def graficar_boxplot_comparativo(porciones, columna_objetivo='target_y', carpeta
     fig2, ax2 = plt.subplots(figsize=(14, 8))
     sns.boxplot(data=df_boxplot, x='Porcentaje', y=columna_objetivo, 
                 hue='Tipo', palette=['#FF6B6B', '#4ECDC4'], ax=ax2)
-    ax2.set_title(f'Comparación B vs W por Porcentaje\n(2C=50%, 4C=25%, 8C=12.5%, 16C=6.25%)', 
+    ax2.set_title(f'Comparación B vs W por Porcentaje\n({texto_escalera(escalera_actual())})', 
                  fontsize=14, fontweight='bold')
     ax2.set_xlabel('Porcentaje', fontsize=12)
     ax2.set_ylabel(columna_objetivo, fontsize=12)
@@ -212,7 +221,7 @@ def graficar_evolucion_estadisticas(porciones, columna_objetivo='target_y', carp
     # Preparar datos
     datos_evolucion = []
     
-    porcentajes = ['2C', '4C', '8C', '16C']
+    porcentajes = [nombre_particion('', f) for f in escalera_actual()]
     
     for porc in porcentajes:
         bic = f'B{porc}'
@@ -250,7 +259,7 @@ def graficar_evolucion_estadisticas(porciones, columna_objetivo='target_y', carp
     sns.lineplot(data=df_evolucion, x='Porcentaje', y='Media', hue='Tipo', 
                 marker='o', markersize=8, linewidth=2.5, ax=ax1, palette=['#4ECDC4', '#FF6B6B'])
     ax1.set_title('Evolución de la Media por Porcentaje', fontsize=14, fontweight='bold')
-    ax1.set_xlabel('Porcentaje (2C=50%, 4C=25%, 8C=12.5%, 16C=6.25%)', fontsize=12)
+    ax1.set_xlabel(f'Porcentaje ({texto_escalera(escalera_actual())})', fontsize=12)
     ax1.set_ylabel(f'Media de {columna_objetivo}', fontsize=12)
     ax1.legend(title='Tipo', fontsize=10)
     ax1.grid(True, alpha=0.3)
@@ -262,7 +271,7 @@ def graficar_evolucion_estadisticas(porciones, columna_objetivo='target_y', carp
     sns.lineplot(data=df_evolucion, x='Porcentaje', y='Mediana', hue='Tipo', 
                 marker='o', markersize=8, linewidth=2.5, ax=ax2, palette=['#4ECDC4', '#FF6B6B'])
     ax2.set_title('Evolución de la Mediana por Porcentaje', fontsize=14, fontweight='bold')
-    ax2.set_xlabel('Porcentaje (2C=50%, 4C=25%, 8C=12.5%, 16C=6.25%)', fontsize=12)
+    ax2.set_xlabel(f'Porcentaje ({texto_escalera(escalera_actual())})', fontsize=12)
     ax2.set_ylabel(f'Mediana de {columna_objetivo}', fontsize=12)
     ax2.legend(title='Tipo', fontsize=10)
     ax2.grid(True, alpha=0.3)
@@ -287,7 +296,7 @@ def graficar_evolucion_estadisticas(porciones, columna_objetivo='target_y', carp
                 linewidth=2, color=color, label=f'Media {label}')
     
     ax3.set_title('Rango de Valores y Media por Porcentaje', fontsize=14, fontweight='bold')
-    ax3.set_xlabel('Porcentaje (2C=50%, 4C=25%, 8C=12.5%, 16C=6.25%)', fontsize=12)
+    ax3.set_xlabel(f'Porcentaje ({texto_escalera(escalera_actual())})', fontsize=12)
     ax3.set_ylabel(f'Valor de {columna_objetivo}', fontsize=12)
     ax3.legend(fontsize=10)
     ax3.grid(True, alpha=0.3)
@@ -310,7 +319,7 @@ def graficar_evolucion_estadisticas(porciones, columna_objetivo='target_y', carp
                 edgecolor='black', linewidth=1.5)
 
     ax4.set_title('Diferencia Media entre BiC y WiC por Porcentaje', fontsize=14, fontweight='bold')
-    ax4.set_xlabel('Porcentaje (2C=50%, 4C=25%, 8C=12.5%, 16C=6.25%)', fontsize=12)
+    ax4.set_xlabel(f'Porcentaje ({texto_escalera(escalera_actual())})', fontsize=12)
     ax4.set_ylabel('Diferencia de Medias (BiC - WiC)', fontsize=12)
 
     # Añadir valores en las barras
@@ -330,7 +339,7 @@ def graficar_densidad_individual(porciones, columna_objetivo='target_y', carpeta
     """
     print("Generando gráficos de densidad individuales...")
     
-    configuraciones = ['B2C', 'W2C', 'B4C', 'W4C', 'B8C', 'W8C', 'B16C', 'W16C']
+    configuraciones = nombres_escalera(escalera_actual())
     
     for config in configuraciones:
         if config in porciones:
@@ -354,15 +363,7 @@ def graficar_densidad_individual(porciones, columna_objetivo='target_y', carpeta
             ax.axvline(mediana, color='green', linestyle='--', linewidth=2, alpha=0.8, label=f'Mediana: {mediana:.2f}')
             
             # Título y etiquetas
-            porcentaje = config[1:]
-            if porcentaje == '2C':
-                porc_text = '50%'
-            elif porcentaje == '4C':
-                porc_text = '25%'
-            elif porcentaje == '8C':
-                porc_text = '12.5%'
-            else:
-                porc_text = '6.25%'
+            porc_text = f"{fraccion_particion(config) * 100:g}%"
             
             ax.set_title(f'Distribución de {config} ({porc_text} {tipo})\nN={len(df_config)}', 
                         fontsize=14, fontweight='bold')
@@ -383,7 +384,7 @@ def graficar_resumen_estadisticas(porciones, columna_objetivo='target_y', carpet
     # Preparar datos para el resumen
     datos_resumen = []
     
-    configuraciones = ['B2C', 'W2C', 'B4C', 'W4C', 'B8C', 'W8C', 'B16C', 'W16C']
+    configuraciones = nombres_escalera(escalera_actual())
     
     for config in configuraciones:
         if config in porciones:
@@ -480,7 +481,7 @@ def exportar_estadisticas(porciones, columna_objetivo='target_y'):
     # Preparar datos para exportación
     datos_estadisticas = []
     
-    configuraciones = ['B2C', 'W2C', 'B4C', 'W4C', 'B8C', 'W8C', 'B16C', 'W16C']
+    configuraciones = nombres_escalera(escalera_actual())
     
     for config in configuraciones:
         if config in porciones:
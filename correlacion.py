@@ -1,33 +1,43 @@
 import pandas as pd
 import numpy as np
 import os
+import io
+import time
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from almacen_particiones import existe_almacen, cargar_almacen, cargar_particion, leer_particiones, escalera_actual
+from columnar import cargar_tabla
+from alg import nombres_escalera, fraccion_particion
+from correlacion_prefijos import CorrelacionPrefijos
+from correlacion_streaming import correlacion_archivo
+from dependencia import matriz_dependencia
+from matriz_compacta import guardar_matriz_compacta, MatrizCompacta
+from cache_correlacion import CacheCorrelacion, huella_dataframe
+from correlacion_dispersa import guardar_correlacion_dispersa
+from correlacion_knn import vecinos_correlacion, recall_vecinos, guardar_aristas_csv
 
 def cargar_datasets_directo():
     """
-    Carga los datasets directamente desde los archivos CSV
+    Carga los datasets desde el almacén de particiones (vistas sin copia)
+    o, si no existe, desde la versión columnar de los archivos CSV
     """
+    if existe_almacen():
+        dataframes = cargar_almacen()
+        for nombre, df in dataframes.items():
+            print(f"Cargado (almacén): {nombre} - {df.shape}")
+        return dataframes
+
     dataframes = {}
     data_dir = 'data'
     
-    archivos = {
-        'df_original': 'df_original.csv',
-        'B2C': 'B2C.csv',
-        'W2C': 'W2C.csv',
-        'B4C': 'B4C.csv',
-        'W4C': 'W4C.csv',
-        'B8C': 'B8C.csv',
-        'W8C': 'W8C.csv',
-        'B16C': 'B16C.csv',
-        'W16C': 'W16C.csv'
-    }
+    archivos = {nombre: f"{nombre}.csv" for nombre in ['df_original'] + nombres_escalera()}
     
     for nombre, archivo in archivos.items():
         ruta = os.path.join(data_dir, archivo)
         if os.path.exists(ruta):
             try:
-                df = pd.read_csv(ruta)
-                # Eliminar columnas no numéricas si existen
-                df = df.select_dtypes(include=[np.number])
+                # Tabla columnar mapeada en memoria (solo columnas numéricas)
+                df = cargar_tabla(ruta)
                 dataframes[nombre] = df
                 print(f"Cargado: {nombre} - {df.shape}")
             except Exception as e:
@@ -45,10 +55,17 @@ def crear_carpeta_resultados():
         print(f"Carpeta creada: {carpeta}")
     return carpeta
 
-def matriz_correlacion_numerica(df):
+def matriz_correlacion_numerica(df, medida='pearson', **opciones):
     """
     Calcula matriz de correlación para datos puramente numéricos
+
+    medida: 'pearson', 'spearman', 'kendall', 'informacion_mutua', 'dcor' o
+    'parcial' (correlación parcial con contracción de Ledoit-Wolf; ver
+    dependencia.py)
     """
+    if medida != 'pearson':
+        return matriz_dependencia(df, medida, **opciones)
+
     # Asegurarse de que solo tenemos columnas numéricas
     df_numeric = df.select_dtypes(include=[np.number])
     
@@ -57,12 +74,16 @@ def matriz_correlacion_numerica(df):
     
     return matriz_corr
 
-def matriz_distancia_numerica(df, metodo='absoluta'):
+def matriz_distancia_numerica(df, metodo='absoluta', medida='pearson', **opciones):
     """
     Calcula matriz de distancia para datos numéricos
     """
-    matriz_corr = matriz_correlacion_numerica(df)
-    
+    return distancia_desde_correlacion(matriz_correlacion_numerica(df, medida, **opciones), metodo)
+
+def distancia_desde_correlacion(matriz_corr, metodo='absoluta'):
+    """
+    Convierte una matriz de correlación en matriz de distancia
+    """
     if metodo == 'absoluta':
         # Distancia = 1 - |correlación|
         distancia = 1 - np.abs(matriz_corr)
@@ -74,6 +95,111 @@ def matriz_distancia_numerica(df, metodo='absoluta'):
     
     return distancia
 
+def matriz_distancia_archivo(ruta_csv, metodo='absoluta', n_procesos=None):
+    """
+    Calcula la matriz de distancia de un CSV sin cargarlo en memoria:
+    acumula la correlación por bloques de su versión columnar, en paralelo
+    """
+    return distancia_desde_correlacion(correlacion_archivo(ruta_csv, n_procesos=n_procesos), metodo)
+
+def _filas_lote(valores, filas):
+    """
+    Filas de una partición del lote: un entero n (prefijo de n filas), una
+    tupla (inicio, fin), un slice o un array de índices / máscara booleana.
+    """
+    if isinstance(filas, (int, np.integer)):
+        return valores[:filas]
+    if isinstance(filas, tuple):
+        return valores[filas[0]:filas[1]]
+    if isinstance(filas, slice):
+        return valores[filas]
+    return valores[np.asarray(filas)]
+
+def matrices_distancia_lote(base, particiones, metodo='absoluta'):
+    """
+    Calcula en un solo llamado las matrices de distancia de varias
+    particiones de una tabla base.
+
+    Las columnas se estandarizan una sola vez con la media y desviación de
+    la tabla base; las particiones del mismo tamaño se apilan y sus
+    productos cruzados se calculan con un único matmul por lotes (BLAS).
+
+    Parámetros:
+    - base: DataFrame (solo columnas numéricas) o array 2D filas x columnas
+    - particiones: lista de prefijos (int), rangos (inicio, fin), slices o
+      arrays de índices de filas
+    - metodo: 'absoluta' o 'directa'
+
+    Retorna:
+    - (tensor (k, p, p) de distancias, lista de columnas)
+    """
+    if isinstance(base, pd.DataFrame):
+        base_numerica = base.select_dtypes(include=[np.number])
+        columnas = list(base_numerica.columns)
+        valores = base_numerica.to_numpy(dtype=np.float64)
+    else:
+        valores = np.asarray(base, dtype=np.float64)
+        columnas = list(range(valores.shape[1]))
+
+    # Estandarización global (una vez) para que los productos estén bien condicionados
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media = np.nanmean(valores, axis=0) if len(valores) else np.zeros(len(columnas))
+        escala = np.nanstd(valores, axis=0) if len(valores) else np.ones(len(columnas))
+    escala = np.where(np.isfinite(escala) & (escala > 0), escala, 1.0)
+    z = (valores - np.nan_to_num(media)) / escala
+    hay_nan = bool(np.isnan(z).any())
+
+    bloques = [_filas_lote(z, filas) for filas in particiones]
+    p = len(columnas)
+    tensor = np.full((len(bloques), p, p), np.nan)
+
+    # Agrupar por número de filas para apilar y multiplicar por lotes
+    grupos = {}
+    for k, bloque in enumerate(bloques):
+        grupos.setdefault(len(bloque), []).append(k)
+
+    for n_filas, indices in grupos.items():
+        pila = np.stack([bloques[k] for k in indices])
+        if hay_nan:
+            presente = (~np.isnan(pila)).astype(np.float64)
+            pila = np.nan_to_num(pila)
+            pila_t = np.swapaxes(pila, 1, 2)
+            n = np.swapaxes(presente, 1, 2) @ presente
+            suma = pila_t @ presente
+            suma_cuadrados = np.swapaxes(pila * pila, 1, 2) @ presente
+        else:
+            pila_t = np.swapaxes(pila, 1, 2)
+            n = np.float64(n_filas)
+            suma = np.repeat(pila.sum(axis=1)[:, :, None], p, axis=2)
+            suma_cuadrados = np.repeat((pila * pila).sum(axis=1)[:, :, None], p, axis=2)
+        productos = pila_t @ pila
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = productos - suma * np.swapaxes(suma, 1, 2) / n
+            var_i = suma_cuadrados - suma * suma / n
+            var_j = np.swapaxes(var_i, 1, 2)
+            corr = cov / np.sqrt(var_i * var_j)
+        corr[(np.broadcast_to(n, corr.shape) < 1) | (var_i <= 0) | (var_j <= 0)] = np.nan
+        tensor[indices] = np.clip(corr, -1.0, 1.0)
+
+    return distancia_desde_correlacion(tensor, metodo), columnas
+
+def matrices_distancia_particiones(df_original, nombres, metodo='absoluta', criterion='target_y'):
+    """
+    Calcula las matrices de distancia de varias particiones B/W con una sola
+    pasada sobre df_original (sumas prefijas en el orden del criterio).
+
+    Retorna:
+    - diccionario {nombre: DataFrame de distancia}
+    """
+    escalera = [fraccion_particion(nombre) for nombre in nombres if nombre != 'df_original']
+    motor = CorrelacionPrefijos(df_original, criterion, escalera=escalera or [1.0])
+    distancias = distancia_desde_correlacion(motor.tensor(nombres), metodo)
+    return {
+        nombre: pd.DataFrame(matriz, index=motor.columnas, columns=motor.columnas)
+        for nombre, matriz in zip(nombres, distancias)
+    }
+
 def analizar_tipos_datos(df):
     """Analiza los tipos de datos en el dataset"""
     num_cols = df.select_dtypes(include=[np.number]).columns.tolist()
@@ -81,8 +207,20 @@ def analizar_tipos_datos(df):
     
     return num_cols, cat_cols
 
+def guardar_matriz(matriz, nombre_archivo, carpeta, precision='float64', metadatos=None):
+    """
+    Guarda la matriz en formato compacto: triángulo superior sin comprimir
+    (.tri.npy, mapeable) y etiquetas en un JSON aparte. metadatos (dataset,
+    medida y método) van al JSON; grafo.py los lee de ahí en lugar de
+    interpretar el nombre del archivo.
+    """
+    ruta_completa = guardar_matriz_compacta(matriz, nombre_archivo, carpeta, dtype=precision,
+                                            metadatos=metadatos)
+    print(f"Matriz guardada: {ruta_completa}")
+    return ruta_completa
+
 def guardar_matriz_npz(matriz, nombre_archivo, carpeta):
-    """Guarda la matriz en formato .npz"""
+    """Guarda la matriz en formato .npz (formato anterior)"""
     ruta_completa = os.path.join(carpeta, f"{nombre_archivo}.npz")
     
     np.savez_compressed(
@@ -102,8 +240,19 @@ def guardar_matriz_csv(matriz, nombre_archivo, carpeta):
     print(f"Matriz CSV guardada: {ruta_completa}")
     return ruta_completa
 
-def analizar_dataset(nombre_dataset, df, metodo, carpeta_resultados):
-    """Analiza un dataset específico y guarda resultados"""
+def clave_cache(df, metodo, medida='pearson', **opciones):
+    """Clave de caché de la matriz de distancia de df (contenido + método + medida)"""
+    return CacheCorrelacion.clave(huella_dataframe(df), metodo, medida=medida, **opciones)
+
+def analizar_dataset(nombre_dataset, df, metodo, carpeta_resultados, matriz_distancia=None,
+                     medida='pearson', precision='float64', cache=None, clave=None,
+                     mostrar_matriz=True):
+    """
+    Analiza un dataset específico y guarda resultados.
+    Si se entrega matriz_distancia (ya calculada) no se recalcula.
+    Con cache (CacheCorrelacion) la matriz se busca por el contenido de df,
+    el método y la medida antes de calcularla, y se guarda si no estaba.
+    """
     print("=" * 70)
     print(f"ANALIZANDO: {nombre_dataset}")
     print("=" * 70)
@@ -115,10 +264,21 @@ def analizar_dataset(nombre_dataset, df, metodo, carpeta_resultados):
     print(f"Columnas categóricas ({len(cat_cols)}): {cat_cols}")
     
     try:
+        if cache is not None and clave is None:
+            clave = clave_cache(df, metodo, medida)
+        if cache is not None and matriz_distancia is None:
+            matriz_distancia = cache.obtener(clave)
+            if matriz_distancia is not None:
+                print("Matriz de distancia recuperada de la caché")
+        
         # Calcular matriz de distancia
-        matriz_distancia = matriz_distancia_numerica(df, metodo=metodo)
-        print(f"Matriz de distancia ({metodo}):")
-        print(matriz_distancia.round(3))
+        if matriz_distancia is None:
+            matriz_distancia = matriz_distancia_numerica(df, metodo=metodo, medida=medida)
+        if cache is not None and clave not in cache:
+            cache.guardar(clave, matriz_distancia, descripcion=f"{nombre_dataset} {medida} {metodo}")
+        if mostrar_matriz:
+            print(f"Matriz de distancia ({medida}, {metodo}):")
+            print(matriz_distancia.round(3))
         
         # Estadísticas
         valores = matriz_distancia.values
@@ -129,11 +289,16 @@ def analizar_dataset(nombre_dataset, df, metodo, carpeta_resultados):
         print(f"   Desviación estándar: {valores_sin_diagonal.std():.3f}")
         
         # Guardar resultados
-        nombre_archivo = f"{nombre_dataset}_{metodo}"
-        ruta_npz = guardar_matriz_npz(matriz_distancia, nombre_archivo, carpeta_resultados)
+        # Pearson conserva el nombre histórico que leen grafo.py y los MST
+        nombre_archivo = (f"{nombre_dataset}_{metodo}" if medida == 'pearson'
+                          else f"{nombre_dataset}_{medida}_{metodo}")
+        ruta_matriz = guardar_matriz(matriz_distancia, nombre_archivo, carpeta_resultados, precision,
+                                     metadatos={'dataset': nombre_dataset, 'medida': medida,
+                                                'metodo': metodo})
+        #ruta_npz = guardar_matriz_npz(matriz_distancia, nombre_archivo, carpeta_resultados)
         #ruta_csv = guardar_matriz_csv(matriz_distancia, nombre_archivo, carpeta_resultados)
         
-        return matriz_distancia, ruta_npz
+        return matriz_distancia, ruta_matriz
         
     except Exception as e:
         print(f"Error analizando {nombre_dataset}: {e}")
@@ -141,19 +306,130 @@ def analizar_dataset(nombre_dataset, df, metodo, carpeta_resultados):
         traceback.print_exc()
         return None, None
 
+def estadisticas_distancia(matriz_distancia):
+    """Rango, media y desviación de la matriz de distancia sin la diagonal"""
+    valores = np.asarray(matriz_distancia, dtype=np.float64)
+    valores_sin_diagonal = valores[~np.eye(valores.shape[0], dtype=bool)]
+    return {
+        'minimo': float(np.nanmin(valores_sin_diagonal)) if valores_sin_diagonal.size else np.nan,
+        'maximo': float(np.nanmax(valores_sin_diagonal)) if valores_sin_diagonal.size else np.nan,
+        'media': float(np.nanmean(valores_sin_diagonal)) if valores_sin_diagonal.size else np.nan,
+        'desviacion': float(np.nanstd(valores_sin_diagonal)) if valores_sin_diagonal.size else np.nan
+    }
+
+def cargar_dataset_compartido(nombre_dataset, data_dir='data'):
+    """
+    Abre un dataset por nombre como vistas de archivos mapeados en memoria
+    (almacén de particiones o versión columnar del CSV). Los procesos que lo
+    abren comparten las páginas del sistema operativo; no se serializa
+    ningún DataFrame.
+    """
+    if existe_almacen():
+        return cargar_particion(nombre_dataset)
+    return cargar_tabla(os.path.join(data_dir, f"{nombre_dataset}.csv"))
+
+def _analizar_en_proceso(nombre_dataset, metodo, carpeta_resultados, medida, precision):
+    """
+    Trabajo de un proceso: abre el dataset compartido, calcula y guarda su
+    matriz y retorna solo la ruta y las estadísticas. La salida por consola
+    se captura y solo se devuelve si hubo error.
+    """
+    inicio = time.perf_counter()
+    salida = io.StringIO()
+    with contextlib.redirect_stdout(salida):
+        try:
+            df = cargar_dataset_compartido(nombre_dataset)
+            matriz, ruta = analizar_dataset(nombre_dataset, df, metodo, carpeta_resultados,
+                                            medida=medida, precision=precision, mostrar_matriz=False)
+        except Exception as e:
+            print(f"Error analizando {nombre_dataset}: {e}")
+            matriz, ruta = None, None
+
+    resumen = {'dataset': nombre_dataset, 'ruta': ruta, 'segundos': time.perf_counter() - inicio}
+    if matriz is not None:
+        resumen['dimension'] = matriz.shape[0]
+        resumen.update(estadisticas_distancia(matriz))
+    else:
+        resumen['log'] = salida.getvalue()
+    return resumen
+
+def analizar_datasets_paralelo(nombres, metodo, carpeta_resultados, n_procesos=None,
+                               medida='pearson', precision='float64'):
+    """
+    Analiza varios datasets en paralelo, uno por proceso.
+
+    Cada proceso abre su dataset desde los archivos mapeados (ver
+    cargar_dataset_compartido) y devuelve la ruta de la matriz guardada y
+    sus estadísticas; las matrices no viajan entre procesos.
+
+    Retorna:
+    - DataFrame con una fila por dataset (ruta, estadísticas y tiempo)
+    """
+    n_procesos = min(n_procesos or os.cpu_count() or 1, max(len(nombres), 1))
+    print(f"Analizando {len(nombres)} datasets con {n_procesos} procesos")
+    
+    resumenes = []
+    with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+        futuros = {
+            ejecutor.submit(_analizar_en_proceso, nombre, metodo, carpeta_resultados, medida,
+                            precision): nombre
+            for nombre in nombres
+        }
+        for futuro in as_completed(futuros):
+            resumen = futuro.result()
+            resumenes.append(resumen)
+            if resumen['ruta']:
+                print(f"  {resumen['dataset']}: {resumen['ruta']} ({resumen['segundos']:.2f} s)")
+            else:
+                print(f"  {resumen['dataset']}: ERROR")
+                print(resumen.get('log', ''))
+    
+    orden = {nombre: i for i, nombre in enumerate(nombres)}
+    return pd.DataFrame(sorted(resumenes, key=lambda r: orden[r['dataset']]))
+
+def analizar_dataset_knn(nombre_dataset, df, metodo, carpeta_resultados, k=10,
+                         estimar_recall=True, **opciones):
+    """
+    Modo aproximado para tablas muy anchas: en lugar de la matriz completa
+    calcula los k vecinos más correlacionados de cada variable (ver
+    correlacion_knn.py) y guarda la lista de aristas para grafo.py
+    (.coo.npz) y para mst_kruskal.py (grafos/datos_grafo_*.csv).
+    """
+    print("=" * 70)
+    print(f"ANALIZANDO (kNN, k={k}): {nombre_dataset}")
+    print("=" * 70)
+    
+    resultado = vecinos_correlacion(df, k=k, metodo=metodo, **opciones)
+    print(f"Aristas kNN: {resultado.nnz}")
+    if estimar_recall:
+        print(f"Recall estimado (muestra): {recall_vecinos(df, resultado):.3f}")
+    
+    nombre_archivo = f"{nombre_dataset}_{metodo}_knn{k}"
+    ruta = guardar_correlacion_dispersa(resultado, nombre_archivo, carpeta_resultados,
+                                        metadatos={'dataset': nombre_dataset, 'medida': 'pearson'})
+    guardar_aristas_csv(resultado, nombre_archivo)
+    return resultado, ruta
+
 if __name__ == "__main__":
     print("=" * 70)
     print("ANÁLISIS DE CORRELACIÓN PARA DATOS NUMÉRICOS")
     print("=" * 70)
     
     # CONFIGURACIÓN
-    datasets_a_analizar = ['df_original','B2C', 'B4C', 'B8C', 'B16C', 'W2C', 'W4C', 'W8C', 'W16C']  # MODIFICA AQUÍ
+    # Por defecto: df_original y todas las particiones de la escalera del almacén
+    datasets_a_analizar = ['df_original'] + nombres_escalera(escalera_actual(), intercalar=False)  # MODIFICA AQUÍ
     metodo = 'directa'  # 'absoluta' o 'directa'
+    medida = 'pearson'  # 'pearson', 'spearman', 'kendall', 'informacion_mutua', 'dcor' o 'parcial'
+    precision = 'float64'  # 'float64', 'float32' o 'float16' para las matrices guardadas
+    usar_cache = True  # Reutilizar matrices ya calculadas si los datos no cambiaron
+    k_vecinos = None  # None = matriz completa; entero = solo k vecinos aproximados por variable
+    n_procesos = 1  # >1 (o None = todos los núcleos): un dataset por proceso
+    mostrar_matrices = True  # Imprimir cada matriz completa (False = solo estadísticas)
     
     # Crear carpeta para resultados
     carpeta_resultados = crear_carpeta_resultados()
     
-    print(f"Método seleccionado: {metodo}")
+    print(f"Método seleccionado: {metodo} (medida: {medida})")
     print(f"Datasets a analizar: {datasets_a_analizar}")
     
     # Cargar datasets
@@ -165,13 +441,75 @@ if __name__ == "__main__":
     
     print(f"Datasets disponibles: {list(dataframes.keys())}")
     
+    if k_vecinos is not None:
+        # Modo aproximado (tablas muy anchas): listas de aristas kNN
+        for nombre_dataset in datasets_a_analizar:
+            if nombre_dataset in dataframes:
+                analizar_dataset_knn(nombre_dataset, dataframes[nombre_dataset], metodo,
+                                     carpeta_resultados, k=k_vecinos)
+        exit()
+    
+    # Caché por contenido: solo se calculan las matrices que no están guardadas
+    cache = CacheCorrelacion() if usar_cache else None
+    claves = {}
+    precalculadas = {}
+    nombres_lote = [n for n in datasets_a_analizar if n in dataframes]
+    if cache is not None:
+        for nombre in nombres_lote:
+            claves[nombre] = clave_cache(dataframes[nombre], metodo, medida)
+            matriz = cache.obtener(claves[nombre])
+            if matriz is not None:
+                precalculadas[nombre] = matriz
+        nombres_lote = [n for n in nombres_lote if n not in precalculadas]
+        print(f"Matrices en caché: {len(precalculadas)}, por calcular: {len(nombres_lote)}")
+    
     resultados = {}
     rutas_guardado = {}
     
+    if nombres_lote and n_procesos != 1:
+        # Las faltantes se reparten entre procesos que abren los datos mapeados
+        resumen_paralelo = analizar_datasets_paralelo(nombres_lote, metodo, carpeta_resultados,
+                                                      n_procesos=n_procesos, medida=medida,
+                                                      precision=precision)
+        print(resumen_paralelo.drop(columns=['ruta', 'log'], errors='ignore').round(3).to_string(index=False))
+        for fila in resumen_paralelo.itertuples():
+            rutas_guardado[fila.dataset] = fila.ruta
+            if fila.ruta and cache is not None:
+                cache.guardar(claves[fila.dataset], MatrizCompacta(fila.ruta).a_dataframe(),
+                              descripcion=f"{fila.dataset} {medida} {metodo}")
+        nombres_lote = []
+    
+    # Las faltantes se calculan en un solo llamado a partir de df_original
+    # (solo Pearson; las demás medidas se calculan por dataset)
+    if not nombres_lote or medida != 'pearson':
+        pass
+    elif existe_almacen():
+        # Las particiones del almacén son rangos de filas de la tabla base
+        rangos = leer_particiones()['particiones']
+        tensor, columnas = matrices_distancia_lote(
+            dataframes['df_original'],
+            [(rangos[n]['inicio'], rangos[n]['fin']) for n in nombres_lote],
+            metodo=metodo
+        )
+        precalculadas.update({
+            nombre: pd.DataFrame(matriz, index=columnas, columns=columnas)
+            for nombre, matriz in zip(nombres_lote, tensor)
+        })
+    elif 'df_original' in dataframes:
+        # Sin almacén: sumas prefijas sobre el orden del criterio
+        precalculadas.update(matrices_distancia_particiones(dataframes['df_original'], nombres_lote,
+                                                            metodo=metodo))
+    
     for nombre_dataset in datasets_a_analizar:
+        if nombre_dataset in rutas_guardado:
+            continue  # Ya analizado en paralelo
         if nombre_dataset in dataframes:
             df = dataframes[nombre_dataset]
-            matriz, ruta = analizar_dataset(nombre_dataset, df, metodo, carpeta_resultados)
+            matriz, ruta = analizar_dataset(nombre_dataset, df, metodo, carpeta_resultados,
+                                            matriz_distancia=precalculadas.get(nombre_dataset),
+                                            medida=medida, precision=precision,
+                                            cache=cache, clave=claves.get(nombre_dataset),
+                                            mostrar_matriz=mostrar_matrices)
             resultados[nombre_dataset] = matriz
             rutas_guardado[nombre_dataset] = ruta
         else:
@@ -186,6 +524,9 @@ if __name__ == "__main__":
             if ruta:
                 print(f"{dataset}: {ruta}")
     
+    if cache is not None:
+        cache.reporte()
+    
     print("\n" + "=" * 70)
     print("ANÁLISIS COMPLETADO")
     print("=" * 70)
\ No newline at end of file
@@ -0,0 +1,262 @@
+# correlacion_dispersa.py
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import json
+import os
+from columnar import abrir_columnas, leer_esquema
+
+# Extensiones de una correlación dispersa guardada
+EXTENSION_DISPERSA = '.coo.npz'
+EXTENSION_DISPERSA_JSON = '.coo.json'
+
+# Memoria máxima para mantener todas las columnas estandarizadas (bytes)
+MEMORIA_ESTANDARIZADA = 2 * 2**30
+
+
+def peso_arista(r, metodo):
+    """
+    Peso de arista de grafo.py (1 - distancia) de una correlación r: |r|
+    para 'absoluta', r para 'directa'
+    """
+    if metodo == 'absoluta':
+        return np.abs(r)
+    if metodo == 'directa':
+        return r
+    raise ValueError("Método debe ser 'absoluta' o 'directa'")
+
+
+class CorrelacionDispersa:
+    """
+    Correlaciones por encima de un umbral en formato disperso.
+
+    matriz es una scipy.sparse.csr_matrix p x p con las correlaciones r de
+    los pares i < j retenidos (triángulo superior); el resto no se guarda.
+    k indica, si corresponde, que los pares son los k vecinos de cada
+    variable (ver correlacion_knn.py) en lugar de un umbral. descripcion
+    guarda los metadatos del archivo (dataset, medida, ...), como en
+    MatrizCompacta.
+    """
+
+    def __init__(self, matriz, etiquetas, umbral, metodo='absoluta', k=None, descripcion=None):
+        self.matriz = sp.csr_matrix(matriz)
+        self.etiquetas = list(etiquetas)
+        self.umbral = umbral
+        self.metodo = metodo
+        self.k = k
+        self.descripcion = dict(descripcion or {})
+
+    @property
+    def columns(self):
+        return pd.Index(self.etiquetas)
+
+    @property
+    def shape(self):
+        return self.matriz.shape
+
+    @property
+    def nnz(self):
+        return self.matriz.nnz
+
+    def tripletas(self, umbral=None):
+        """
+        Arreglos (i, j, r) de los pares retenidos; con umbral se filtran
+        además los que no lo alcanzan (debe ser >= al umbral de cálculo).
+        """
+        coo = self.matriz.tocoo()
+        i, j, r = coo.row, coo.col, coo.data
+        if umbral is not None:
+            if umbral < self.umbral:
+                raise ValueError(f"El umbral {umbral} es menor que el usado al calcular ({self.umbral})")
+            mascara = peso_arista(r, self.metodo) >= umbral
+            i, j, r = i[mascara], j[mascara], r[mascara]
+        return i, j, r
+
+    def aristas(self, umbral=None):
+        """Lista de aristas (nodo_i, nodo_j, {'weight', 'distance'}) para networkx"""
+        i, j, r = self.tripletas(umbral)
+        peso = peso_arista(r, self.metodo)
+        return [
+            (self.etiquetas[a], self.etiquetas[b], {'weight': float(w), 'distance': float(1.0 - w)})
+            for a, b, w in zip(i, j, peso)
+        ]
+
+
+def fuentes_columnas(datos, columnas=None):
+    """
+    Columnas de entrada como diccionario {nombre: array 1D} sin copiar:
+    DataFrame, carpeta columnar o diccionario de arrays.
+    """
+    if isinstance(datos, str):
+        return abrir_columnas(datos, columnas, leer_esquema(datos))
+    if isinstance(datos, pd.DataFrame):
+        df_numerico = datos.select_dtypes(include=[np.number])
+        columnas = list(df_numerico.columns) if columnas is None else columnas
+        return {col: df_numerico[col].to_numpy() for col in columnas}
+    columnas = list(datos) if columnas is None else columnas
+    return {col: datos[col] for col in columnas}
+
+
+def medias_normas(fuentes, etiquetas):
+    """Media y norma centrada de cada columna (una pasada, sin NaN)"""
+    medias = np.empty(len(etiquetas))
+    normas = np.empty(len(etiquetas))
+    for k, col in enumerate(etiquetas):
+        x = np.asarray(fuentes[col], dtype=np.float64)
+        media = np.nanmean(x) if np.any(~np.isnan(x)) else 0.0
+        centrada = np.nan_to_num(x - media)
+        medias[k] = media
+        normas[k] = np.sqrt(centrada @ centrada)
+    normas[normas == 0] = np.nan
+    return medias, normas
+
+
+def estandarizar_columnas(fuentes, etiquetas, medias, normas, dtype):
+    """
+    Bloque (n, len(etiquetas)) de columnas con media 0 y norma 1; el
+    producto de dos columnas estandarizadas es su correlación de Pearson.
+    Los NaN y las columnas constantes quedan en 0.
+    """
+    bloque = np.column_stack([np.asarray(fuentes[col], dtype=np.float64) for col in etiquetas])
+    bloque = np.nan_to_num((bloque - medias) / normas)
+    return bloque.astype(dtype, copy=False)
+
+
+def correlacion_dispersa(datos, umbral=0.7, metodo='absoluta', columnas=None, tam_bloque=1024,
+                         dtype='float64', memoria_max=MEMORIA_ESTANDARIZADA):
+    """
+    Correlación de Pearson por bloques de columnas que solo conserva los
+    pares con peso (1 - distancia) >= umbral, sin formar la matriz p x p.
+
+    Las columnas se estandarizan (media 0, norma 1) y cada par de bloques
+    (I, J) con J >= I se resuelve con un producto Z_Iᵀ Z_J de tamaño
+    tam_bloque x tam_bloque; de él solo se extraen las tripletas (i, j, r)
+    que superan el umbral. La memoria crece con el número de aristas
+    retenidas y no con p².
+
+    Parámetros:
+    - datos: DataFrame, carpeta columnar (ver columnar.py) o dict de arrays
+    - umbral: peso mínimo (|r| para 'absoluta', r para 'directa'); > 0
+    - metodo: 'absoluta' o 'directa' (como matriz_distancia_numerica)
+    - columnas: subconjunto de columnas (None = todas)
+    - tam_bloque: columnas por bloque
+    - dtype: precisión de los productos ('float64' o 'float32')
+    - memoria_max: si las columnas estandarizadas caben en este tamaño se
+      calculan una vez; si no, cada bloque se lee y estandariza al usarlo
+
+    Los NaN se reemplazan por la media de su columna (exacto sin NaN).
+
+    Retorna:
+    - CorrelacionDispersa
+    """
+    if umbral <= 0:
+        raise ValueError("El umbral debe ser positivo (con umbral <= 0 la matriz es densa)")
+    peso_arista(np.zeros(1), metodo)
+
+    fuentes = fuentes_columnas(datos, columnas)
+    etiquetas = list(fuentes)
+    p = len(etiquetas)
+    dtype = np.dtype(dtype)
+
+    medias, normas = medias_normas(fuentes, etiquetas)
+
+    def estandarizar(inicio, fin):
+        return estandarizar_columnas(fuentes, etiquetas[inicio:fin], medias[inicio:fin],
+                             normas[inicio:fin], dtype)
+
+    n_filas = len(fuentes[etiquetas[0]]) if p else 0
+    completa = None
+    if n_filas * p * dtype.itemsize <= memoria_max:
+        completa = estandarizar(0, p)
+
+    def bloque_z(inicio, fin):
+        return completa[:, inicio:fin] if completa is not None else estandarizar(inicio, fin)
+
+    filas, cols, valores = [], [], []
+    limites = list(range(0, p, tam_bloque))
+    for a in limites:
+        z_i = bloque_z(a, min(a + tam_bloque, p))
+        for b in limites:
+            if b < a:
+                continue
+            z_j = z_i if b == a else bloque_z(b, min(b + tam_bloque, p))
+            r = np.clip((z_i.T @ z_j).astype(np.float64), -1.0, 1.0)
+
+            mascara = peso_arista(r, metodo) >= umbral
+            if b == a:
+                # Solo pares i < j dentro del bloque diagonal
+                mascara &= np.triu(np.ones(mascara.shape, dtype=bool), k=1)
+            ii, jj = np.nonzero(mascara)
+            filas.append(ii + a)
+            cols.append(jj + b)
+            valores.append(r[ii, jj])
+
+    if filas:
+        filas, cols, valores = np.concatenate(filas), np.concatenate(cols), np.concatenate(valores)
+    else:
+        filas = cols = np.empty(0, dtype=np.int64)
+        valores = np.empty(0)
+    matriz = sp.coo_matrix((valores, (filas, cols)), shape=(p, p)).tocsr()
+    return CorrelacionDispersa(matriz, etiquetas, umbral, metodo)
+
+
+def guardar_correlacion_dispersa(resultado, nombre_archivo, carpeta, metadatos=None):
+    """
+    Guarda la matriz dispersa (.coo.npz) y sus etiquetas y parámetros
+    (.coo.json); metadatos (ej. dataset y medida) se agregan al JSON
+    """
+    if not os.path.exists(carpeta):
+        os.makedirs(carpeta)
+    ruta = os.path.join(carpeta, f"{nombre_archivo}{EXTENSION_DISPERSA}")
+    sp.save_npz(ruta, resultado.matriz.tocoo(), compressed=False)
+    descripcion = {**resultado.descripcion, **(metadatos or {}),
+                   'etiquetas': resultado.etiquetas, 'umbral': resultado.umbral,
+                   'metodo': resultado.metodo, 'k': resultado.k}
+    with open(os.path.join(carpeta, f"{nombre_archivo}{EXTENSION_DISPERSA_JSON}"), 'w',
+              encoding='utf-8') as f:
+        json.dump(descripcion, f, ensure_ascii=False)
+    print(f"Correlación dispersa guardada: {ruta} ({resultado.nnz} pares)")
+    return ruta
+
+
+def cargar_correlacion_dispersa(nombre_archivo, carpeta):
+    """Carga una correlación dispersa guardada con guardar_correlacion_dispersa"""
+    with open(os.path.join(carpeta, f"{nombre_archivo}{EXTENSION_DISPERSA_JSON}"),
+              encoding='utf-8') as f:
+        descripcion = json.load(f)
+    matriz = sp.load_npz(os.path.join(carpeta, f"{nombre_archivo}{EXTENSION_DISPERSA}"))
+    return CorrelacionDispersa(matriz, descripcion['etiquetas'], descripcion['umbral'],
+                               descripcion['metodo'], descripcion.get('k'),
+                               {c: v for c, v in descripcion.items() if c != 'etiquetas'})
+
+
+def listar_correlaciones_dispersas(carpeta):
+    """Nombres (sin extensión) de las correlaciones dispersas de una carpeta"""
+    if not os.path.exists(carpeta):
+        return []
+    return sorted(f[:-len(EXTENSION_DISPERSA)] for f in os.listdir(carpeta)
+                  if f.endswith(EXTENSION_DISPERSA))
+
+
+if __name__ == "__main__":
+    from correlacion import cargar_datasets_directo, crear_carpeta_resultados
+
+    print("=" * 70)
+    print("CORRELACIÓN DISPERSA POR BLOQUES (SIN MATRIZ p x p)")
+    print("=" * 70)
+
+    # CONFIGURACIÓN
+    DATASETS_A_ANALIZAR = []   # Lista vacía = todos los disponibles
+    METODO = 'directa'         # 'absoluta' o 'directa'
+    UMBRAL = 0.7               # Mismo umbral que UMBRAL_CORRELACION de grafo.py
+    TAM_BLOQUE = 1024          # Columnas por bloque
+
+    carpeta_resultados = crear_carpeta_resultados()
+    dataframes = cargar_datasets_directo()
+
+    for nombre, df in dataframes.items():
+        if DATASETS_A_ANALIZAR and nombre not in DATASETS_A_ANALIZAR:
+            continue
+        resultado = correlacion_dispersa(df, umbral=UMBRAL, metodo=METODO, tam_bloque=TAM_BLOQUE)
+        guardar_correlacion_dispersa(resultado, f"{nombre}_{METODO}", carpeta_resultados,
+                                     metadatos={'dataset': nombre, 'medida': 'pearson'})
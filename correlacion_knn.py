@@ -0,0 +1,228 @@
+# correlacion_knn.py
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import os
+from correlacion_dispersa import (CorrelacionDispersa, fuentes_columnas, medias_normas,
+                                  estandarizar_columnas, peso_arista, MEMORIA_ESTANDARIZADA)
+
+# Bytes por celda de una losa estandarizada: float32 final más los
+# intermedios float64 de estandarizar_columnas
+_BYTES_LOSA = 28
+
+
+def _filas_losa(n_filas, p, memoria_max):
+    """Filas por losa para que las p columnas estandarizadas quepan en memoria_max"""
+    return int(min(max(n_filas, 1), max(1, memoria_max // max(p * _BYTES_LOSA, 1))))
+
+
+def _losas(fuentes, etiquetas, medias, normas, filas_losa):
+    """
+    Recorre los datos por losas de filas: (inicio, z) con z las filas
+    [inicio, inicio + filas_losa) de todas las columnas, estandarizadas con
+    las medias y normas globales (float32). Las columnas mapeadas solo se
+    leen de a una losa.
+    """
+    n_filas = len(fuentes[etiquetas[0]]) if etiquetas else 0
+    for inicio in range(0, n_filas, filas_losa):
+        fin = min(inicio + filas_losa, n_filas)
+        filas = {col: fuentes[col][inicio:fin] for col in etiquetas}
+        yield inicio, estandarizar_columnas(filas, etiquetas, medias, normas, np.float32)
+
+
+def _sketch(losas, p, dimension, tipo, rng):
+    """
+    Sketch (dimension, p) de las columnas estandarizadas con una proyección
+    gaussiana aleatoria, acumulada losa por losa. La proyección se genera
+    fila de datos por fila de datos, así que no depende del tamaño de losa.
+    """
+    resultado = np.zeros((dimension, p), dtype=np.float32)
+    for _, z in losas:
+        proyeccion = rng.standard_normal((z.shape[0], dimension), dtype=np.float32)
+        resultado += proyeccion.T @ z
+
+    if tipo == 'simhash':
+        return np.where(resultado >= 0, 1.0, -1.0).astype(np.float32)
+    return resultado
+
+
+def _estimacion(bloque, sketch, tipo, dimension):
+    """Correlaciones estimadas de un bloque de columnas contra todas"""
+    productos = bloque.T @ sketch
+    if tipo == 'simhash':
+        # Ángulo por la fracción de bits distintos: r ≈ cos(pi * hamming / d)
+        hamming = (dimension - productos) / 2
+        return np.cos(np.pi * hamming / dimension)
+    return productos / dimension
+
+
+def vecinos_correlacion(datos, k=10, metodo='absoluta', columnas=None, factor_candidatos=4,
+                        dimension=256, tipo='proyeccion', semilla=42, tam_bloque=1024,
+                        memoria_max=MEMORIA_ESTANDARIZADA):
+    """
+    k vecinos más correlacionados de cada variable, aproximados con un
+    sketch aleatorio y confirmados con la correlación exacta.
+
+    1. Las columnas estandarizadas se proyectan a 'dimension' componentes
+       (proyección gaussiana, o sus signos si tipo='simhash').
+    2. Con el sketch se estima la correlación de cada columna contra todas
+       y se preseleccionan factor_candidatos * k candidatas por columna.
+    3. Solo para los pares preseleccionados se calcula la correlación
+       exacta y se conservan los k mejores por columna.
+
+    El costo es O(p² · dimension) para la preselección en lugar de
+    O(p² · n). factor_candidatos y dimension regulan el compromiso entre
+    exhaustividad (recall) y velocidad: más candidatos o más dimensiones
+    dan más recall a mayor costo (ver recall_vecinos).
+
+    Los pasos 1 y 3 recorren los datos por losas de filas (ver _losas) de
+    tamaño acotado por memoria_max, como correlacion_dispersa; si todas las
+    columnas estandarizadas caben, se calculan una sola vez.
+
+    Parámetros:
+    - datos: DataFrame, carpeta columnar o dict de arrays
+    - k: vecinos por variable
+    - metodo: 'absoluta' (|r|) o 'directa' (r), como en grafo.py
+    - factor_candidatos: candidatas preseleccionadas por vecino buscado
+    - dimension: tamaño del sketch
+    - tipo: 'proyeccion' o 'simhash'
+    - tam_bloque: columnas por bloque en la preselección
+    - memoria_max: bytes para las losas estandarizadas y los lotes de pares
+
+    Retorna:
+    - CorrelacionDispersa con las aristas kNN (simetrizadas, i < j)
+    """
+    if tipo not in ('proyeccion', 'simhash'):
+        raise ValueError("tipo debe ser 'proyeccion' o 'simhash'")
+    peso_arista(np.zeros(1), metodo)
+
+    fuentes = fuentes_columnas(datos, columnas)
+    etiquetas = list(fuentes)
+    p = len(etiquetas)
+    n_filas = len(fuentes[etiquetas[0]]) if p else 0
+    medias, normas = medias_normas(fuentes, etiquetas)
+
+    filas_losa = _filas_losa(n_filas, p, memoria_max)
+    if filas_losa >= n_filas:
+        # Todo cabe: una sola losa, estandarizada una vez para el sketch y el cálculo exacto
+        guardadas = list(_losas(fuentes, etiquetas, medias, normas, filas_losa))
+
+        def losas():
+            return iter(guardadas)
+    else:
+        def losas():
+            return _losas(fuentes, etiquetas, medias, normas, filas_losa)
+
+    rng = np.random.default_rng(semilla)
+    sketch = _sketch(losas(), p, dimension, tipo, rng)
+    n_candidatos = min(p - 1, max(k, int(np.ceil(factor_candidatos * k))))
+
+    # Preselección por bloques de columnas: nunca se forma la matriz p x p
+    pares = []
+    for inicio in range(0, p, tam_bloque):
+        fin = min(inicio + tam_bloque, p)
+        estimada = peso_arista(_estimacion(sketch[:, inicio:fin], sketch, tipo, dimension), metodo)
+        estimada[np.arange(fin - inicio), np.arange(inicio, fin)] = -np.inf
+        candidatos = np.argpartition(-estimada, n_candidatos - 1, axis=1)[:, :n_candidatos]
+        origen = np.repeat(np.arange(inicio, fin), n_candidatos)
+        pares.append(np.stack([origen, candidatos.ravel()], axis=1))
+    pares = np.concatenate(pares) if pares else np.empty((0, 2), dtype=np.int64)
+
+    # Cada par se evalúa una sola vez (i < j), sumando los productos de cada losa;
+    # los lotes de pares se dimensionan por las filas de la losa: sus dos copias
+    # float32 (filas x lote) usan a lo más la mitad de memoria_max
+    pares = np.unique(np.sort(pares, axis=1), axis=0)
+    tam_lote = max(1, int(memoria_max // (16 * filas_losa)))
+    exacta = np.zeros(len(pares))
+    for _, z in losas():
+        for inicio in range(0, len(pares), tam_lote):
+            lote = pares[inicio:inicio + tam_lote]
+            exacta[inicio:inicio + len(lote)] += np.einsum(
+                'ij,ij->j', z[:, lote[:, 0]], z[:, lote[:, 1]], dtype=np.float64)
+    exacta = np.clip(exacta, -1.0, 1.0)
+
+    # k mejores por variable sobre los candidatos exactos (en ambos sentidos)
+    peso = peso_arista(exacta, metodo)
+    extremos = np.concatenate([pares[:, 0], pares[:, 1]])
+    indice_par = np.concatenate([np.arange(len(pares))] * 2)
+    orden = np.lexsort((-np.concatenate([peso, peso]), extremos))
+    extremos, indice_par = extremos[orden], indice_par[orden]
+    inicio_grupo = np.searchsorted(extremos, extremos, side='left')
+    rango = np.arange(len(extremos)) - inicio_grupo
+    seleccionados = np.unique(indice_par[rango < k])
+
+    i, j = pares[seleccionados, 0], pares[seleccionados, 1]
+    matriz = sp.coo_matrix((exacta[seleccionados], (i, j)), shape=(p, p)).tocsr()
+    return CorrelacionDispersa(matriz, etiquetas, umbral=0.0, metodo=metodo, k=k)
+
+
+def recall_vecinos(datos, resultado, n_muestra=50, columnas=None, semilla=0,
+                   memoria_max=MEMORIA_ESTANDARIZADA):
+    """
+    Estima la exhaustividad (recall) de vecinos_correlacion comparando,
+    para una muestra de variables, sus k vecinos aproximados con los
+    exactos. Las correlaciones exactas de la muestra contra todas las
+    columnas se acumulan por losas de filas (ver _losas).
+    """
+    fuentes = fuentes_columnas(datos, columnas)
+    etiquetas = list(fuentes)
+    p = len(etiquetas)
+    n_filas = len(fuentes[etiquetas[0]]) if p else 0
+    medias, normas = medias_normas(fuentes, etiquetas)
+
+    simetrica = (resultado.matriz + resultado.matriz.T).tocsr()
+    rng = np.random.default_rng(semilla)
+    muestra = rng.choice(p, size=min(n_muestra, p), replace=False)
+
+    correlaciones = np.zeros((len(muestra), p))
+    for _, z in _losas(fuentes, etiquetas, medias, normas, _filas_losa(n_filas, p, memoria_max)):
+        correlaciones += (z[:, muestra].T @ z).astype(np.float64)
+
+    aciertos = 0
+    total = 0
+    for fila, i in enumerate(muestra):
+        peso = peso_arista(correlaciones[fila], resultado.metodo)
+        peso[i] = -np.inf
+        exactos = set(np.argsort(-peso, kind='stable')[:resultado.k])
+        aproximados = simetrica.indices[simetrica.indptr[i]:simetrica.indptr[i + 1]]
+        aciertos += len(exactos & set(aproximados))
+        total += len(exactos)
+    return aciertos / total if total else 1.0
+
+
+def guardar_aristas_csv(resultado, nombre_grafo, carpeta='grafos'):
+    """
+    Guarda las aristas en el formato CSV de grafos que lee
+    mst_kruskal.cargar_grafo_desde_csv (datos_grafo_<nombre>.csv).
+    """
+    if not os.path.exists(carpeta):
+        os.makedirs(carpeta)
+
+    i, j, r = resultado.tripletas()
+    peso = peso_arista(r, resultado.metodo)
+    grado = np.bincount(np.concatenate([i, j]), minlength=len(resultado.etiquetas))
+
+    nodos = pd.DataFrame({
+        'grafo': nombre_grafo,
+        'nodo': resultado.etiquetas,
+        'grado': grado,
+        'tipo': 'nodo',
+        'origen': '',
+        'destino': '',
+        'peso': '',
+        'distancia': ''
+    })
+    aristas = pd.DataFrame({
+        'grafo': nombre_grafo,
+        'nodo': '',
+        'grado': '',
+        'tipo': 'arista',
+        'origen': [resultado.etiquetas[a] for a in i],
+        'destino': [resultado.etiquetas[b] for b in j],
+        'peso': peso,
+        'distancia': 1.0 - peso
+    })
+    ruta_csv = os.path.join(carpeta, f"datos_grafo_{nombre_grafo}.csv")
+    pd.concat([nodos, aristas], ignore_index=True).to_csv(ruta_csv, index=False)
+    print(f"Aristas kNN guardadas (CSV): {ruta_csv}")
+    return ruta_csv
@@ -0,0 +1,207 @@
+# correlacion_prefijos.py
+import numpy as np
+import pandas as pd
+from alg import MotorParticiones, PORCENTAJES_PARTICIONES, validar_escalera, fraccion_particion
+
+
+class CorrelacionPrefijos:
+    """
+    Motor de correlación por sumas prefijas sobre el orden descendente del
+    criterio.
+
+    Todas las particiones B/W son ventanas contiguas de ese orden (Bk son las
+    primeras filas y Wk las últimas válidas), así que basta con recorrer las
+    filas una vez acumulando, en cada punto de corte, los conteos, sumas y
+    productos cruzados por pares de columnas. La matriz de Pearson de
+    cualquier ventana [inicio, fin) entre dos cortes se obtiene después como
+    diferencia de dos estados, en O(p²) y sin volver a leer las filas.
+
+    Los NaN se tratan por pares de observaciones completas, igual que
+    DataFrame.corr(method='pearson').
+    """
+
+    def __init__(self, df, criterion='target_y', cortes=None, escalera=PORCENTAJES_PARTICIONES,
+                 motor=None, ordenado=False, tam_bloque=200_000):
+        """
+        Parámetros:
+        - df: DataFrame (solo se usan las columnas numéricas)
+        - criterion: columna por la que se ordenan las filas
+        - cortes: posiciones adicionales del orden donde guardar estado
+          (ej. np.linspace(0, n, 100) para un barrido continuo)
+        - escalera: fracciones B/W cuyos límites se incluyen como cortes
+        - motor: MotorParticiones ya construido sobre df (evita reordenar)
+        - ordenado: True si las filas ya están en orden descendente del
+          criterio con los NaN al final (ej. la tabla base del almacén)
+        - tam_bloque: filas procesadas por bloque en la pasada
+        """
+        df_numerico = df.select_dtypes(include=[np.number])
+        self.columnas = list(df_numerico.columns)
+        self.escalera = validar_escalera(escalera)
+
+        if ordenado:
+            self.orden = None
+            self.n_filas = len(df_numerico)
+            self.n_validos = int(df_numerico[criterion].notna().sum())
+            self._motor = None
+        else:
+            if motor is None:
+                motor = MotorParticiones(df_numerico, criterion)
+            self.orden = np.asarray(motor.orden(ascending=False))
+            self.n_filas = len(self.orden)
+            self.n_validos = motor.n_validos
+            self._motor = motor
+
+        puntos = {0, self.n_validos, self.n_filas}
+        for porc in self.escalera:
+            for inicio, fin in self._ventanas(porc):
+                puntos.update((inicio, fin))
+        if cortes is not None:
+            puntos.update(int(c) for c in np.asarray(cortes).ravel())
+        if min(puntos) < 0 or max(puntos) > self.n_filas:
+            raise ValueError(f"Los cortes deben estar entre 0 y {self.n_filas}")
+
+        self.cortes = np.array(sorted(puntos), dtype=np.int64)
+        self._posicion = {int(c): i for i, c in enumerate(self.cortes)}
+        self._acumular(df_numerico, tam_bloque)
+
+    def _limites(self, porc):
+        if self._motor is not None:
+            return self._motor.limites(porc, "first")
+        # Mismo redondeo que MotorParticiones.limites(porc, "first")
+        return 0, int(self.n_filas * porc)
+
+    def _ventanas(self, porc):
+        """Ventanas [inicio, fin) de Bk y Wk en el orden descendente"""
+        inicio, fin = self._limites(porc)
+        return (inicio, fin), (self.n_validos - fin, self.n_validos - inicio)
+
+    def _acumular(self, df_numerico, tam_bloque):
+        p = len(self.columnas)
+        valores = df_numerico.to_numpy(dtype=np.float64, copy=False) if self.orden is None else None
+
+        # Centrar con la media global reduce la cancelación en las restas
+        self.centro = np.nan_to_num(df_numerico.mean().to_numpy(dtype=np.float64))
+        self.hay_nan = bool(df_numerico.isna().any().any())
+
+        k = len(self.cortes)
+        self._n = np.zeros((k, p, p))
+        self._sx = np.zeros((k, p, p))
+        self._sxx = np.zeros((k, p, p))
+        self._sxy = np.zeros((k, p, p))
+
+        estado = [np.zeros((p, p)) for _ in range(4)]
+        for i in range(1, k):
+            a, b = self.cortes[i - 1], self.cortes[i]
+            for inicio in range(a, b, tam_bloque):
+                fin = min(inicio + tam_bloque, b)
+                if self.orden is None:
+                    bloque = valores[inicio:fin]
+                else:
+                    bloque = df_numerico.iloc[self.orden[inicio:fin]].to_numpy(dtype=np.float64)
+                for acumulado, parcial in zip(estado, self._sumas_bloque(bloque - self.centro)):
+                    acumulado += parcial
+
+            self._n[i], self._sx[i], self._sxx[i], self._sxy[i] = estado
+
+    def _sumas_bloque(self, x):
+        """
+        Conteos y sumas por pares de un bloque centrado:
+        n[i, j] filas con i y j presentes, sx[i, j] suma de x_i en esas filas,
+        sxx[i, j] suma de x_i² y sxy[i, j] suma de x_i·x_j.
+        """
+        if not self.hay_nan:
+            n = np.full((x.shape[1], x.shape[1]), float(len(x)))
+            s = x.sum(axis=0)
+            return n, np.repeat(s[:, None], len(s), axis=1), \
+                np.repeat((x * x).sum(axis=0)[:, None], len(s), axis=1), x.T @ x
+
+        presente = (~np.isnan(x)).astype(np.float64)
+        x = np.nan_to_num(x)
+        return presente.T @ presente, x.T @ presente, (x * x).T @ presente, x.T @ x
+
+    def _indice(self, corte):
+        try:
+            return self._posicion[int(corte)]
+        except KeyError:
+            raise ValueError(f"{corte} no es un punto de corte del motor; "
+                             f"agrégalo con el parámetro cortes") from None
+
+    def _correlacion_estado(self, n, sx, sxx, sxy):
+        # Vale para un estado (p, p) o para una pila de estados (k, p, p)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = sxy - sx * np.swapaxes(sx, -1, -2) / n
+            var_i = sxx - sx * sx / n
+            var_j = np.swapaxes(var_i, -1, -2)
+            corr = cov / np.sqrt(var_i * var_j)
+        corr[(n < 1) | (var_i <= 0) | (var_j <= 0)] = np.nan
+        return np.clip(corr, -1.0, 1.0)
+
+    def correlacion_array(self, inicio, fin):
+        """Matriz de correlación (ndarray p x p) de la ventana [inicio, fin)"""
+        return self.tensor_ventanas([(inicio, fin)])[0]
+
+    def tensor_ventanas(self, ventanas):
+        """
+        Matrices de correlación de varias ventanas [inicio, fin) en una sola
+        operación vectorizada.
+
+        Retorna:
+        - ndarray (k, p, p)
+        """
+        a = np.array([self._indice(inicio) for inicio, _ in ventanas], dtype=np.int64)
+        b = np.array([self._indice(fin) for _, fin in ventanas], dtype=np.int64)
+        if np.any(a > b):
+            raise ValueError("inicio debe ser menor o igual que fin")
+        return self._correlacion_estado(self._n[b] - self._n[a], self._sx[b] - self._sx[a],
+                                        self._sxx[b] - self._sxx[a], self._sxy[b] - self._sxy[a])
+
+    def tensor(self, nombres):
+        """Matrices de correlación de varias particiones como ndarray (k, p, p)"""
+        return self.tensor_ventanas([self.ventana_particion(nombre) for nombre in nombres])
+
+    def correlacion(self, inicio, fin):
+        """Matriz de correlación de la ventana [inicio, fin) del orden descendente"""
+        return pd.DataFrame(self.correlacion_array(inicio, fin),
+                            index=self.columnas, columns=self.columnas)
+
+    def prefijo(self, fin):
+        """Matriz de correlación de las primeras fin filas (mayor criterio)"""
+        return self.correlacion(0, fin)
+
+    def ventana_particion(self, nombre):
+        """Ventana [inicio, fin) de una partición ('df_original', 'B4C', 'W30P', ...)"""
+        if nombre == 'df_original':
+            return 0, self.n_filas
+        if nombre[0] not in ('B', 'W'):
+            raise KeyError(f"Partición '{nombre}' no reconocida")
+        ventana_b, ventana_w = self._ventanas(fraccion_particion(nombre))
+        return ventana_b if nombre[0] == 'B' else ventana_w
+
+    def particion(self, nombre):
+        """Matriz de correlación de una partición B/W por su nombre"""
+        return self.correlacion(*self.ventana_particion(nombre))
+
+    def particiones(self, nombres):
+        """
+        Matrices de correlación de varias particiones.
+
+        Retorna:
+        - diccionario {nombre: DataFrame p x p}
+        """
+        return {
+            nombre: pd.DataFrame(matriz, index=self.columnas, columns=self.columnas)
+            for nombre, matriz in zip(nombres, self.tensor(nombres))
+        }
+
+    def barrido(self, desde=0):
+        """
+        Correlaciones de todas las ventanas [desde, corte) para los cortes
+        posteriores a desde.
+
+        Retorna:
+        - (cortes, tensor (k, p, p))
+        """
+        cortes = self.cortes[self.cortes > desde]
+        if len(cortes) == 0:
+            return cortes, np.empty((0, len(self.columnas), len(self.columnas)))
+        return cortes, self.tensor_ventanas([(desde, c) for c in cortes])
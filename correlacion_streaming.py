@@ -0,0 +1,217 @@
+# correlacion_streaming.py
+import numpy as np
+import pandas as pd
+import os
+from concurrent.futures import ProcessPoolExecutor
+from columnar import leer_esquema, abrir_columnas, cargar_tabla, ruta_columnar
+
+
+class AcumuladorPearson:
+    """
+    Acumulador fusionable de medias y co-momentos para la correlación de
+    Pearson por pares de observaciones completas.
+
+    Para cada par de columnas (i, j) guarda el número de filas con ambas
+    presentes, la media de x_i en esas filas, su suma de cuadrados centrada
+    (M2) y el co-momento centrado. Cada bloque se resume con productos
+    matriciales y se combina con el estado acumulado mediante la fórmula de
+    Chan (generalización por bloques de Welford), de modo que el resultado no
+    depende del tamaño ni del orden de los bloques y dos acumuladores
+    calculados en procesos distintos se pueden fusionar.
+    """
+
+    def __init__(self, columnas=None):
+        self.columnas = list(columnas) if columnas is not None else None
+        self.n = None
+        self.media = None
+        self.m2 = None
+        self.comomento = None
+
+    def _iniciar(self, p):
+        self.n = np.zeros((p, p))
+        self.media = np.zeros((p, p))
+        self.m2 = np.zeros((p, p))
+        self.comomento = np.zeros((p, p))
+
+    @staticmethod
+    def _estado_bloque(x):
+        """
+        Estado (n, media, m2, comomento) de un bloque (filas x columnas).
+        media[i, j] es la media de x_i en las filas donde x_j está presente.
+        """
+        presente = (~np.isnan(x)).astype(np.float64)
+        # Desplazar por la media del bloque evita cancelación en las restas
+        conteo = presente.sum(axis=0)
+        desplazamiento = np.nan_to_num(x).sum(axis=0) / np.maximum(conteo, 1)
+        xc = np.nan_to_num(x - desplazamiento)
+
+        n = presente.T @ presente
+        suma = xc.T @ presente
+        suma_cuadrados = (xc * xc).T @ presente
+        productos = xc.T @ xc
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            media_c = np.where(n > 0, suma / n, 0.0)
+        m2 = suma_cuadrados - media_c * suma
+        comomento = productos - media_c * suma.T
+        return n, media_c + desplazamiento[:, None], m2, comomento
+
+    def _combinar(self, n_b, media_b, m2_b, comomento_b):
+        n_a, media_a = self.n, self.media
+        n = n_a + n_b
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = media_b - media_a
+            factor = np.where(n > 0, n_a * n_b / n, 0.0)
+            peso_b = np.where(n > 0, n_b / n, 0.0)
+
+        self.media = media_a + delta * peso_b
+        self.m2 = self.m2 + m2_b + delta * delta * factor
+        # El co-momento del par (i, j) usa el delta de x_i y el de x_j
+        self.comomento = self.comomento + comomento_b + delta * delta.T * factor
+        self.n = n
+
+    def actualizar(self, bloque):
+        """
+        Añade un bloque de filas (DataFrame o array 2D). De un DataFrame se
+        usan solo las columnas numéricas.
+        """
+        if isinstance(bloque, pd.DataFrame):
+            bloque = bloque.select_dtypes(include=[np.number])
+            if self.columnas is None:
+                self.columnas = list(bloque.columns)
+            bloque = bloque.to_numpy(dtype=np.float64)
+        x = np.asarray(bloque, dtype=np.float64)
+        if x.ndim != 2:
+            raise ValueError("El bloque debe ser 2D (filas x columnas)")
+
+        if self.n is None:
+            self._iniciar(x.shape[1])
+        elif x.shape[1] != self.n.shape[0]:
+            raise ValueError(f"El bloque tiene {x.shape[1]} columnas; se esperaban {self.n.shape[0]}")
+
+        if len(x):
+            self._combinar(*self._estado_bloque(x))
+        return self
+
+    def fusionar(self, otro):
+        """Combina otro acumulador en este (in-place) y retorna self"""
+        if otro.n is None:
+            return self
+        if self.n is None:
+            self._iniciar(otro.n.shape[0])
+            self.columnas = otro.columnas
+        self._combinar(otro.n, otro.media, otro.m2, otro.comomento)
+        return self
+
+    def _etiquetas(self, p):
+        return self.columnas if self.columnas is not None else list(range(p))
+
+    def covarianza(self, ddof=1):
+        """Matriz de covarianza por pares (como DataFrame.cov)"""
+        if self.n is None:
+            raise ValueError("El acumulador está vacío")
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = self.comomento / (self.n - ddof)
+        cov[self.n - ddof <= 0] = np.nan
+        etiquetas = self._etiquetas(len(cov))
+        return pd.DataFrame(cov, index=etiquetas, columns=etiquetas)
+
+    def correlacion(self):
+        """Matriz de correlación de Pearson (como DataFrame.corr(method='pearson'))"""
+        if self.n is None:
+            raise ValueError("El acumulador está vacío")
+        var_i = self.m2
+        var_j = self.m2.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.comomento / np.sqrt(var_i * var_j)
+        corr[(self.n < 1) | (var_i <= 0) | (var_j <= 0)] = np.nan
+        corr = np.clip(corr, -1.0, 1.0)
+        etiquetas = self._etiquetas(len(corr))
+        return pd.DataFrame(corr, index=etiquetas, columns=etiquetas)
+
+
+def correlacion_bloques(bloques, columnas=None):
+    """
+    Correlación de Pearson de una secuencia de bloques (generador de
+    DataFrames o arrays 2D) sin reunirlos en memoria.
+    """
+    acumulador = AcumuladorPearson(columnas)
+    for bloque in bloques:
+        acumulador.actualizar(bloque)
+    return acumulador.correlacion()
+
+
+def correlacion_csv_streaming(ruta_csv, chunksize=100_000):
+    """Correlación de Pearson de un CSV leído por bloques"""
+    return correlacion_bloques(pd.read_csv(ruta_csv, chunksize=chunksize))
+
+
+def _acumular_rango(carpeta, columnas, inicio, fin, tam_bloque):
+    """Trabajo de un proceso: acumula las filas [inicio, fin) de una carpeta columnar"""
+    mapas = abrir_columnas(carpeta, columnas)
+    acumulador = AcumuladorPearson(columnas)
+    for a in range(inicio, fin, tam_bloque):
+        b = min(a + tam_bloque, fin)
+        acumulador.actualizar(np.column_stack([mapas[col][a:b] for col in columnas]))
+    return acumulador
+
+
+def acumular_columnar(carpeta, columnas=None, n_procesos=None, tam_bloque=200_000):
+    """
+    Acumula una tabla columnar repartiendo rangos de filas entre procesos.
+    Cada proceso mapea los mismos archivos (sin copiar la tabla) y retorna
+    su acumulador parcial, que luego se fusiona.
+
+    Parámetros:
+    - carpeta: carpeta columnar (ver columnar.py)
+    - columnas: columnas a incluir (None = todas)
+    - n_procesos: procesos a usar (None = os.cpu_count(), 1 = sin procesos)
+    - tam_bloque: filas por bloque dentro de cada proceso
+
+    Retorna:
+    - AcumuladorPearson con toda la tabla
+    """
+    esquema = leer_esquema(carpeta)
+    columnas = list(esquema['columnas']) if columnas is None else list(columnas)
+    n_filas = esquema['n_filas']
+    n_procesos = n_procesos or os.cpu_count() or 1
+    n_procesos = max(1, min(n_procesos, -(-n_filas // tam_bloque)))
+
+    limites = np.linspace(0, n_filas, n_procesos + 1).astype(np.int64)
+    rangos = [(int(a), int(b)) for a, b in zip(limites[:-1], limites[1:])]
+
+    if n_procesos == 1:
+        return _acumular_rango(carpeta, columnas, 0, n_filas, tam_bloque)
+
+    acumulador = AcumuladorPearson(columnas)
+    with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+        parciales = ejecutor.map(_acumular_rango, [carpeta] * len(rangos), [columnas] * len(rangos),
+                                 [a for a, _ in rangos], [b for _, b in rangos],
+                                 [tam_bloque] * len(rangos))
+        for parcial in parciales:
+            acumulador.fusionar(parcial)
+    return acumulador
+
+
+def correlacion_archivo(ruta_csv, n_procesos=None, tam_bloque=200_000):
+    """
+    Correlación de Pearson de un CSV del pipeline usando su versión columnar
+    (se crea la primera vez) y reducción en paralelo.
+    """
+    cargar_tabla(ruta_csv, como='arrays')
+    return acumular_columnar(ruta_columnar(ruta_csv), n_procesos=n_procesos,
+                             tam_bloque=tam_bloque).correlacion()
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("CORRELACIÓN DE PEARSON POR STREAMING")
+    print("=" * 70)
+
+    # CONFIGURACIÓN
+    RUTA_ENTRADA = 'data/df_original.csv'
+    N_PROCESOS = None        # None = todos los núcleos
+    TAM_BLOQUE = 200_000     # Filas por bloque
+
+    matriz = correlacion_archivo(RUTA_ENTRADA, n_procesos=N_PROCESOS, tam_bloque=TAM_BLOQUE)
+    print(matriz.round(3))
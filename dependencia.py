@@ -0,0 +1,433 @@
+# dependencia.py
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+from scipy.linalg import cho_factor, cho_solve
+
+# Medidas de dependencia disponibles en matriz_dependencia()
+MEDIDAS = ('pearson', 'spearman', 'kendall', 'informacion_mutua', 'dcor', 'parcial')
+
+# Memoria máxima de los intermedios de un lote de columnas (bytes)
+MEMORIA_DEPENDENCIA = 256 * 2**20
+
+# Bytes intermedios por celda (fila x columna del lote) de cada medida,
+# medidos con tracemalloc en el peor relleno a potencia de 2
+_BYTES_SPEARMAN = 64
+_BYTES_KENDALL = 256
+_BYTES_DCOR = 512
+_BYTES_INFORMACION_MUTUA = 64
+
+
+def _columnas_por_lote(n_filas, bytes_por_celda, memoria_max):
+    """Columnas de Y por llamada a funcion_lote para no superar memoria_max"""
+    return max(1, int(memoria_max // max(n_filas * bytes_por_celda, 1)))
+
+
+def _matriz_por_pares(valores, funcion_lote, bytes_por_celda=64, memoria_max=MEMORIA_DEPENDENCIA):
+    """
+    Arma la matriz simétrica p x p de una medida por pares.
+
+    funcion_lote(x, Y) recibe una columna x (n,) y un bloque Y (n, m) sin NaN
+    y retorna las m medidas de x contra cada columna de Y. Las columnas sin
+    NaN se procesan en lotes de m columnas, con m tal que los intermedios
+    (n x m x bytes_por_celda) quepan en memoria_max; los pares con NaN usan
+    solo sus filas completas (como DataFrame.corr).
+    """
+    n_filas, p = valores.shape
+    con_nan = np.isnan(valores).any(axis=0)
+    matriz = np.eye(p)
+    tam_lote = _columnas_por_lote(n_filas, bytes_por_celda, memoria_max)
+
+    for i in range(p):
+        columna = valores[:, i]
+        validos = columna[~np.isnan(columna)]
+        if len(validos) < 2 or np.all(validos == validos[0]):
+            matriz[i, i] = np.nan
+
+        siguientes = np.arange(i + 1, p)
+        if len(siguientes) == 0:
+            continue
+
+        en_bloque = siguientes[~con_nan[siguientes]] if not con_nan[i] else siguientes[:0]
+        for inicio in range(0, len(en_bloque), tam_lote):
+            lote = en_bloque[inicio:inicio + tam_lote]
+            matriz[i, lote] = funcion_lote(columna, valores[:, lote])
+
+        for j in np.setdiff1d(siguientes, en_bloque):
+            completas = ~np.isnan(columna) & ~np.isnan(valores[:, j])
+            if completas.sum() < 2:
+                matriz[i, j] = np.nan
+                continue
+            matriz[i, j] = funcion_lote(columna[completas], valores[completas, j][:, None])[0]
+
+    superior = np.triu_indices(p, k=1)
+    matriz[(superior[1], superior[0])] = matriz[superior]
+    return matriz
+
+
+def _pearson_lote(x, Y):
+    """Pearson de x contra cada columna de Y (un producto matriz-vector)"""
+    xc = x - x.mean()
+    Yc = Y - Y.mean(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = (xc @ Yc) / np.sqrt((xc @ xc) * np.einsum('ij,ij->j', Yc, Yc))
+    return np.clip(r, -1.0, 1.0)
+
+
+# ---------------------------------------------------------------------------
+# Spearman
+# ---------------------------------------------------------------------------
+
+def spearman(valores, memoria_max=MEMORIA_DEPENDENCIA):
+    """
+    Spearman: un rango promedio por columna y una sola correlación de
+    Pearson (GEMM) sobre los rangos. Con NaN, los pares afectados se
+    recalculan con los rangos de sus filas completas, en lotes acotados por
+    memoria_max.
+    """
+    if not np.isnan(valores).any():
+        rangos = rankdata(valores, axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            matriz = np.corrcoef(rangos, rowvar=False)
+        return np.clip(np.atleast_2d(matriz), -1.0, 1.0)
+
+    def lote(x, Y):
+        return _pearson_lote(rankdata(x), rankdata(Y, axis=0))
+
+    return _matriz_por_pares(valores, lote, _BYTES_SPEARMAN, memoria_max)
+
+
+# ---------------------------------------------------------------------------
+# Dominancia por niveles de mezcla (Kendall y correlación de distancia)
+# ---------------------------------------------------------------------------
+
+def _dominancia(y, pesos):
+    """
+    Para cada posición k de cada fila de y (m, n) suma los pesos de las
+    posiciones anteriores cuyo valor es <= y[:, k].
+
+    Equivale a un merge sort ascendente: en cada nivel los elementos de la
+    mitad derecha de un bloque buscan (searchsorted) su posición en la mitad
+    izquierda, ya ordenada, y toman la suma acumulada de sus pesos. Todos los
+    bloques y filas de un nivel se resuelven con una sola búsqueda sobre
+    claves desplazadas por bloque, así que el costo es O(n log n) por fila
+    con log n operaciones vectorizadas.
+
+    Los intermedios son O(m·n·q): los llamadores acotan m (columnas por
+    lote, ver _matriz_por_pares) y q es a lo más 4.
+
+    Parámetros:
+    - y: rangos enteros (m, n) en [0, n)
+    - pesos: array (m, n, q)
+
+    Retorna:
+    - array (m, n, q) con las sumas por posición original
+    """
+    m, n = y.shape
+    q = pesos.shape[2]
+    largo = 1 << max(0, int(np.ceil(np.log2(max(n, 1)))))
+
+    # Relleno al final: valor mayor que cualquier rango y peso nulo
+    valores = np.full((m, largo), n, dtype=np.int64)
+    valores[:, :n] = y
+    w = np.zeros((m, largo, q))
+    w[:, :n] = pesos
+    ids = np.broadcast_to(np.arange(largo), (m, largo)).copy()
+    resultado = np.zeros((m, largo, q))
+
+    ancho = 1
+    while ancho < largo:
+        n_bloques = largo // (2 * ancho)
+        v = valores.reshape(m, n_bloques, 2 * ancho)
+        pw = w.reshape(m, n_bloques, 2 * ancho, q)
+
+        # Claves desplazadas: cada (fila, bloque) ocupa un rango disjunto
+        desplazamiento = (np.arange(m * n_bloques).reshape(m, n_bloques, 1)) * (n + 1)
+        izquierda = (v[:, :, :ancho] + desplazamiento).ravel()
+        derecha = v[:, :, ancho:] + desplazamiento
+        posicion = np.searchsorted(izquierda, derecha.ravel(), side='right').reshape(derecha.shape)
+        posicion -= (np.arange(m * n_bloques) * ancho).reshape(m, n_bloques, 1)
+
+        acumulado = np.zeros((m, n_bloques, ancho + 1, q))
+        np.cumsum(pw[:, :, :ancho], axis=2, out=acumulado[:, :, 1:])
+        aporte = np.take_along_axis(acumulado, posicion[..., None], axis=2)
+
+        ids_derecha = ids.reshape(m, n_bloques, 2 * ancho)[:, :, ancho:]
+        filas = np.broadcast_to(np.arange(m).reshape(m, 1, 1), ids_derecha.shape)
+        resultado[filas, ids_derecha] += aporte
+
+        # Mezcla: las dos mitades ya ordenadas (el orden estable detecta las corridas)
+        orden = np.argsort(v, axis=2, kind='stable')
+        valores = np.take_along_axis(v, orden, axis=2).reshape(m, largo)
+        w = np.take_along_axis(pw, orden[..., None], axis=2).reshape(m, largo, q)
+        ids = np.take_along_axis(ids.reshape(m, n_bloques, 2 * ancho), orden, axis=2).reshape(m, largo)
+        ancho *= 2
+
+    return resultado[:, :n]
+
+
+def _pares_empatados(claves):
+    """Número de pares empatados t(t-1)/2 por columna de claves (n, m)"""
+    ordenadas = np.sort(claves, axis=0)
+    n, m = ordenadas.shape
+    if n == 0:
+        return np.zeros(m)
+    nuevo = np.ones((n, m), dtype=bool)
+    nuevo[1:] = ordenadas[1:] != ordenadas[:-1]
+    grupo = np.cumsum(nuevo, axis=0) - 1 + np.arange(m) * n
+    tamanos = np.bincount(grupo.T.ravel(), minlength=n * m).reshape(m, n)
+    return (tamanos * (tamanos - 1) / 2).sum(axis=1)
+
+
+def _kendall_lote(x, Y):
+    """
+    Tau-b de Kendall de x contra cada columna de Y con el algoritmo de
+    Knight: ordenar por (x, y) y contar inversiones de y en O(n log n).
+    """
+    n, m = Y.shape
+    rx = rankdata(x, method='dense').astype(np.int64) - 1
+    ry = (rankdata(Y, method='dense', axis=0) - 1).astype(np.int64)
+
+    clave = rx[:, None] * (n + 1) + ry
+    orden = np.argsort(clave, axis=0, kind='stable')
+    y_ordenada = np.take_along_axis(ry, orden, axis=0).T
+
+    menores_iguales = _dominancia(y_ordenada, np.ones((m, n, 1)))[:, :, 0]
+    intercambios = (np.arange(n) - menores_iguales).sum(axis=1)
+
+    n0 = n * (n - 1) / 2
+    n1 = _pares_empatados(rx[:, None])[0]
+    n2 = _pares_empatados(ry)
+    n3 = _pares_empatados(clave)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tau = (n0 - n1 - n2 + n3 - 2 * intercambios) / np.sqrt((n0 - n1) * (n0 - n2))
+    return np.clip(tau, -1.0, 1.0)
+
+
+def kendall(valores, memoria_max=MEMORIA_DEPENDENCIA):
+    """Tau-b de Kendall por pares en O(p² n log n), en lotes acotados por memoria_max"""
+    return _matriz_por_pares(valores, _kendall_lote, _BYTES_KENDALL, memoria_max)
+
+
+def _suma_distancias(x):
+    """a_i = sum_j |x_i - x_j| para todas las filas, en O(n log n)"""
+    orden = np.argsort(x, kind='stable')
+    xs = x[orden]
+    n = len(x)
+    acumulado = np.cumsum(xs)
+    k = np.arange(n)
+    suma = xs * k - (acumulado - xs) + (acumulado[-1] - acumulado) - xs * (n - 1 - k)
+    resultado = np.empty(n)
+    resultado[orden] = suma
+    return resultado
+
+
+def _dcov2(x, y, a_x, a_y):
+    """dCov² (estadístico V) de x contra cada columna de y: (n,), (n, m)"""
+    n, m = y.shape
+    orden = np.argsort(x, kind='stable')
+    xs = x[orden]
+    ys = y[orden].T
+    ry = (rankdata(ys, method='max', axis=1) - 1).astype(np.int64)
+
+    # Pesos (1, x, y, x·y) de los elementos anteriores en el orden de x
+    pesos = np.stack([np.ones((m, n)), np.broadcast_to(xs, (m, n)), ys, xs * ys], axis=2)
+    menores = _dominancia(ry, pesos)
+    totales = np.cumsum(pesos, axis=1) - pesos
+    s = 2 * menores - totales
+
+    # sum_{i<j} |x_j - x_i| |y_j - y_i| con signo según y_i <= y_j
+    cruzado = (xs * ys * s[:, :, 0] - xs * s[:, :, 2] - ys * s[:, :, 1] + s[:, :, 3]).sum(axis=1)
+    suma_ab = 2 * cruzado
+
+    a_y = a_y[orden].T
+    a_x = a_x[orden]
+    return (suma_ab / n ** 2
+            - 2 * (a_y @ a_x) / n ** 3
+            + a_x.sum() * a_y.sum(axis=1) / n ** 4)
+
+
+def _dvar2(x, a_x):
+    """dVar² (estadístico V) de x usando sum_ij (x_i - x_j)² en forma cerrada"""
+    n = len(x)
+    suma_aa = 2 * n * (x @ x) - 2 * x.sum() ** 2
+    return suma_aa / n ** 2 - 2 * (a_x @ a_x) / n ** 3 + a_x.sum() ** 2 / n ** 4
+
+
+def _dcor_lote(x, Y):
+    """Correlación de distancia de x contra cada columna de Y"""
+    # Estandarizar no cambia dCor y acota los errores de redondeo
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = (x - x.mean()) / x.std()
+        Y = (Y - Y.mean(axis=0)) / Y.std(axis=0)
+    if not np.isfinite(x).all():
+        return np.full(Y.shape[1], np.nan)
+
+    resultado = np.full(Y.shape[1], np.nan)
+    validas = np.isfinite(Y).all(axis=0)
+    if not validas.any():
+        return resultado
+    Y = Y[:, validas]
+
+    a_x = _suma_distancias(x)
+    a_y = np.column_stack([_suma_distancias(Y[:, j]) for j in range(Y.shape[1])])
+    dcov2 = _dcov2(x, Y, a_x, a_y)
+    dvar_x = _dvar2(x, a_x)
+    dvar_y = np.array([_dvar2(Y[:, j], a_y[:, j]) for j in range(Y.shape[1])])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        resultado[validas] = np.sqrt(np.clip(dcov2 / np.sqrt(dvar_x * dvar_y), 0.0, 1.0))
+    return resultado
+
+
+def dcor(valores, memoria_max=MEMORIA_DEPENDENCIA):
+    """Correlación de distancia (Székely) por pares en O(p² n log n), en lotes acotados por memoria_max"""
+    return _matriz_por_pares(valores, _dcor_lote, _BYTES_DCOR, memoria_max)
+
+
+# ---------------------------------------------------------------------------
+# Información mutua
+# ---------------------------------------------------------------------------
+
+def _bins_por_defecto(n):
+    return int(np.clip(round(n ** (1 / 3)), 2, 64))
+
+
+def _codigos_cuantiles(valores, bins):
+    """Discretiza por cuantiles (igual frecuencia); los empates caen en el mismo bin"""
+    n = valores.shape[0]
+    rangos = rankdata(valores, method='min', axis=0) - 1
+    return np.minimum((rangos * bins) // max(n, 1), bins - 1).astype(np.int64)
+
+
+def informacion_mutua(valores, bins=None, memoria_max=MEMORIA_DEPENDENCIA):
+    """
+    Información mutua por pares con histogramas de igual frecuencia (con
+    corrección de sesgo de Miller-Madow), convertida a escala de correlación con el coeficiente de Linfoot
+    sqrt(1 - exp(-2·IM)) (0 = independencia, 1 = dependencia total).
+
+    Todas las tablas de contingencia de una columna contra las demás salen
+    de un solo np.bincount por lote de columnas (acotado por memoria_max).
+    """
+    def lote(x, Y):
+        n, m = Y.shape
+        b = bins or _bins_por_defecto(n)
+        cx = _codigos_cuantiles(x, b)
+        cy = _codigos_cuantiles(Y, b)
+
+        celdas = (np.arange(m) * b * b)[None, :] + cx[:, None] * b + cy
+        conjunta = np.bincount(celdas.ravel(), minlength=m * b * b).reshape(m, b, b) / n
+        px = conjunta.sum(axis=2, keepdims=True)
+        py = conjunta.sum(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            terminos = np.where(conjunta > 0, conjunta * np.log(conjunta / (px * py)), 0.0)
+        # Corrección de Miller-Madow del sesgo positivo del estimador por histogramas
+        celdas_x = (px > 0).sum(axis=(1, 2))
+        celdas_y = (py > 0).sum(axis=(1, 2))
+        sesgo = (celdas_x - 1) * (celdas_y - 1) / (2 * n)
+        im = np.maximum(terminos.sum(axis=(1, 2)) - sesgo, 0.0)
+        return np.sqrt(1 - np.exp(-2 * im))
+
+    return _matriz_por_pares(valores, lote, _BYTES_INFORMACION_MUTUA, memoria_max)
+
+
+# ---------------------------------------------------------------------------
+# Correlación parcial
+# ---------------------------------------------------------------------------
+
+def _contraccion_ledoit_wolf(z):
+    """
+    Intensidad de contracción de Ledoit-Wolf de la covarianza muestral de z
+    (n, p) centrada hacia mu·I, con mu = traza / p.
+    """
+    n, p = z.shape
+    s = (z.T @ z) / n
+    mu = np.trace(s) / p
+    delta2 = (np.sum(s * s) - 2 * mu * np.trace(s) + mu * mu * p) / p
+    if delta2 <= 0:
+        return 1.0
+    # Varianza de los productos x_k x_kᵀ alrededor de s, sin formarlos
+    normas4 = np.sum(np.einsum('ij,ij->i', z, z) ** 2)
+    beta2 = (normas4 / n - np.sum(s * s)) / (n * p)
+    return float(np.clip(beta2 / delta2, 0.0, 1.0))
+
+
+def parcial(valores, contraccion=None):
+    """
+    Correlación parcial de cada par dado el resto de las variables, a partir
+    de la matriz de precisión de una covarianza contraída (Ledoit-Wolf).
+
+    Las columnas se estandarizan, la covarianza se contrae hacia la
+    identidad escalada (invertible aunque p >= n) y se invierte con una sola
+    factorización de Cholesky: r_ij·resto = -P_ij / sqrt(P_ii P_jj). Una
+    factorización O(p³) reemplaza las p² regresiones.
+
+    - contraccion: intensidad en [0, 1]; None = estimador de Ledoit-Wolf
+
+    Los NaN se reemplazan por la media de su columna; las columnas
+    constantes quedan en NaN.
+    """
+    n, p = valores.shape
+    presentes = ~np.isnan(valores)
+    medias = np.nan_to_num(valores).sum(axis=0) / np.maximum(presentes.sum(axis=0), 1)
+    centrados = np.nan_to_num(valores - medias)
+    desviaciones = np.sqrt(np.sum(centrados * centrados, axis=0) / max(n, 1))
+    variables = np.flatnonzero(desviaciones > 0)
+
+    matriz = np.full((p, p), np.nan)
+    if len(variables) == 0:
+        return matriz
+
+    z = centrados[:, variables] / desviaciones[variables]
+    if contraccion is None:
+        contraccion = _contraccion_ledoit_wolf(z)
+    covarianza = (z.T @ z) / n
+    mu = np.trace(covarianza) / len(variables)
+    covarianza *= 1 - contraccion
+    covarianza[np.diag_indices_from(covarianza)] += contraccion * mu
+
+    precision = cho_solve(cho_factor(covarianza, lower=True), np.eye(len(variables)))
+    diagonal = np.sqrt(np.diag(precision))
+    parciales = -precision / np.outer(diagonal, diagonal)
+    parciales[np.diag_indices_from(parciales)] = 1.0
+    matriz[np.ix_(variables, variables)] = np.clip(parciales, -1.0, 1.0)
+    return matriz
+
+
+def pearson(valores):
+    """Pearson por pares de observaciones completas"""
+    return pd.DataFrame(valores).corr(method='pearson').to_numpy()
+
+
+def matriz_dependencia(df, medida='pearson', **opciones):
+    """
+    Matriz de dependencia entre las columnas numéricas de df.
+
+    Parámetros:
+    - medida: 'pearson', 'spearman', 'kendall', 'informacion_mutua', 'dcor'
+      o 'parcial'
+    - opciones: parámetros propios de la medida (ej. bins=16 para
+      'informacion_mutua', contraccion=0.1 para 'parcial', memoria_max en
+      bytes para los lotes de 'spearman', 'kendall', 'informacion_mutua' y
+      'dcor')
+
+    Pearson, Spearman, Kendall y la correlación parcial conservan el signo
+    en [-1, 1]; información mutua (Linfoot) y dcor están en [0, 1].
+
+    Retorna:
+    - DataFrame p x p con las columnas numéricas como índice y columnas
+    """
+    funciones = {
+        'pearson': pearson,
+        'spearman': spearman,
+        'kendall': kendall,
+        'informacion_mutua': informacion_mutua,
+        'dcor': dcor,
+        'parcial': parcial
+    }
+    if medida not in funciones:
+        raise ValueError(f"Medida debe ser una de: {', '.join(MEDIDAS)}")
+
+    df_numeric = df.select_dtypes(include=[np.number])
+    valores = df_numeric.to_numpy(dtype=np.float64)
+    matriz = funciones[medida](valores, **opciones)
+    return pd.DataFrame(matriz, index=df_numeric.columns, columns=df_numeric.columns)
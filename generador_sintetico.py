@@ -0,0 +1,290 @@
+# generador_sintetico.py
+import numpy as np
+import scipy.sparse as sp
+import os
+from columnar import EscritorColumnar
+
+# Filas generadas con cada semilla (semilla, unidad): la salida no depende
+# del tamaño de bloque
+FILAS_POR_SEMILLA = 2**14
+
+# Variables de main.py que dependen del factor latente L
+VARIABLES_ABUELAS = ['x_3', 'x_5', 'x_6', 'x_7',
+                     'x_10', 'x_12',
+                     'x_15', 'x_16', 'x_17',
+                     'x_20', 'x_22',
+                     'x_27', 'x_30',
+                     'x_31', 'x_32', 'x_34',
+                     'x_35', 'x_36', 'x_37', 'x_38']
+
+# Dependencias de main.py: hijo -> {padre: coeficiente}
+DEPENDENCIAS_MAIN = {
+    'x_9': {'x_7': 0.5, 'x_6': 0.4, 'x_5': -0.5, 'x_3': 0.6},
+    'x_11': {'x_12': 0.5, 'x_10': 0.6},
+    'x_18': {'x_15': 0.5, 'x_16': -0.4, 'x_17': 0.5},
+    'x_21': {'x_22': 0.7, 'x_20': 0.6},
+    'x_24': {'x_27': 0.5, 'x_30': 0.5},
+    'x_33': {'x_32': 0.6, 'x_31': -0.5, 'x_34': 0.4},
+    'x_39': {'x_35': 0.4, 'x_36': 0.4, 'x_37': 0.5, 'x_38': 0.6},
+    'target_y': {'x_39': 3.0, 'x_33': 2.5, 'x_24': -2.0, 'x_21': 2.0,
+                 'x_18': 2.5, 'x_11': 3.0, 'x_9': 2.0},
+}
+
+
+def _niveles_topologicos(coeficientes):
+    """
+    Asigna a cada variable su nivel en el DAG (0 = sin padres) y verifica
+    que no existan ciclos.
+    """
+    p = coeficientes.shape[0]
+    coef_csr = sp.csr_matrix(coeficientes)
+    niveles = np.full(p, -1, dtype=np.int64)
+    pendientes = set(range(p))
+
+    while pendientes:
+        resueltas = []
+        for j in pendientes:
+            padres = coef_csr.indices[coef_csr.indptr[j]:coef_csr.indptr[j + 1]]
+            if np.all(niveles[padres] >= 0):
+                niveles[j] = niveles[padres].max() + 1 if len(padres) else 0
+                resueltas.append(j)
+        if not resueltas:
+            raise ValueError("La matriz de coeficientes contiene un ciclo")
+        pendientes.difference_update(resueltas)
+
+    return niveles
+
+
+def crear_modelo(columnas, coeficientes, carga_latente, escala_ruido):
+    """
+    Construye la especificación de un modelo lineal sobre un DAG.
+
+    Cada variable j se genera como:
+        x_j = sum_i B[j, i] * x_i + carga_latente[j] * L + escala_ruido[j] * e_j
+    con L y e_j normales estándar independientes.
+
+    Parámetros:
+    - columnas: nombres de las variables (orden de salida)
+    - coeficientes: matriz dispersa B (p x p), B[j, i] = efecto del padre i sobre j
+    - carga_latente: vector (p,) de cargas sobre el factor latente L
+    - escala_ruido: vector (p,) de desviaciones del ruido propio
+
+    Retorna:
+    - diccionario con la especificación y los niveles topológicos
+    """
+    coeficientes = sp.csr_matrix(coeficientes, dtype=np.float64)
+    p = len(columnas)
+    if coeficientes.shape != (p, p):
+        raise ValueError(f"La matriz de coeficientes debe ser {p}x{p}")
+
+    niveles = _niveles_topologicos(coeficientes)
+    return {
+        'columnas': list(columnas),
+        'coeficientes': coeficientes,
+        'carga_latente': np.asarray(carga_latente, dtype=np.float64),
+        'escala_ruido': np.asarray(escala_ruido, dtype=np.float64),
+        'niveles': niveles,
+        # Filas de B agrupadas por nivel: una multiplicación por nivel y bloque
+        'bloques_nivel': [
+            (np.flatnonzero(niveles == nivel), coeficientes[np.flatnonzero(niveles == nivel)])
+            for nivel in range(1, niveles.max() + 1)
+        ]
+    }
+
+
+def modelo_main(dim_x=39, noise_scale=0.1):
+    """
+    Modelo de dependencias de main.py expresado como DAG disperso:
+    raíces N(0, 1), abuelas 0.8*L + 0.6*e, hijos y target_y como
+    combinaciones lineales de sus padres con ruido 0.1.
+    """
+    columnas = [f'x_{i+1}' for i in range(dim_x)] + ['target_y']
+    posicion = {col: j for j, col in enumerate(columnas)}
+    p = len(columnas)
+
+    carga_latente = np.zeros(p)
+    escala_ruido = np.ones(p)
+    for col in VARIABLES_ABUELAS:
+        carga_latente[posicion[col]] = 0.8
+        escala_ruido[posicion[col]] = 0.6
+
+    filas, cols, valores = [], [], []
+    for hijo, padres in DEPENDENCIAS_MAIN.items():
+        escala_ruido[posicion[hijo]] = noise_scale
+        for padre, coef in padres.items():
+            filas.append(posicion[hijo])
+            cols.append(posicion[padre])
+            valores.append(coef)
+
+    coeficientes = sp.csr_matrix((valores, (filas, cols)), shape=(p, p))
+    return crear_modelo(columnas, coeficientes, carga_latente, escala_ruido)
+
+
+def modelo_aleatorio(n_variables, n_capas=3, max_padres=4, fraccion_latente=0.3,
+                     n_padres_objetivo=10, noise_scale=0.1, semilla=42):
+    """
+    Modelo aleatorio en capas para pruebas de carga con miles de variables.
+
+    Las variables de la capa c solo tienen padres en capas anteriores, de modo
+    que la profundidad del DAG (y el número de multiplicaciones por bloque)
+    es n_capas. La última columna es 'target_y'.
+    """
+    rng = np.random.default_rng(semilla)
+    p = n_variables + 1
+    columnas = [f'x_{i+1}' for i in range(n_variables)] + ['target_y']
+
+    capas = np.sort(rng.integers(0, n_capas, size=n_variables))
+    capas[0] = 0  # Al menos una raíz
+
+    carga_latente = np.where(rng.random(p) < fraccion_latente, 0.8, 0.0)
+    escala_ruido = np.where(carga_latente > 0, 0.6, 1.0)
+
+    filas, cols, valores = [], [], []
+    for j in range(n_variables):
+        candidatos = np.flatnonzero(capas < capas[j])
+        if len(candidatos) == 0:
+            continue
+        padres = rng.choice(candidatos, size=min(max_padres, len(candidatos)), replace=False)
+        # Coeficientes escalados para que la varianza no crezca con las capas
+        coefs = rng.uniform(0.3, 0.7, size=len(padres)) * rng.choice([-1, 1], size=len(padres))
+        coefs /= np.sqrt(len(padres))
+        filas.extend([j] * len(padres))
+        cols.extend(padres.tolist())
+        valores.extend(coefs.tolist())
+        escala_ruido[j] = noise_scale
+
+    padres_y = rng.choice(n_variables, size=min(n_padres_objetivo, n_variables), replace=False)
+    filas.extend([p - 1] * len(padres_y))
+    cols.extend(padres_y.tolist())
+    valores.extend(rng.uniform(2.0, 3.0, size=len(padres_y)) * rng.choice([-1, 1], size=len(padres_y)))
+    carga_latente[p - 1] = 0.0
+    escala_ruido[p - 1] = noise_scale
+
+    coeficientes = sp.csr_matrix((valores, (filas, cols)), shape=(p, p))
+    return crear_modelo(columnas, coeficientes, carga_latente, escala_ruido)
+
+
+def generar_bloque(modelo, n_filas, rng):
+    """
+    Genera un bloque de datos del modelo como array por columnas (p, n_filas).
+
+    Cada nivel del DAG se resuelve con una única multiplicación dispersa
+    sobre las variables ya generadas.
+    """
+    p = len(modelo['columnas'])
+    bloque_t = rng.standard_normal((p, n_filas))
+    bloque_t *= modelo['escala_ruido'][:, None]
+
+    latente = rng.standard_normal(n_filas)
+    con_latente = np.flatnonzero(modelo['carga_latente'])
+    bloque_t[con_latente] += modelo['carga_latente'][con_latente, None] * latente
+
+    for indices, coef_nivel in modelo['bloques_nivel']:
+        bloque_t[indices] += coef_nivel @ bloque_t
+
+    return bloque_t
+
+
+def _bloques_reproducibles(modelo, n_filas, tam_bloque, semilla, dtype):
+    """
+    Entrega bloques (p, tam_bloque) de filas del modelo ya convertidos a
+    dtype. Las filas se generan por unidades de FILAS_POR_SEMILLA con la
+    semilla (semilla, unidad) y se reagrupan en bloques, así que el
+    resultado es el mismo para cualquier tam_bloque.
+    """
+    n_unidades = (n_filas + FILAS_POR_SEMILLA - 1) // FILAS_POR_SEMILLA
+    trozos, n_trozos = [], 0
+    for u in range(n_unidades):
+        filas_unidad = min(FILAS_POR_SEMILLA, n_filas - u * FILAS_POR_SEMILLA)
+        rng = np.random.default_rng([semilla, u])
+        trozos.append(generar_bloque(modelo, filas_unidad, rng).astype(dtype, copy=False))
+        n_trozos += filas_unidad
+        ultima = u == n_unidades - 1
+        if n_trozos < tam_bloque and not ultima:
+            continue
+
+        pendiente = np.concatenate(trozos, axis=1) if len(trozos) > 1 else trozos[0]
+        completos = n_trozos if ultima else n_trozos - n_trozos % tam_bloque
+        for inicio in range(0, completos, tam_bloque):
+            yield pendiente[:, inicio:min(inicio + tam_bloque, completos)]
+        trozos = [pendiente[:, completos:]] if completos < n_trozos else []
+        n_trozos -= completos
+
+
+def generar_columnar(modelo, n_filas, carpeta, tam_bloque=None, memoria_bloque=256 * 2**20,
+                     semilla=42, dtype='float64', positivos=True):
+    """
+    Genera n_filas del modelo por bloques y las escribe en formato columnar.
+
+    Parámetros:
+    - modelo: especificación de crear_modelo / modelo_main / modelo_aleatorio
+    - n_filas: número total de filas
+    - carpeta: carpeta de salida (un .npy por columna + esquema.json)
+    - tam_bloque: filas por bloque; por defecto se ajusta a memoria_bloque bytes
+    - semilla: semilla base; cada unidad de FILAS_POR_SEMILLA filas usa la
+      semilla (semilla, unidad), así que la salida no depende de tam_bloque
+    - dtype: 'float64' o 'float32'
+    - positivos: aplica el desplazamiento por mínimo de main.py (col - min si min < 0)
+
+    Retorna:
+    - ruta del esquema JSON
+    """
+    p = len(modelo['columnas'])
+    if tam_bloque is None:
+        tam_bloque = max(1, memoria_bloque // (8 * p))
+    tam_bloque = min(tam_bloque, n_filas)
+
+    escritor = EscritorColumnar(carpeta, modelo['columnas'], n_filas, dtype=dtype)
+    minimos = np.full(p, np.inf)
+
+    n_bloques = (n_filas + tam_bloque - 1) // tam_bloque
+    bloques = _bloques_reproducibles(modelo, n_filas, tam_bloque, semilla, escritor.dtype)
+    for b, bloque_t in enumerate(bloques):
+        # El mínimo se toma sobre los valores ya convertidos al tipo de salida:
+        # restar ese mínimo exacto a cada valor guardado nunca da negativos
+        np.minimum(minimos, bloque_t.min(axis=1), out=minimos)
+        escritor.escribir_columnas(bloque_t)
+        print(f"  Bloque {b + 1}/{n_bloques} generado ({bloque_t.shape[1]} filas)")
+
+    # Desplazamiento por mínimo en streaming: el mínimo global se conoce al
+    # final, así que se aplica en una segunda pasada sobre cada columna mapeada
+    desplazamientos = {}
+    if positivos:
+        for j, col in enumerate(modelo['columnas']):
+            if minimos[j] < 0:
+                desplazamientos[col] = float(-minimos[j])
+                mapa = escritor.mapas[col]
+                for inicio in range(0, n_filas, tam_bloque):
+                    mapa[inicio:inicio + tam_bloque] -= mapa.dtype.type(minimos[j])
+
+    ruta_esquema = escritor.cerrar(metadatos={
+        'origen': 'generador_sintetico',
+        'semilla': semilla,
+        'tam_bloque': tam_bloque,
+        'filas_por_semilla': FILAS_POR_SEMILLA,
+        'desplazamientos': desplazamientos
+    })
+    print(f"Datos sintéticos guardados en: {carpeta} ({n_filas} filas, {p} columnas)")
+    return ruta_esquema
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("GENERADOR SINTÉTICO VECTORIZADO POR BLOQUES")
+    print("=" * 70)
+
+    # CONFIGURACIÓN
+    N_FILAS = 1_000_000
+    N_VARIABLES = None          # None = modelo de main.py; entero = modelo aleatorio
+    CARPETA_SALIDA = os.path.join('data', 'sintetico')
+
+    if N_VARIABLES is None:
+        modelo = modelo_main()
+    else:
+        modelo = modelo_aleatorio(N_VARIABLES)
+
+    print(f"Variables: {len(modelo['columnas'])}, "
+          f"profundidad del DAG: {modelo['niveles'].max()}, "
+          f"aristas: {modelo['coeficientes'].nnz}")
+
+    generar_columnar(modelo, N_FILAS, CARPETA_SALIDA)
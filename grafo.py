@@ -3,7 +3,13 @@ import pandas as pd
 import networkx as nx
 import matplotlib.pyplot as plt
 import os
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Union
+from matriz_compacta import MatrizCompacta, cargar_matriz_compacta, listar_matrices_compactas, desplazamiento_fila
+from correlacion_dispersa import CorrelacionDispersa, cargar_correlacion_dispersa, listar_correlaciones_dispersas, peso_arista
+from grafo_csr import GrafoCSR
+from metricas_dispersas import metricas_dispersas
+from render import TrabajoRender, renderizar
+from cache_layout import posiciones
 
 def cargar_matrices_npz(carpeta: str = "resultado_correlacion") -> Dict[str, pd.DataFrame]:
     """
@@ -15,7 +21,8 @@ def cargar_matrices_npz(carpeta: str = "resultado_correlacion") -> Dict[str, pd.
         print(f"Error: La carpeta '{carpeta}' no existe")
         return matrices
     
-    archivos_npz = [f for f in os.listdir(carpeta) if f.endswith('.npz')]
+    # Los .coo.npz son correlaciones dispersas (ver cargar_matrices)
+    archivos_npz = [f for f in os.listdir(carpeta) if f.endswith('.npz') and not f.endswith('.coo.npz')]
     
     if not archivos_npz:
         print(f"No se encontraron archivos .npz en '{carpeta}'")
@@ -50,10 +57,102 @@ def cargar_matrices_npz(carpeta: str = "resultado_correlacion") -> Dict[str, pd.
     
     return matrices
 
-def matriz_a_grafo(matriz: pd.DataFrame, umbral: float = 0.7, 
-                   grafo_dirigido: bool = False) -> nx.Graph:
+def cargar_matrices(carpeta: str = "resultado_correlacion",
+                    nombres: List[str] = None
+                    ) -> Dict[str, Union[MatrizCompacta, CorrelacionDispersa, pd.DataFrame]]:
     """
-    Convierte una matriz de distancia en un grafo
+    Abre las matrices de una carpeta sin leerlas: las compactas (.tri.npy)
+    quedan mapeadas en memoria y solo se leen las filas que se consulten.
+    Las correlaciones dispersas (.coo.npz, ver correlacion_dispersa.py) se
+    cargan tal cual. Las matrices que solo existen en el formato anterior
+    (.npz) se cargan completas como DataFrame.
+    """
+    matrices = {}
+    compactas = listar_matrices_compactas(carpeta)
+    for nombre in compactas:
+        if nombres and nombre not in nombres:
+            continue
+        try:
+            matrices[nombre] = cargar_matriz_compacta(nombre, carpeta)
+            print(f"  Mapeada: {nombre} - {matrices[nombre].shape}")
+        except Exception as e:
+            print(f"  Error abriendo {nombre}: {e}")
+
+    for nombre in listar_correlaciones_dispersas(carpeta):
+        if nombre in matrices or (nombres and nombre not in nombres):
+            continue
+        try:
+            matrices[nombre] = cargar_correlacion_dispersa(nombre, carpeta)
+            print(f"  Dispersa: {nombre} - {matrices[nombre].nnz} pares")
+        except Exception as e:
+            print(f"  Error cargando {nombre}: {e}")
+
+    if os.path.exists(carpeta) and any(
+            f.endswith('.npz') and not f.endswith('.coo.npz') and f[:-4] not in matrices
+            for f in os.listdir(carpeta)):
+        for nombre, matriz in cargar_matrices_npz(carpeta).items():
+            if nombre not in matrices and (not nombres or nombre in nombres):
+                matrices[nombre] = matriz
+    return matrices
+
+def descripcion_matriz(matriz: Union[pd.DataFrame, MatrizCompacta, CorrelacionDispersa]) -> Dict:
+    """
+    Metadatos guardados junto a la matriz (.tri.json / .coo.json): dataset,
+    medida y metodo con que se calculó. Vacío en el formato .npz anterior.
+    """
+    return dict(getattr(matriz, 'descripcion', None) or {})
+
+def aristas_matriz(matriz: Union[pd.DataFrame, MatrizCompacta, CorrelacionDispersa],
+                   umbral: float = 0.7,
+                   tam_trozo: int = 1 << 24) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Aristas con peso (1 - distancia) >= umbral como arreglos, sin recorrer
+    los pares en Python: (u, v, peso, distancia) con u < v índices de las
+    columnas de la matriz.
+
+    - DataFrame: triángulo superior con np.triu_indices y una máscara
+    - MatrizCompacta: el triángulo empaquetado se filtra por trozos de
+      tam_trozo valores, sin cargar el archivo completo
+    - CorrelacionDispersa: sus pares retenidos
+    """
+    if isinstance(matriz, CorrelacionDispersa):
+        u, v, r = matriz.tripletas(umbral)
+        peso = peso_arista(np.asarray(r, dtype=np.float64), matriz.metodo)
+        return u.astype(np.int64), v.astype(np.int64), peso, 1.0 - peso
+
+    if isinstance(matriz, MatrizCompacta):
+        n = matriz.n
+        inicios_fila = desplazamiento_fila(np.arange(n), n)
+        posiciones, distancias = [], []
+        for inicio in range(0, len(matriz.triangulo), tam_trozo):
+            trozo = np.asarray(matriz.triangulo[inicio:inicio + tam_trozo], dtype=np.float64)
+            seleccion = np.flatnonzero(1.0 - trozo >= umbral)
+            posiciones.append(seleccion + inicio)
+            distancias.append(trozo[seleccion])
+        posiciones = np.concatenate(posiciones) if posiciones else np.empty(0, dtype=np.int64)
+        distancia = np.concatenate(distancias) if distancias else np.empty(0)
+        # Posición en el triángulo empaquetado -> (fila, columna); sin diagonal
+        u = np.searchsorted(inicios_fila, posiciones, side='right') - 1
+        v = u + (posiciones - inicios_fila[u])
+        fuera_diagonal = u < v
+        u, v, distancia = u[fuera_diagonal], v[fuera_diagonal], distancia[fuera_diagonal]
+        return u, v, 1.0 - distancia, distancia
+
+    valores = matriz.to_numpy(dtype=np.float64)
+    u, v = np.triu_indices(valores.shape[0], k=1)
+    distancia = valores[u, v]
+    # Solo crear arista si supera el umbral de correlación
+    mascara = 1.0 - distancia >= umbral
+    u, v, distancia = u[mascara], v[mascara], distancia[mascara]
+    return u, v, 1.0 - distancia, distancia
+
+def matriz_a_grafo(matriz: Union[pd.DataFrame, MatrizCompacta, CorrelacionDispersa],
+                   umbral: float = 0.7, grafo_dirigido: bool = False) -> nx.Graph:
+    """
+    Convierte una matriz de distancia en un grafo.
+    Acepta un DataFrame, una MatrizCompacta (mapeada, se filtra por trozos)
+    o una CorrelacionDispersa (solo las aristas retenidas). Las aristas se
+    calculan como arreglos (ver aristas_matriz) y se agregan de una vez.
     """
     if grafo_dirigido:
         G = nx.DiGraph()
@@ -64,24 +163,178 @@ def matriz_a_grafo(matriz: pd.DataFrame, umbral: float = 0.7,
     nodos = matriz.columns.tolist()
     G.add_nodes_from(nodos)
     
-    # Añadir aristas basadas en la matriz de distancia
-    for i, nodo_i in enumerate(nodos):
-        for j, nodo_j in enumerate(nodos):
-            if i < j:  # Evitar duplicados en grafos no dirigidos
-                distancia = matriz.iloc[i, j]
-                # Convertir distancia a peso (inverso)
-                peso = 1.0 - distancia
-                
-                # Solo crear arista si supera el umbral de correlación
-                if peso >= umbral:
-                    G.add_edge(nodo_i, nodo_j, weight=peso, distance=distancia)
+    u, v, peso, distancia = aristas_matriz(matriz, umbral)
+    G.add_edges_from(
+        (nodos[a], nodos[b], {'weight': w, 'distance': d})
+        for a, b, w, d in zip(u.tolist(), v.tolist(), peso.tolist(), distancia.tolist())
+    )
+    
+    return G
+
+def matriz_a_grafo_csr(matriz: Union[pd.DataFrame, MatrizCompacta, CorrelacionDispersa],
+                       umbral: float = 0.7) -> GrafoCSR:
+    """
+    Como matriz_a_grafo, pero el grafo queda en arreglos CSR (ver
+    grafo_csr.py) sin pasar por networkx.
+    """
+    u, v, peso, distancia = aristas_matriz(matriz, umbral)
+    return GrafoCSR.desde_aristas(matriz.columns.tolist(), u, v, peso, distancia)
+
+def exportar_grafos_csr(grafos: Dict[str, GrafoCSR], carpeta: str = "grafos"):
+    """
+    Guarda los grafos como arreglos CSR (grafo_<nombre>.csr.npz), que
+    mst_kruskal.py carga sin reparsear el GML
+    """
+    if not os.path.exists(carpeta):
+        os.makedirs(carpeta)
+    
+    for nombre, G in grafos.items():
+        ruta = G.guardar(os.path.join(carpeta, f"grafo_{nombre}"))
+        print(f"Grafo exportado (CSR): {ruta}")
+
+def barrido_umbral(matriz: Union[pd.DataFrame, MatrizCompacta, CorrelacionDispersa, GrafoCSR],
+                   umbrales: List[float]) -> pd.DataFrame:
+    """
+    Curva de percolación del grafo en función del umbral de correlación,
+    sin reconstruir un grafo por umbral.
+
+    Las aristas candidatas (peso >= el menor umbral) se ordenan por peso una
+    sola vez y se agregan de mayor a menor a una unión-búsqueda; al llegar a
+    cada umbral se anota el estado. Costo total O(E log E) para cualquier
+    número de umbrales.
+
+    Retorna:
+    - DataFrame con una fila por umbral (de mayor a menor): aristas,
+      densidad, grado promedio, componentes, tamaño de la componente mayor y
+      nodos aislados
+    """
+    umbrales = sorted(set(float(u) for u in umbrales), reverse=True)
+    # Sin umbrales no hay aristas candidatas y la curva queda vacía
+    umbral_minimo = min(umbrales, default=np.inf)
+    if isinstance(matriz, GrafoCSR):
+        n = matriz.n_nodos
+        u, v, peso, _ = matriz.aristas()
+        candidatas = peso >= umbral_minimo
+        u, v, peso = u[candidatas], v[candidatas], peso[candidatas]
+    else:
+        n = len(matriz.columns)
+        u, v, peso, _ = aristas_matriz(matriz, umbral_minimo)
+
+    orden = np.argsort(-np.asarray(peso, dtype=np.float64), kind='stable')
+    u, v, peso = np.asarray(u)[orden].tolist(), np.asarray(v)[orden].tolist(), np.asarray(peso)[orden]
+    # Aristas con peso >= umbral: prefijo de la lista ordenada
+    cortes = np.searchsorted(-peso, -np.asarray(umbrales), side='right')
+
+    padre = list(range(n))
+    tamano = [1] * n
+    grado = [0] * n
+    componentes, componente_mayor, aislados = n, (1 if n else 0), n
+
+    def raiz(x):
+        while padre[x] != x:
+            padre[x] = padre[padre[x]]
+            x = padre[x]
+        return x
+
+    curva = {columna: [] for columna in ('umbral', 'n_aristas', 'densidad', 'grado_promedio',
+                                         'n_componentes', 'tamano_componente_max',
+                                         'nodos_aislados')}
+    agregadas = 0
+    for umbral, corte in zip(umbrales, cortes.tolist()):
+        for a, b in zip(u[agregadas:corte], v[agregadas:corte]):
+            for extremo in (a, b):
+                if grado[extremo] == 0:
+                    aislados -= 1
+                grado[extremo] += 1
+            ra, rb = raiz(a), raiz(b)
+            if ra != rb:
+                if tamano[ra] < tamano[rb]:
+                    ra, rb = rb, ra
+                padre[rb] = ra
+                tamano[ra] += tamano[rb]
+                componentes -= 1
+                componente_mayor = max(componente_mayor, tamano[ra])
+        agregadas = corte
+
+        curva['umbral'].append(umbral)
+        curva['n_aristas'].append(agregadas)
+        curva['densidad'].append(2 * agregadas / (n * (n - 1)) if n > 1 else 0.0)
+        curva['grado_promedio'].append(2 * agregadas / n if n else 0.0)
+        curva['n_componentes'].append(componentes)
+        curva['tamano_componente_max'].append(componente_mayor)
+        curva['nodos_aislados'].append(aislados)
+    return pd.DataFrame(curva)
+
+def visualizar_barrido(curva: pd.DataFrame, nombre: str, carpeta_salida: str = "grafos",
+                       mostrar: bool = True, dpi: int = 300, formato: str = 'png') -> str:
+    """
+    Grafica la curva de barrido_umbral (aristas, componentes, componente
+    mayor y nodos aislados contra el umbral) y guarda la imagen
+    """
+    if not os.path.exists(carpeta_salida):
+        os.makedirs(carpeta_salida)
+    
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+    
+    ax1.plot(curva['umbral'], curva['n_aristas'], marker='o', color='gray')
+    ax1.set_xlabel('Umbral de correlación')
+    ax1.set_ylabel('Aristas')
+    ax1.set_title('Aristas por umbral')
+    ax1.invert_xaxis()
+    ax1.grid(alpha=0.3)
+    
+    ax2.plot(curva['umbral'], curva['n_componentes'], marker='o', label='Componentes')
+    ax2.plot(curva['umbral'], curva['tamano_componente_max'], marker='s', label='Componente mayor')
+    ax2.plot(curva['umbral'], curva['nodos_aislados'], marker='^', label='Nodos aislados')
+    ax2.set_xlabel('Umbral de correlación')
+    ax2.set_ylabel('Nodos')
+    ax2.set_title('Conectividad por umbral')
+    ax2.invert_xaxis()
+    ax2.grid(alpha=0.3)
+    ax2.legend()
+    
+    fig.suptitle(f"Barrido de umbral: {nombre}")
+    plt.tight_layout()
+    
+    ruta_imagen = os.path.join(carpeta_salida, f"barrido_{nombre}.{formato}")
+    plt.savefig(ruta_imagen, dpi=dpi, bbox_inches='tight')
+    if mostrar:
+        plt.show()
+    else:
+        plt.close()
     
+    print(f"Imagen guardada: {ruta_imagen}")
+    return ruta_imagen
+
+def agregar_significancia(G: nx.Graph, significancia: pd.DataFrame) -> nx.Graph:
+    """
+    Agrega a cada arista del grafo las columnas de significancia de su par
+    (p_valor o ic_inferior/ic_superior y 'significativa'), calculadas con
+    significancia.significancia_correlacion.
+    """
+    atributos = [c for c in significancia.columns if c not in ('origen', 'destino', 'r')]
+    for fila in significancia.itertuples(index=False):
+        if G.has_edge(fila.origen, fila.destino):
+            G.edges[fila.origen, fila.destino].update(
+                {c: (bool(v) if c == 'significativa' else float(v))
+                 for c, v in zip(atributos, (getattr(fila, c) for c in atributos))})
     return G
 
-def analizar_grafo(G: nx.Graph, nombre: str) -> Dict:
+def analizar_grafo(G: Union[nx.Graph, GrafoCSR], nombre: str, backend: str = 'networkx',
+                   **opciones) -> Dict:
     """
     Analiza las propiedades del grafo
+
+    backend: 'networkx' o 'disperso' (matrices dispersas, con clustering,
+    k-núcleo y centralidades muestreadas; ver metricas_dispersas.py, que
+    recibe las opciones, ej. n_pivotes=256). Un GrafoCSR siempre usa
+    'disperso'.
     """
+    if backend == 'disperso' or isinstance(G, GrafoCSR):
+        return metricas_dispersas(G, nombre, **opciones)
+    if backend != 'networkx':
+        raise ValueError("backend debe ser 'networkx' o 'disperso'")
+    
     print(f"\n{'='*50}")
     print(f"ANALISIS DEL GRAFO: {nombre}")
     print(f"{'='*50}")
@@ -127,17 +380,25 @@ def analizar_grafo(G: nx.Graph, nombre: str) -> Dict:
     
     return metricas
 
-def visualizar_grafo(G: nx.Graph, nombre: str, carpeta_salida: str = "grafos"):
+def visualizar_grafo(G: Union[nx.Graph, GrafoCSR], nombre: str, carpeta_salida: str = "grafos",
+                     pos: Dict = None, mostrar: bool = True, dpi: int = 300, formato: str = 'png') -> str:
     """
     Visualiza el grafo y guarda la imagen
+
+    G: grafo de networkx o GrafoCSR (se convierte aquí, en el proceso de render)
+    pos: posiciones de los nodos ya calculadas (None = spring_layout en caché, cache_layout.py);
+    mostrar=False guarda la imagen sin abrir una ventana (ver render.py)
     """
+    if isinstance(G, GrafoCSR):
+        G = G.a_networkx()
     if not os.path.exists(carpeta_salida):
         os.makedirs(carpeta_salida)
     
     plt.figure(figsize=(12, 8))
     
     # Diseño del grafo - ajustar parámetros para mejor visualización
-    pos = nx.spring_layout(G, k=2, iterations=100)
+    if pos is None:
+        pos = posiciones(G, k=2, iterations=100)
     
     # Obtener pesos para el grosor de las aristas
     if G.number_of_edges() > 0:
@@ -164,11 +425,15 @@ def visualizar_grafo(G: nx.Graph, nombre: str, carpeta_salida: str = "grafos"):
     plt.tight_layout()
     
     # Guardar imagen
-    ruta_imagen = os.path.join(carpeta_salida, f"grafo_{nombre}.png")
-    plt.savefig(ruta_imagen, dpi=300, bbox_inches='tight')
-    plt.show()
+    ruta_imagen = os.path.join(carpeta_salida, f"grafo_{nombre}.{formato}")
+    plt.savefig(ruta_imagen, dpi=dpi, bbox_inches='tight')
+    if mostrar:
+        plt.show()
+    else:
+        plt.close()
     
     print(f"Imagen guardada: {ruta_imagen}")
+    return ruta_imagen
 
 def exportar_grafos_gml(grafos: Dict[str, nx.Graph], carpeta: str = "grafos"):
     """
@@ -203,7 +468,7 @@ def exportar_metricas_gml(grafos: Dict[str, nx.Graph], todas_metricas: List[Dict
         nx.write_gml(G, ruta_gml)
         print(f"Grafo con métricas exportado (GML): {ruta_gml}")
 
-def comparar_grafos(grafos: Dict[str, nx.Graph]):
+def comparar_grafos(grafos: Dict[str, Union[nx.Graph, GrafoCSR]]):
     """
     Compara múltiples grafos y genera reporte
     """
@@ -214,16 +479,18 @@ def comparar_grafos(grafos: Dict[str, nx.Graph]):
     comparacion = []
     
     for nombre, G in grafos.items():
-        if G.number_of_nodes() > 0:
-            grado_promedio = np.mean([d for n, d in G.degree()])
+        if isinstance(G, GrafoCSR):
+            n_nodos, n_aristas = G.n_nodos, G.n_aristas
+            densidad = 2 * n_aristas / (n_nodos * (n_nodos - 1)) if n_nodos > 1 else 0
         else:
-            grado_promedio = 0
+            n_nodos, n_aristas, densidad = G.number_of_nodes(), G.number_of_edges(), nx.density(G)
+        grado_promedio = 2 * n_aristas / n_nodos if n_nodos > 0 else 0
             
         metricas = {
             'Grafo': nombre,
-            'Nodos': G.number_of_nodes(),
-            'Aristas': G.number_of_edges(),
-            'Densidad': f"{nx.density(G):.4f}",
+            'Nodos': n_nodos,
+            'Aristas': n_aristas,
+            'Densidad': f"{densidad:.4f}",
             'Grado Promedio': f"{grado_promedio:.2f}"
         }
         comparacion.append(metricas)
@@ -242,9 +509,17 @@ def main():
     # CONFIGURACION - MODIFICA AQUI
     UMBRAL_CORRELACION = 0.7 # Solo conexiones con correlación >= 0.7
     GRAFOS_A_CREAR = []  # Lista vacía = procesar todas las matrices
-    
-    # Cargar matrices
-    matrices = cargar_matrices_npz()
+    SIGNIFICANCIA = None  # None, 'permutacion' (p-valor) o 'bootstrap' (intervalo) por arista
+    N_REMUESTREOS = 1000
+    EXPORTAR_CSR = True  # Guardar también grafo_<nombre>.csr.npz (lo lee mst_kruskal.py)
+    N_PIVOTES = 256  # Pivotes de las centralidades (exactas si el grafo tiene menos nodos)
+    UMBRALES_BARRIDO = []  # Ej. [0.95, 0.9, ..., 0.3]: solo curva por umbral, sin construir grafos
+    MOSTRAR_FIGURAS = False  # True = abrir cada figura (bloquea); False = render en paralelo sin ventanas
+    NIVEL_RENDER = 'publicacion'  # 'borrador', 'normal', 'publicacion' o 'vectorial' (ver render.py)
+    N_PROCESOS_RENDER = None  # None = todos los núcleos
+    
+    # Cargar matrices (compactas mapeadas; .npz del formato anterior si no hay otra)
+    matrices = cargar_matrices()
     
     if not matrices:
         print("No hay matrices para procesar")
@@ -253,8 +528,40 @@ def main():
     
     print(f"\nMatrices cargadas: {list(matrices.keys())}")
     
-    # Crear grafos
-    grafos = {} 
+    # Figuras pendientes (se generan juntas al final si no se muestran)
+    trabajos_render = []
+    
+    # Modo barrido: una curva por matriz para elegir UMBRAL_CORRELACION
+    if UMBRALES_BARRIDO:
+        for nombre_matriz, matriz in matrices.items():
+            if GRAFOS_A_CREAR and nombre_matriz not in GRAFOS_A_CREAR:
+                continue
+            print(f"\nBarrido de umbral: {nombre_matriz}")
+            curva = barrido_umbral(matriz, UMBRALES_BARRIDO)
+            print(curva.round(4).to_string(index=False))
+            
+            if not os.path.exists("grafos"):
+                os.makedirs("grafos")
+            ruta_csv = os.path.join("grafos", f"barrido_{nombre_matriz}.csv")
+            curva.to_csv(ruta_csv, index=False)
+            print(f"Curva guardada: {ruta_csv}")
+            if MOSTRAR_FIGURAS:
+                visualizar_barrido(curva, nombre_matriz)
+            else:
+                trabajos_render.append(TrabajoRender(visualizar_barrido, (curva, nombre_matriz)))
+        if trabajos_render:
+            renderizar(trabajos_render, nivel=NIVEL_RENDER, n_procesos=N_PROCESOS_RENDER)
+        return
+    
+    # Datos originales para la significancia de las aristas
+    if SIGNIFICANCIA:
+        from correlacion import cargar_datasets_directo
+        from significancia import significancia_correlacion, MEDIDAS_SIGNIFICANCIA
+        dataframes = cargar_datasets_directo()
+    
+    # Crear grafos (en arreglos CSR; networkx solo para figuras y GML)
+    grafos = {}
+    significancias = {}
     todas_metricas = []
     
     for nombre_matriz, matriz in matrices.items():
@@ -265,25 +572,58 @@ def main():
         print(f"\nCreando grafo para: {nombre_matriz}")
         
         # Crear grafo
-        G = matriz_a_grafo(matriz, umbral=UMBRAL_CORRELACION, grafo_dirigido=False)
+        G = matriz_a_grafo_csr(matriz, umbral=UMBRAL_CORRELACION)
+        
+        # Significancia por remuestreo solo de las aristas retenidas; el
+        # dataset, la medida y el método salen de los metadatos de la matriz
+        descripcion = descripcion_matriz(matriz)
+        nombre_dataset = descripcion.get('dataset')
+        medida = descripcion.get('medida')
+        if SIGNIFICANCIA and G.n_aristas > 0:
+            if nombre_dataset not in dataframes or medida not in MEDIDAS_SIGNIFICANCIA \
+                    or 'metodo' not in descripcion:
+                print(f"  Significancia omitida: la matriz no indica un dataset disponible y una "
+                      f"medida soportada {MEDIDAS_SIGNIFICANCIA} (dataset={nombre_dataset}, "
+                      f"medida={medida})")
+            else:
+                u, v, _, _ = G.aristas()
+                significancia = significancia_correlacion(
+                    dataframes[nombre_dataset], n_remuestreos=N_REMUESTREOS, tipo=SIGNIFICANCIA,
+                    pares=list(zip(G.etiquetas[u].tolist(), G.etiquetas[v].tolist())),
+                    metodo=descripcion['metodo'], medida=medida)
+                significancias[nombre_matriz] = significancia
+                print(f"  Aristas significativas ({SIGNIFICANCIA}, {medida}): "
+                      f"{significancia['significativa'].sum()} de {len(significancia)}")
         
         # Analizar grafo
-        metricas = analizar_grafo(G, nombre_matriz)
+        metricas = analizar_grafo(G, nombre_matriz, n_pivotes=N_PIVOTES)
         grafos[nombre_matriz] = G
         todas_metricas.append(metricas)
         
         # Visualizar grafo
-        visualizar_grafo(G, nombre_matriz)
+        if MOSTRAR_FIGURAS:
+            visualizar_grafo(G, nombre_matriz)
+        else:
+            trabajos_render.append(TrabajoRender(visualizar_grafo, (G, nombre_matriz)))
+    
+    # Generar las figuras en paralelo (sin ventanas; se omiten las que no cambiaron)
+    if trabajos_render:
+        renderizar(trabajos_render, nivel=NIVEL_RENDER, n_procesos=N_PROCESOS_RENDER)
     
-    # Guardar grafos en formato GML
+    # Guardar grafos en formato GML (uno a la vez en networkx)
     if grafos:
         carpeta_grafos = "grafos"
         
-        # Exportar grafos básicos
-        exportar_grafos_gml(grafos, carpeta_grafos)
-        
-        # Exportar grafos con métricas incluidas
-        exportar_metricas_gml(grafos, todas_metricas, carpeta_grafos)
+        for nombre_matriz, G in grafos.items():
+            G_nx = G.a_networkx()
+            if nombre_matriz in significancias:
+                agregar_significancia(G_nx, significancias[nombre_matriz])
+            
+            # Exportar grafo básico y con métricas incluidas
+            exportar_grafos_gml({nombre_matriz: G_nx}, carpeta_grafos)
+            exportar_metricas_gml({nombre_matriz: G_nx}, todas_metricas, carpeta_grafos)
+        if EXPORTAR_CSR:
+            exportar_grafos_csr(grafos, carpeta_grafos)
         
         print(f"\nTodos los grafos han sido exportados en formato GML en la carpeta '{carpeta_grafos}'")
     
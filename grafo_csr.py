@@ -0,0 +1,297 @@
+# grafo_csr.py
+import numpy as np
+import networkx as nx
+import scipy.sparse as sp
+from scipy.sparse import csgraph
+import json
+import os
+
+# Extensión de un grafo CSR guardado
+EXTENSION_CSR = '.csr.npz'
+
+# Filas de distancias (hojas x nodos) por bloque en camino_mas_largo
+_FILAS_BLOQUE = 1024
+
+
+class GrafoCSR:
+    """
+    Grafo no dirigido con pesos guardado en arreglos CSR.
+
+    Los nodos son enteros 0..n-1 con sus nombres en 'etiquetas'. Cada arista
+    aparece en las dos filas de sus extremos: los vecinos del nodo i son
+    indices[indptr[i]:indptr[i+1]], con sus 'weight' y 'distance' en las
+    mismas posiciones. Una arista ocupa 40 bytes, frente a cientos en los
+    diccionarios anidados de networkx.
+    """
+
+    __slots__ = ('etiquetas', 'indptr', 'indices', 'weight', 'distance', '_posicion')
+
+    def __init__(self, etiquetas, indptr, indices, weight, distance):
+        self.etiquetas = np.asarray(etiquetas, dtype=object)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.weight = np.asarray(weight, dtype=np.float64)
+        self.distance = np.asarray(distance, dtype=np.float64)
+        self._posicion = None
+
+    # -----------------------------------------------------------------------
+    # Construcción
+    # -----------------------------------------------------------------------
+
+    @classmethod
+    def desde_aristas(cls, etiquetas, u, v, weight, distance=None):
+        """
+        Construye el grafo a partir de arreglos de aristas (u, v, peso,
+        distancia) con índices de nodo, como los de grafo.aristas_matriz.
+        Sin distancia se usa 1 - peso.
+        """
+        n = len(etiquetas)
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        weight = np.asarray(weight, dtype=np.float64)
+        distance = 1.0 - weight if distance is None else np.asarray(distance, dtype=np.float64)
+
+        # Cada arista en las dos direcciones, ordenada por (origen, destino)
+        origen = np.concatenate([u, v])
+        destino = np.concatenate([v, u])
+        orden = np.lexsort((destino, origen))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origen, minlength=n), out=indptr[1:])
+        return cls(etiquetas, indptr, destino[orden],
+                   np.concatenate([weight, weight])[orden],
+                   np.concatenate([distance, distance])[orden])
+
+    @classmethod
+    def desde_networkx(cls, G):
+        """Convierte un grafo de networkx (atributos 'weight' y 'distance')"""
+        etiquetas = list(G.nodes())
+        posicion = {nodo: i for i, nodo in enumerate(etiquetas)}
+        aristas = list(G.edges(data=True))
+        u = np.fromiter((posicion[a] for a, b, d in aristas), dtype=np.int64, count=len(aristas))
+        v = np.fromiter((posicion[b] for a, b, d in aristas), dtype=np.int64, count=len(aristas))
+        weight = np.fromiter((d.get('weight', 1.0) for a, b, d in aristas), dtype=np.float64,
+                             count=len(aristas))
+        distance = np.fromiter((d.get('distance', 0) for a, b, d in aristas), dtype=np.float64,
+                               count=len(aristas))
+        return cls.desde_aristas(etiquetas, np.minimum(u, v), np.maximum(u, v), weight, distance)
+
+    def a_networkx(self, incluir_aislados=True):
+        """Grafo de networkx equivalente (para exportar a GML o visualizar)"""
+        G = nx.Graph()
+        if incluir_aislados:
+            G.add_nodes_from(self.etiquetas.tolist())
+        u, v, weight, distance = self.aristas()
+        etiquetas = self.etiquetas
+        G.add_edges_from(
+            (etiquetas[a], etiquetas[b], {'weight': w, 'distance': d})
+            for a, b, w, d in zip(u.tolist(), v.tolist(), weight.tolist(), distance.tolist())
+        )
+        return G
+
+    # -----------------------------------------------------------------------
+    # Consultas
+    # -----------------------------------------------------------------------
+
+    @property
+    def n_nodos(self):
+        return len(self.etiquetas)
+
+    @property
+    def n_aristas(self):
+        return len(self.indices) // 2
+
+    def __len__(self):
+        return self.n_nodos
+
+    def __repr__(self):
+        return f"GrafoCSR({self.n_nodos} nodos, {self.n_aristas} aristas)"
+
+    def indice(self, nodo):
+        """Índice entero de un nodo por su etiqueta"""
+        if self._posicion is None:
+            self._posicion = {etiqueta: i for i, etiqueta in enumerate(self.etiquetas.tolist())}
+        return self._posicion[nodo]
+
+    def vecinos(self, i):
+        """Índices de los vecinos del nodo i"""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def grado(self):
+        """Grado de cada nodo"""
+        return np.diff(self.indptr)
+
+    def aristas(self):
+        """Arreglos (u, v, weight, distance) de cada arista una vez, con u < v"""
+        origen = np.repeat(np.arange(self.n_nodos, dtype=np.int64), self.grado())
+        superior = origen < self.indices
+        return (origen[superior], self.indices[superior].astype(np.int64),
+                self.weight[superior], self.distance[superior])
+
+    def matriz_dispersa(self, atributo='weight'):
+        """Matriz de adyacencia scipy.sparse con el atributo pedido como valor"""
+        datos = self.weight if atributo == 'weight' else self.distance
+        return sp.csr_matrix((datos, self.indices, self.indptr), shape=(self.n_nodos, self.n_nodos))
+
+    def _estructura(self):
+        """Adyacencia con valor 1 (los algoritmos de csgraph ignoran los ceros)"""
+        return sp.csr_matrix((np.ones(len(self.indices), dtype=np.int8), self.indices, self.indptr),
+                             shape=(self.n_nodos, self.n_nodos))
+
+    # -----------------------------------------------------------------------
+    # Algoritmos
+    # -----------------------------------------------------------------------
+
+    def componentes(self):
+        """
+        Componentes conexas: (número de componentes, componente de cada nodo)
+        """
+        return csgraph.connected_components(self._estructura(), directed=False)
+
+    def subgrafo(self, nodos):
+        """Subgrafo inducido por los índices de nodo dados (en ese orden)"""
+        nodos = np.asarray(nodos, dtype=np.int64)
+        nuevo = np.full(self.n_nodos, -1, dtype=np.int64)
+        nuevo[nodos] = np.arange(len(nodos))
+        u, v, weight, distance = self.aristas()
+        dentro = (nuevo[u] >= 0) & (nuevo[v] >= 0)
+        a, b = nuevo[u[dentro]], nuevo[v[dentro]]
+        return GrafoCSR.desde_aristas(self.etiquetas[nodos], np.minimum(a, b), np.maximum(a, b),
+                                      weight[dentro], distance[dentro])
+
+    def sin_aristas(self, pares):
+        """Copia del grafo sin las aristas dadas como pares de índices"""
+        u, v, weight, distance = self.aristas()
+        pares = np.asarray(pares, dtype=np.int64).reshape(-1, 2)
+        quitar = set(zip(np.minimum(pares[:, 0], pares[:, 1]).tolist(),
+                         np.maximum(pares[:, 0], pares[:, 1]).tolist()))
+        conservar = np.array([(a, b) not in quitar for a, b in zip(u.tolist(), v.tolist())],
+                             dtype=bool)
+        return GrafoCSR.desde_aristas(self.etiquetas, u[conservar], v[conservar],
+                                      weight[conservar], distance[conservar])
+
+    def arbol_expansion_minimo(self, atributo='weight'):
+        """
+        Bosque de expansión mínima por Kruskal con unión-búsqueda, minimizando
+        el atributo como nx.minimum_spanning_tree(G, weight=...). Los nodos
+        aislados se conservan. Los empates se resuelven por el orden (u, v)
+        de las aristas.
+        """
+        u, v, weight, distance = self.aristas()
+        valores = weight if atributo == 'weight' else distance
+        orden = np.argsort(valores, kind='stable')
+
+        padre = list(range(self.n_nodos))
+
+        def raiz(x):
+            while padre[x] != x:
+                padre[x] = padre[padre[x]]
+                x = padre[x]
+            return x
+
+        elegidas = []
+        faltan = self.n_nodos - 1
+        for k, a, b in zip(orden.tolist(), u[orden].tolist(), v[orden].tolist()):
+            ra, rb = raiz(a), raiz(b)
+            if ra == rb:
+                continue
+            padre[ra] = rb
+            elegidas.append(k)
+            faltan -= 1
+            if faltan == 0:
+                break
+
+        elegidas = np.sort(np.asarray(elegidas, dtype=np.int64))
+        return GrafoCSR.desde_aristas(self.etiquetas, u[elegidas], v[elegidas],
+                                      weight[elegidas], distance[elegidas])
+
+    def bfs(self, origen):
+        """
+        Recorrido en anchura desde el índice origen.
+
+        Retorna:
+        - orden de visita, predecesor de cada nodo (-9999 si no se alcanza) y
+          profundidad de cada nodo (-1 si no se alcanza)
+        """
+        orden, predecesores = csgraph.breadth_first_order(self._estructura(), origen,
+                                                          directed=False, return_predecessors=True)
+        distancias = self.distancias_topologicas(origen)
+        profundidad = np.where(np.isfinite(distancias), distancias, -1).astype(np.int64)
+        return orden, predecesores, profundidad
+
+    def distancias_topologicas(self, origenes):
+        """Número de aristas del camino más corto desde cada origen (inf si no hay camino)"""
+        return csgraph.shortest_path(self._estructura(), directed=False, unweighted=True,
+                                     indices=origenes)
+
+    def camino(self, origen, destino):
+        """Camino más corto (en aristas) entre dos índices; None si no hay"""
+        _, predecesores, _ = self.bfs(origen)
+        if destino != origen and predecesores[destino] < 0:
+            return None
+        camino = [destino]
+        while camino[-1] != origen:
+            camino.append(int(predecesores[camino[-1]]))
+        return camino[::-1]
+
+    def camino_mas_largo(self):
+        """
+        Camino topológico más largo entre dos hojas (grado 1). Entre pares de
+        igual longitud se elige el primero en el orden de las hojas, como la
+        búsqueda par a par de mst_camino_largo.py, pero con un BFS por hoja
+        en lugar de uno por par.
+
+        Retorna:
+        - (camino como lista de índices, longitud en aristas, (hoja_a, hoja_b));
+          (None, 0, None) si no hay dos hojas conectadas
+        """
+        hojas = np.flatnonzero(self.grado() == 1)
+        if len(hojas) < 2:
+            return None, 0, None
+
+        mejor = (-1, None, None)
+        for inicio in range(0, len(hojas), _FILAS_BLOQUE):
+            filas = hojas[inicio:inicio + _FILAS_BLOQUE]
+            distancias = self.distancias_topologicas(filas)[:, hojas]
+            # Solo pares (i, j) con j > i en el orden de las hojas
+            posiciones = np.arange(inicio, inicio + len(filas))
+            distancias[np.arange(len(hojas))[None, :] <= posiciones[:, None]] = -1
+            distancias[~np.isfinite(distancias)] = -1
+            # argmax recorre por filas y se queda con el primer máximo
+            k = int(np.argmax(distancias))
+            i, j = divmod(k, len(hojas))
+            if distancias[i, j] > mejor[0]:
+                mejor = (int(distancias[i, j]), int(filas[i]), int(hojas[j]))
+
+        longitud, a, b = mejor
+        if longitud < 0:
+            return None, 0, None
+        return self.camino(a, b), longitud, (a, b)
+
+    # -----------------------------------------------------------------------
+    # Archivo
+    # -----------------------------------------------------------------------
+
+    def guardar(self, ruta):
+        """Guarda los arreglos en un .csr.npz (etiquetas como JSON)"""
+        if not ruta.endswith(EXTENSION_CSR):
+            ruta = f"{ruta}{EXTENSION_CSR}"
+        np.savez(ruta, indptr=self.indptr, indices=self.indices, weight=self.weight,
+                 distance=self.distance,
+                 etiquetas=np.array(json.dumps([str(e) for e in self.etiquetas.tolist()])))
+        return ruta
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Carga un grafo guardado con guardar()"""
+        if not ruta.endswith(EXTENSION_CSR):
+            ruta = f"{ruta}{EXTENSION_CSR}"
+        with np.load(ruta) as datos:
+            return cls(json.loads(str(datos['etiquetas'])), datos['indptr'], datos['indices'],
+                       datos['weight'], datos['distance'])
+
+
+def listar_grafos_csr(carpeta):
+    """Nombres (sin extensión) de los grafos CSR de una carpeta"""
+    if not os.path.exists(carpeta):
+        return []
+    return sorted(f[:-len(EXTENSION_CSR)] for f in os.listdir(carpeta) if f.endswith(EXTENSION_CSR))
@@ -3,7 +3,9 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from alg import df_quartile
+from alg import (df_quartile, MotorParticiones, PORCENTAJES_PARTICIONES, particionar,
+                 nombres_escalera, nombre_particion, fraccion_particion, validar_escalera)
+from almacen_particiones import guardar_almacen
 
 np.random.seed(42)
 
@@ -11,6 +13,8 @@ np.random.seed(42)
 n_samples = 1000
 dim_x = 39
 x_cols = [f'x_{i+1}' for i in range(dim_x)]
+# Escalera de particiones B/W (fracciones de target_y)
+ESCALERA = PORCENTAJES_PARTICIONES
 
 # --- Generar TODAS las variables como "Raíz" (independientes) ---
 X_data = np.random.normal(loc=0.0, scale=1.0, size=(n_samples, dim_x))
@@ -101,61 +105,46 @@ target_corr_all = df.corr()
 # Ordenamos por valor absoluto para ver las más fuertes (positivas o negativas)
 print(target_corr_all['target_y'].abs().sort_values(ascending=False))
 
-# 2 FUNCIÓN df_quartile 
-df_quartile(df, 'target_y', porc=0.25, quartile="first", ascending=False)
+# 2 FUNCIÓN df_quartile
+# Un solo ordenamiento de target_y compartido por todas las particiones
+motor = MotorParticiones(df, 'target_y')
+df_quartile(df, 'target_y', porc=0.25, quartile="first", ascending=False, motor=motor)
 
 # 3 creando particiones
-B2C = df_quartile(df, 'target_y', porc=0.50, quartile="first", ascending=False)
-W2C = df_quartile(df, 'target_y', porc=0.50, quartile="first", ascending=True)
-B4C = df_quartile(df, 'target_y', porc=0.25, quartile="first", ascending=False)
-W4C = df_quartile(df, 'target_y', porc=0.25, quartile="first", ascending=True)
-B8C = df_quartile(df, 'target_y', porc=0.125, quartile="first", ascending=False)
-W8C = df_quartile(df, 'target_y', porc=0.125, quartile="first", ascending=True)
-B16C = df_quartile(df, 'target_y', porc=0.0625, quartile="first", ascending=False)
-W16C = df_quartile(df, 'target_y', porc=0.0625, quartile="first", ascending=True)
-
-W1C = df_quartile(df, 'target_y', porc=0.0625, quartile="first", ascending=True)
-W1C = df_quartile(df, 'target_y', porc=0.0625, quartile="first", ascending=True)
+# Todas las particiones B/W de la escalera (B2C, W2C, B4C, W4C, ...) con un
+# único ordenamiento; ej. ESCALERA = escalera_potencias(10) llega hasta B1024C/W1024C
+particiones = particionar(df, 'target_y', ESCALERA)
+nombres = nombres_escalera(ESCALERA)
 
 # 4 observando las particiones de los subconjuntos 
 print("\n" + "="*50)
 print("TAMAÑOS DE LAS PARTICIONES:")
 print("="*50)
 print(f"df original: {df.shape}")
-print(f"B2C (50% mayores): {B2C.shape}")
-print(f"W2C (50% menores): {W2C.shape}")
-print(f"B4C (25% mayores): {B4C.shape}")
-print(f"W4C (25% menores): {W4C.shape}")
-print(f"B8C (12.5% mayores): {B8C.shape}")
-print(f"W8C (12.5% menores): {W8C.shape}")
-print(f"B16C (6.25% mayores): {B16C.shape}")
-print(f"W16C (6.25% menores): {W16C.shape}")
+for nombre in nombres:
+    lado = 'mayores' if nombre.startswith('B') else 'menores'
+    print(f"{nombre} ({fraccion_particion(nombre) * 100:g}% {lado}): {particiones[nombre].shape}")
 
 # 5 Visualización
 # Asegurar que cada DataFrame tenga una columna que identifique el grupo al cual pertenece
 df_copy = df.copy()
 df_copy['Label'] = 'df'
-B2C['Label'] = 'B2C'
-W2C['Label'] = 'W2C'
-B4C['Label'] = 'B4C'
-W4C['Label'] = 'W4C'
-B8C['Label'] = 'B8C'
-W8C['Label'] = 'W8C'
-B16C['Label'] = 'B16C'
-W16C['Label'] = 'W16C'
+etiquetadas = [df_copy]
+for nombre in nombres:
+    etiquetadas.append(particiones[nombre].assign(Label=nombre))
 
 # Concatenar todos los DataFrames en un único DataFrame
-dataframes = [df_copy, B2C, W2C, B4C, W4C, B8C, W8C, B16C, W16C]
-all_data = pd.concat(dataframes)
-
-# Definir un diccionario de colores
-colors = {
-    'df': '#6C3483',  # purple
-    'B2C': '#FF5733', 'W2C': '#FF5733',   # red
-    'B4C': '#FFC300', 'W4C': '#FFC300',  # orange
-    'B8C': '#52BE80', 'W8C': '#52BE80',  # green
-    'B16C': '#3498DB', 'W16C': '#3498DB'  # blue
-}
+all_data = pd.concat(etiquetadas)
+
+# Definir un diccionario de colores: B y W de un mismo nivel comparten color
+paleta = ['#FF5733', '#FFC300', '#52BE80', '#3498DB']  # red, orange, green, blue
+escalera = validar_escalera(ESCALERA)
+if len(escalera) > len(paleta):
+    paleta = [plt.cm.viridis(i / max(len(escalera) - 1, 1)) for i in range(len(escalera))]
+colors = {'df': '#6C3483'}  # purple
+for nivel, fraccion in enumerate(escalera):
+    for lado in ('B', 'W'):
+        colors[nombre_particion(lado, fraccion)] = paleta[nivel]
 
 # Configurar el tamaño de la figura
 plt.figure(figsize=(18, 6))
@@ -177,17 +166,9 @@ plt.show()
 print("\n" + "="*50)
 print("ESTADÍSTICAS DE VALORES 'target_y' POR PARTICIÓN:")
 print("="*50)
-partitions = {
-    'Original': df['target_y'],
-    'B2C': B2C['target_y'],
-    'W2C': W2C['target_y'],
-    'B4C': B4C['target_y'],
-    'W4C': W4C['target_y'],
-    'B8C': B8C['target_y'],
-    'W8C': W8C['target_y'],
-    'B16C': B16C['target_y'],
-    'W16C': W16C['target_y']
-}
+partitions = {'Original': df['target_y']}
+for nombre in nombres:
+    partitions[nombre] = particiones[nombre]['target_y']
 
 for name, partition in partitions.items():
     print(f"{name}:")
@@ -198,9 +179,10 @@ for name, partition in partitions.items():
     print()
 
 # 7 Discretización del objetivo
-# Al discretizar generamos 2 grupos (Clasificación)
-B4C_discrete = B4C.copy()
-W4C_discrete = W4C.copy()
+# Al discretizar generamos 2 grupos (Clasificación); usa B4C y W4C, así que
+# la escalera debe incluir 0.25
+B4C_discrete = particiones['B4C'].copy()
+W4C_discrete = particiones['W4C'].copy()
 
 B4C_discrete['target_y'] = 1  # Clase alta (valores mayores)
 W4C_discrete['target_y'] = 0  # Clase baja (valores menores)
@@ -215,18 +197,26 @@ print(f"\nForma del dataset discretizado: {dfabc4c.shape}")
 print(f"Distribucion de clases:")
 print(dfabc4c['target_y'].value_counts().sort_index())
 
-# Guardar los DataFrames originales y particionados en CSV
+# Guardar el DataFrame original en CSV
 df.to_csv('data/df_original.csv', index=False)
-B2C.to_csv('data/B2C.csv', index=False)
-W2C.to_csv('data/W2C.csv', index=False)
-B4C.to_csv('data/B4C.csv', index=False)
-W4C.to_csv('data/W4C.csv', index=False)
-B8C.to_csv('data/B8C.csv', index=False)
-W8C.to_csv('data/W8C.csv', index=False)
-B16C.to_csv('data/B16C.csv', index=False)
-W16C.to_csv('data/W16C.csv', index=False)
+
+# Almacén de particiones: la tabla base una sola vez + rangos de filas por
+# partición (B16C ⊂ B8C ⊂ B4C ⊂ B2C y lo mismo para W).
+# La escalera (ESCALERA, arriba) define qué particiones descubren las etapas siguientes.
+guardar_almacen(df, 'target_y', porcentajes=ESCALERA)
+
+# Copias CSV completas de cada partición (data/B2C.csv, data/W2C.csv, ...),
+# solo si se piden explícitamente: las etapas siguientes leen el almacén
+GUARDAR_CSV_PARTICIONES = False
+if GUARDAR_CSV_PARTICIONES:
+    for nombre in nombres:
+        particiones[nombre].to_csv(f'data/{nombre}.csv', index=False)
 
 # Guardar dataset discretizado
 dfabc4c.to_csv('data/df_discretizado.csv', index=False)
 
-print("Archivos CSV guardados correctamente.")
\ No newline at end of file
+if GUARDAR_CSV_PARTICIONES:
+    print("Archivos CSV guardados correctamente.")
+else:
+    print("Almacén de particiones guardado (sin copias CSV de las particiones; "
+          "df_original.csv y df_discretizado.csv sí se guardaron).")
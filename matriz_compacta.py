@@ -0,0 +1,169 @@
+# matriz_compacta.py
+import numpy as np
+import pandas as pd
+import json
+import os
+
+# Extensiones de los archivos de una matriz compacta
+EXTENSION_TRIANGULO = '.tri.npy'
+EXTENSION_ETIQUETAS = '.tri.json'
+
+
+def desplazamiento_fila(i, n):
+    """Posición de inicio de la fila i en el triángulo superior empaquetado (con diagonal)"""
+    i = np.asarray(i, dtype=np.int64)
+    return i * n - i * (i - 1) // 2
+
+
+def guardar_matriz_compacta(matriz, nombre_archivo, carpeta, dtype='float64', etiquetas=None,
+                            metadatos=None):
+    """
+    Guarda una matriz simétrica como triángulo superior empaquetado (con la
+    diagonal) en un .npy sin comprimir, más un JSON con las etiquetas.
+
+    El archivo se escribe fila a fila sobre un memmap, sin crear una segunda
+    copia de la matriz, y se puede abrir después con np.load(mmap_mode='r').
+
+    Parámetros:
+    - matriz: DataFrame o array 2D simétrico (n x n)
+    - nombre_archivo: nombre sin extensión (ej. 'B2C_directa')
+    - carpeta: carpeta de destino
+    - dtype: 'float64', 'float32' o 'float16'
+    - etiquetas: nombres de filas/columnas (por defecto, las columnas del DataFrame)
+    - metadatos: diccionario adicional que se guarda en el JSON
+
+    Retorna:
+    - ruta del archivo .tri.npy
+    """
+    if not os.path.exists(carpeta):
+        os.makedirs(carpeta)
+
+    if isinstance(matriz, pd.DataFrame):
+        if etiquetas is None:
+            etiquetas = [str(c) for c in matriz.columns]
+        valores = matriz.to_numpy()
+    else:
+        valores = np.asarray(matriz)
+    n = valores.shape[0]
+    if valores.shape != (n, n):
+        raise ValueError(f"La matriz debe ser cuadrada; forma recibida {valores.shape}")
+    if etiquetas is None:
+        etiquetas = [str(i) for i in range(n)]
+    if len(etiquetas) != n:
+        raise ValueError("El número de etiquetas no coincide con el tamaño de la matriz")
+
+    ruta = os.path.join(carpeta, f"{nombre_archivo}{EXTENSION_TRIANGULO}")
+    triangulo = np.lib.format.open_memmap(ruta, mode='w+', dtype=np.dtype(dtype),
+                                          shape=(n * (n + 1) // 2,))
+    for i in range(n):
+        inicio = int(desplazamiento_fila(i, n))
+        triangulo[inicio:inicio + n - i] = valores[i, i:]
+    triangulo.flush()
+    del triangulo
+
+    descripcion = {
+        'n': n,
+        'dtype': np.dtype(dtype).name,
+        'formato': 'triangulo_superior',
+        'etiquetas': list(etiquetas)
+    }
+    if metadatos:
+        descripcion.update(metadatos)
+    with open(os.path.join(carpeta, f"{nombre_archivo}{EXTENSION_ETIQUETAS}"), 'w',
+              encoding='utf-8') as f:
+        json.dump(descripcion, f, ensure_ascii=False)
+
+    return ruta
+
+
+class MatrizCompacta:
+    """
+    Matriz simétrica guardada como triángulo superior y mapeada en memoria.
+
+    Solo se leen del disco las filas o bloques que se consultan; la parte
+    j >= i de cada fila es contigua en el archivo y se entrega como vista.
+    """
+
+    def __init__(self, ruta):
+        if not ruta.endswith(EXTENSION_TRIANGULO):
+            ruta = f"{ruta}{EXTENSION_TRIANGULO}"
+        base = ruta[:-len(EXTENSION_TRIANGULO)]
+
+        with open(f"{base}{EXTENSION_ETIQUETAS}", encoding='utf-8') as f:
+            self.descripcion = json.load(f)
+
+        self.ruta = ruta
+        self.nombre = os.path.basename(base)
+        self.n = self.descripcion['n']
+        self.etiquetas = self.descripcion['etiquetas']
+        self.triangulo = np.load(ruta, mmap_mode='r')
+        self._posicion = {etiqueta: i for i, etiqueta in enumerate(self.etiquetas)}
+
+    @property
+    def columns(self):
+        return pd.Index(self.etiquetas)
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    def _indice(self, clave):
+        if isinstance(clave, (int, np.integer)):
+            return int(clave)
+        return self._posicion[clave]
+
+    def fila_superior(self, i):
+        """Valores j >= i de la fila i (vista sin copia del archivo)"""
+        i = self._indice(i)
+        inicio = int(desplazamiento_fila(i, self.n))
+        return self.triangulo[inicio:inicio + self.n - i]
+
+    def fila(self, i):
+        """Fila completa i (n valores)"""
+        i = self._indice(i)
+        anteriores = np.arange(i)
+        return np.concatenate([
+            self.triangulo[desplazamiento_fila(anteriores, self.n) + (i - anteriores)],
+            self.fila_superior(i)
+        ])
+
+    def bloque(self, filas, columnas=None):
+        """
+        Submatriz de las filas y columnas dadas (índices o etiquetas).
+        Solo se leen del archivo las posiciones necesarias.
+        """
+        filas = np.array([self._indice(c) for c in np.atleast_1d(filas)], dtype=np.int64)
+        columnas = filas if columnas is None else \
+            np.array([self._indice(c) for c in np.atleast_1d(columnas)], dtype=np.int64)
+        menor = np.minimum(filas[:, None], columnas[None, :])
+        mayor = np.maximum(filas[:, None], columnas[None, :])
+        return np.asarray(self.triangulo[desplazamiento_fila(menor, self.n) + (mayor - menor)])
+
+    def valor(self, i, j):
+        i, j = self._indice(i), self._indice(j)
+        i, j = min(i, j), max(i, j)
+        return self.triangulo[int(desplazamiento_fila(i, self.n)) + j - i]
+
+    def a_dataframe(self, dtype='float64'):
+        """Reconstruye la matriz completa como DataFrame (n x n en memoria)"""
+        matriz = np.empty((self.n, self.n), dtype=dtype)
+        for i in range(self.n):
+            superior = self.fila_superior(i)
+            matriz[i, i:] = superior
+            matriz[i:, i] = superior
+        return pd.DataFrame(matriz, index=self.etiquetas, columns=self.etiquetas)
+
+
+def cargar_matriz_compacta(nombre_archivo, carpeta):
+    """Abre (mapea) una matriz compacta por su nombre sin extensión"""
+    return MatrizCompacta(os.path.join(carpeta, f"{nombre_archivo}{EXTENSION_TRIANGULO}"))
+
+
+def listar_matrices_compactas(carpeta):
+    """Nombres (sin extensión) de las matrices compactas de una carpeta"""
+    if not os.path.exists(carpeta):
+        return []
+    return sorted(
+        f[:-len(EXTENSION_TRIANGULO)] for f in os.listdir(carpeta)
+        if f.endswith(EXTENSION_TRIANGULO)
+    )
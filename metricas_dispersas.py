@@ -0,0 +1,277 @@
+# metricas_dispersas.py
+import numpy as np
+import networkx as nx
+import scipy.sparse as sp
+from grafo_csr import GrafoCSR
+
+# Pivotes por defecto para las centralidades muestreadas
+N_PIVOTES = 256
+
+# Memoria máxima de las matrices (pivotes x nodos) de un lote de BFS (bytes)
+MEMORIA_PIVOTES = 256 * 2**20
+
+
+def _como_csr(G):
+    """GrafoCSR de un grafo de networkx (o el mismo GrafoCSR)"""
+    return G if isinstance(G, GrafoCSR) else GrafoCSR.desde_networkx(G)
+
+
+def adyacencia(grafo):
+    """Matriz de adyacencia 0/1 (float64) de un GrafoCSR"""
+    n = grafo.n_nodos
+    return sp.csr_matrix((np.ones(len(grafo.indices)), grafo.indices, grafo.indptr), shape=(n, n))
+
+
+def triangulos(A):
+    """Triángulos de cada nodo: diag(A³) / 2 sin formar A³ (solo (A·A) ∘ A)"""
+    return np.asarray((A @ A).multiply(A).sum(axis=1)).ravel() / 2
+
+
+def clustering(A):
+    """Coeficiente de clustering de cada nodo, como nx.clustering sin pesos"""
+    grado = np.asarray(A.sum(axis=1)).ravel()
+    posibles = grado * (grado - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(posibles > 0, 2 * triangulos(A) / posibles, 0.0)
+
+
+def numero_nucleo(grafo):
+    """
+    k-núcleo (core number) de cada nodo con el algoritmo de Batagelj y
+    Zaversnik en O(E): los nodos se recorren en orden de grado y al
+    quitar uno se baja el grado de sus vecinos de mayor grado.
+    """
+    n = grafo.n_nodos
+    grado = grafo.grado().astype(np.int64)
+    if n == 0:
+        return grado
+    # Ordenamiento por casilleros (bin sort) según el grado
+    cuenta = np.bincount(grado)
+    inicio_casillero = np.concatenate([[0], np.cumsum(cuenta)[:-1]]).tolist()
+    orden = np.argsort(grado, kind='stable').tolist()
+    posicion = [0] * n
+    for k, nodo in enumerate(orden):
+        posicion[nodo] = k
+
+    grado = grado.tolist()
+    indptr, indices = grafo.indptr.tolist(), grafo.indices.tolist()
+    for k in range(n):
+        v = orden[k]
+        for u in indices[indptr[v]:indptr[v + 1]]:
+            if grado[u] > grado[v]:
+                # Mover u al inicio de su casillero y achicar el casillero
+                du = grado[u]
+                pu = posicion[u]
+                pw = inicio_casillero[du]
+                w = orden[pw]
+                if u != w:
+                    orden[pu], orden[pw] = w, u
+                    posicion[u], posicion[w] = pw, pu
+                inicio_casillero[du] += 1
+                grado[u] -= 1
+    return np.asarray(grado, dtype=np.int64)
+
+
+def _tam_lote_pivotes(n, memoria_max):
+    # distancias, sigma, delta y frontera: cuatro matrices (lote, n) de 8 bytes
+    return max(1, int(memoria_max // (4 * 8 * max(n, 1))))
+
+
+def _brandes_lote(A, pivotes):
+    """
+    Brandes algebraico para un lote de fuentes: cada nivel del BFS de todas
+    las fuentes es un producto matriz dispersa por matriz densa.
+
+    Retorna:
+    - dependencias delta (lote, n) y distancias (lote, n) (-1 si no se alcanza)
+    """
+    n = A.shape[0]
+    b = len(pivotes)
+    filas = np.arange(b)
+    distancia = np.full((b, n), -1, dtype=np.int64)
+    sigma = np.zeros((b, n))
+    distancia[filas, pivotes] = 0
+    sigma[filas, pivotes] = 1.0
+
+    frontera = sigma.copy()
+    nivel = 0
+    while True:
+        # Caminos más cortos que llegan a cada nodo desde la frontera (A es simétrica)
+        siguiente = np.asarray((A @ frontera.T).T)
+        siguiente[distancia >= 0] = 0.0
+        nuevos = siguiente > 0
+        if not nuevos.any():
+            break
+        nivel += 1
+        distancia[nuevos] = nivel
+        sigma[nuevos] = siguiente[nuevos]
+        frontera = np.where(nuevos, siguiente, 0.0)
+
+    # Acumulación de dependencias del nivel más profundo hacia las fuentes
+    delta = np.zeros((b, n))
+    for d in range(nivel, 0, -1):
+        en_nivel = distancia == d
+        coeficiente = np.where(en_nivel, (1.0 + delta) / np.where(en_nivel, sigma, 1.0), 0.0)
+        aporte = np.asarray((A @ coeficiente.T).T)
+        anterior = distancia == d - 1
+        delta[anterior] += sigma[anterior] * aporte[anterior]
+    delta[filas, pivotes] = 0.0
+    return delta, distancia
+
+
+def centralidades_muestreadas(grafo, n_pivotes=N_PIVOTES, alfa=0.05, semilla=42,
+                              memoria_max=MEMORIA_PIVOTES):
+    """
+    Intermediación (betweenness) y cercanía (closeness) aproximadas a
+    partir de BFS desde n_pivotes nodos elegidos al azar (sin pesos).
+
+    - Intermediación: estimador de Brandes y Pich, normalizado como
+      nx.betweenness_centrality(k=n_pivotes)
+    - Cercanía: la distancia media de cada nodo se estima con las
+      distancias desde los pivotes de su componente (Eppstein y Wang) y se
+      normaliza como nx.closeness_centrality (Wasserman-Faust)
+
+    Con n_pivotes >= n el cálculo es exacto. Las cotas de error
+    (Hoeffding, probabilidad 1 - alfa) son:
+    - error_intermediacion: cota del error absoluto de cada intermediación
+    - error_distancia_media: cota del error absoluto de la distancia media
+      de cada nodo (en aristas)
+
+    Retorna:
+    - diccionario con los arreglos 'intermediacion' y 'cercania', las
+      cotas de error y el número de pivotes usados
+    """
+    A = adyacencia(grafo)
+    n = grafo.n_nodos
+    rng = np.random.default_rng(semilla)
+    k = min(n_pivotes, n)
+    pivotes = np.sort(rng.choice(n, size=k, replace=False)) if k < n else np.arange(n)
+
+    _, componente = grafo.componentes() if n else (0, np.zeros(0, dtype=np.int64))
+    tamano_componente = np.bincount(componente, minlength=1)[componente] if n else np.zeros(0)
+
+    suma_delta = np.zeros(n)
+    suma_distancias = np.zeros(n)
+    pivotes_componente = np.zeros(n)
+    excentricidad = 0
+    tam_lote = _tam_lote_pivotes(n, memoria_max)
+    for inicio in range(0, k, tam_lote):
+        lote = pivotes[inicio:inicio + tam_lote]
+        delta, distancia = _brandes_lote(A, lote)
+        suma_delta += delta.sum(axis=0)
+        alcanzados = distancia >= 0
+        suma_distancias += np.where(alcanzados, distancia, 0).sum(axis=0)
+        pivotes_componente += alcanzados.sum(axis=0)
+        excentricidad = max(excentricidad, int(distancia.max(initial=0)))
+
+    # Normalización de networkx: 1 / ((n-1)(n-2)), reescalada por n / k
+    escala = 1.0 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+    intermediacion = suma_delta * escala * (n / k if k else 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        distancia_media = suma_distancias / pivotes_componente
+        suma_estimada = distancia_media * tamano_componente
+        alcanzables = tamano_componente - 1
+        cercania = np.where(
+            (suma_estimada > 0) & (pivotes_componente > 0),
+            (alcanzables / suma_estimada) * (alcanzables / max(n - 1, 1)),
+            0.0
+        )
+
+    exacto = k >= n
+    raiz = np.sqrt(np.log(2 / alfa) / (2 * k)) if k else np.inf
+    return {
+        'intermediacion': intermediacion,
+        'cercania': cercania,
+        'error_intermediacion': 0.0 if exacto else float(n / max(n - 1, 1) * raiz),
+        'error_distancia_media': 0.0 if exacto else float(excentricidad * raiz),
+        'n_pivotes': k
+    }
+
+
+def metricas_dispersas(G, nombre, n_pivotes=N_PIVOTES, alfa=0.05, semilla=42):
+    """
+    Métricas de grafo.analizar_grafo calculadas sobre matrices dispersas,
+    más fuerza, clustering, k-núcleo y centralidades muestreadas.
+
+    Acepta un grafo de networkx o un GrafoCSR y retorna el mismo
+    diccionario 'metricas' que analizar_grafo, con claves adicionales.
+    """
+    print(f"\n{'='*50}")
+    print(f"ANALISIS DEL GRAFO: {nombre} (matrices dispersas)")
+    print(f"{'='*50}")
+
+    dirigido = isinstance(G, nx.Graph) and G.is_directed()
+    grafo = _como_csr(G)
+    n = grafo.n_nodos
+    etiquetas = grafo.etiquetas
+
+    metricas = {
+        'nombre': nombre,
+        'n_nodos': n,
+        'n_aristas': grafo.n_aristas,
+        'densidad': 2 * grafo.n_aristas / (n * (n - 1)) if n > 1 else 0
+    }
+
+    print(f"Nodos: {metricas['n_nodos']}")
+    print(f"Aristas: {metricas['n_aristas']}")
+    print(f"Densidad: {metricas['densidad']:.4f}")
+
+    if n == 0:
+        return metricas
+
+    grado = grafo.grado()
+    metricas['grado_promedio'] = float(np.mean(grado))
+    metricas['grado_max'] = int(grado.max())
+    metricas['grado_min'] = int(grado.min())
+
+    print(f"Grado promedio: {metricas['grado_promedio']:.2f}")
+    print(f"Grado maximo: {metricas['grado_max']}")
+    print(f"Grado minimo: {metricas['grado_min']}")
+
+    if grafo.n_aristas == 0:
+        return metricas
+
+    centralidad_grado = grado / (n - 1) if n > 1 else np.zeros(n)
+    mas_central = int(np.argmax(centralidad_grado))
+    metricas['nodo_mas_central'] = etiquetas[mas_central]
+    metricas['centralidad_max'] = float(centralidad_grado[mas_central])
+    print(f"Nodo mas central: {metricas['nodo_mas_central']} ({metricas['centralidad_max']:.3f})")
+
+    if not dirigido:
+        n_componentes, componente = grafo.componentes()
+        metricas['n_componentes'] = int(n_componentes)
+        metricas['tamano_componente_max'] = int(np.bincount(componente).max())
+        print(f"Componentes conexas: {metricas['n_componentes']}")
+        print(f"Componente mas grande: {metricas['tamano_componente_max']} nodos")
+
+    A = adyacencia(grafo)
+    fuerza = np.asarray(grafo.matriz_dispersa('weight').sum(axis=1)).ravel()
+    metricas['fuerza_promedio'] = float(np.mean(fuerza))
+    metricas['clustering_promedio'] = float(np.mean(clustering(A)))
+    nucleo = numero_nucleo(grafo)
+    metricas['nucleo_max'] = int(nucleo.max())
+    metricas['n_nodos_nucleo_max'] = int((nucleo == nucleo.max()).sum())
+
+    print(f"Fuerza promedio: {metricas['fuerza_promedio']:.4f}")
+    print(f"Clustering promedio: {metricas['clustering_promedio']:.4f}")
+    print(f"k-nucleo maximo: {metricas['nucleo_max']} ({metricas['n_nodos_nucleo_max']} nodos)")
+
+    centralidades = centralidades_muestreadas(grafo, n_pivotes=n_pivotes, alfa=alfa, semilla=semilla)
+    mas_intermediario = int(np.argmax(centralidades['intermediacion']))
+    mas_cercano = int(np.argmax(centralidades['cercania']))
+    metricas['n_pivotes'] = centralidades['n_pivotes']
+    metricas['nodo_mas_intermediario'] = etiquetas[mas_intermediario]
+    metricas['intermediacion_max'] = float(centralidades['intermediacion'][mas_intermediario])
+    metricas['error_intermediacion'] = centralidades['error_intermediacion']
+    metricas['nodo_mas_cercano'] = etiquetas[mas_cercano]
+    metricas['cercania_max'] = float(centralidades['cercania'][mas_cercano])
+    metricas['error_distancia_media'] = centralidades['error_distancia_media']
+
+    print(f"Intermediacion maxima: {metricas['nodo_mas_intermediario']} "
+          f"({metricas['intermediacion_max']:.4f} ± {metricas['error_intermediacion']:.4f}, "
+          f"{metricas['n_pivotes']} pivotes)")
+    print(f"Cercania maxima: {metricas['nodo_mas_cercano']} ({metricas['cercania_max']:.4f}; "
+          f"distancia media ± {metricas['error_distancia_media']:.2f})")
+
+    return metricas
@@ -3,6 +3,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import os
 from collections import defaultdict
+from cache_layout import posiciones
 
 def cargar_mst_desde_gml(ruta_archivo):
     """
@@ -184,9 +185,11 @@ def analizar_comunidades(G, comunidades):
         print(f"    Aristas internas: {subgrafo.number_of_edges()}")
         print()
 
-def visualizar_comunidades(G, comunidades, nombre_grafo, carpeta_salida="resultados_modularidad"):
+def visualizar_comunidades(G, comunidades, nombre_grafo, carpeta_salida="resultados_modularidad",
+                           pos=None, mostrar=True, dpi=300, formato='png'):
     """
     Visualiza el grafo coloreado por comunidades
+    pos: posiciones ya calculadas (None = spring_layout en caché, cache_layout.py); mostrar=False no abre ventana
     """
     if not os.path.exists(carpeta_salida):
         os.makedirs(carpeta_salida)
@@ -194,7 +197,8 @@ def visualizar_comunidades(G, comunidades, nombre_grafo, carpeta_salida="resulta
     plt.figure(figsize=(14, 10))
     
     # Posición del grafo
-    pos = nx.spring_layout(G, k=2, iterations=100, seed=42)
+    if pos is None:
+        pos = posiciones(G, k=2, iterations=100, seed=42)
     
     # Colores para comunidades
     comunidades_unicas = list(set(comunidades.values()))
@@ -230,11 +234,15 @@ def visualizar_comunidades(G, comunidades, nombre_grafo, carpeta_salida="resulta
     plt.tight_layout()
     
     # Guardar imagen
-    ruta_imagen = os.path.join(carpeta_salida, f"comunidades_{nombre_grafo}.png")
-    plt.savefig(ruta_imagen, dpi=300, bbox_inches='tight')
-    plt.show()
+    ruta_imagen = os.path.join(carpeta_salida, f"comunidades_{nombre_grafo}.{formato}")
+    plt.savefig(ruta_imagen, dpi=dpi, bbox_inches='tight')
+    if mostrar:
+        plt.show()
+    else:
+        plt.close()
     
     print(f"Visualización guardada: {ruta_imagen}")
+    return ruta_imagen
 
 def guardar_resultados_comunidades(G, comunidades, nombre_grafo, carpeta_salida="resultados_modularidad"):
     """
@@ -273,6 +281,7 @@ def main():
     
     # CONFIGURACIÓN
     ARCHIVO_MST = "mst_resultados/mst_df_original_directa.gml"  # ← MODIFICA AQUÍ
+    MOSTRAR_FIGURAS = True  # False = guardar las figuras sin abrir ventanas (ejecución por lotes)
     
     if not os.path.exists(ARCHIVO_MST):
         print(f"Error: No se encuentra el archivo {ARCHIVO_MST}")
@@ -301,7 +310,7 @@ def main():
     analizar_comunidades(mst, comunidades)
     
     # Visualizar
-    visualizar_comunidades(mst, comunidades, nombre_grafo)
+    visualizar_comunidades(mst, comunidades, nombre_grafo, mostrar=MOSTRAR_FIGURAS)
     
     # Guardar resultados
     df_resultados = guardar_resultados_comunidades(mst, comunidades, nombre_grafo)
@@ -317,7 +326,10 @@ def main():
     
     ruta_evolucion = os.path.join("resultados_modularidad", f"evolucion_modularidad_{nombre_grafo}.png")
     plt.savefig(ruta_evolucion, dpi=300, bbox_inches='tight')
-    plt.show()
+    if MOSTRAR_FIGURAS:
+        plt.show()
+    else:
+        plt.close()
     
     print(f"\n" + "="*70)
     print("DETECCIÓN DE COMUNIDADES COMPLETADA")
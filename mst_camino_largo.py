@@ -5,6 +5,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 import os
 from collections import deque
+from grafo_csr import GrafoCSR
+from cache_layout import posiciones
 
 # CONFIGURACIÓN DE VARIABLE OBJETIVO
 VARIABLE_OBJETIVO = "target_y"  # ← MODIFICA AQUÍ la variable objetivo
@@ -34,40 +36,20 @@ def encontrar_camino_mas_largo_topologico(grafo):
     print(f"BUSCANDO CAMINO TOPOLÓGICO MÁS LARGO")
     print("="*60)
     
-    # Crear grafo no dirigido para cálculo de distancias
-    grafo_no_dirigido = grafo.to_undirected()
+    # Grafo no dirigido en arreglos CSR: un BFS por hoja en lugar de uno por par de hojas
+    grafo_csr = GrafoCSR.desde_networkx(grafo.to_undirected())
+    camino, longitud_maxima, par = grafo_csr.camino_mas_largo()
     
-    # Encontrar todos los pares de hojas
-    hojas = [nodo for nodo in grafo_no_dirigido.nodes() if grafo_no_dirigido.degree(nodo) == 1]
-    
-    if len(hojas) < 2:
-        print("No hay suficientes hojas para encontrar un camino largo")
+    if camino is None:
+        if (grafo_csr.grado() == 1).sum() < 2:
+            print("No hay suficientes hojas para encontrar un camino largo")
+        else:
+            print("No se encontró ningún camino entre hojas")
         return None, 0, None
     
-    camino_mas_largo = []
-    longitud_maxima = -1
-    mejor_par = (None, None)
-    
-    # Probar todos los pares de hojas usando BFS para distancia topológica
-    for i in range(len(hojas)):
-        for j in range(i + 1, len(hojas)):
-            hoja1, hoja2 = hojas[i], hojas[j]
-            try:
-                # Usar BFS para encontrar el camino más corto (distancia topológica)
-                camino = nx.shortest_path(grafo_no_dirigido, hoja1, hoja2)
-                longitud = len(camino) - 1  # Número de aristas (distancia topológica)
-                
-                if longitud > longitud_maxima:
-                    longitud_maxima = longitud
-                    camino_mas_largo = camino
-                    mejor_par = (hoja1, hoja2)
-                    
-            except nx.NetworkXNoPath:
-                continue
-    
-    if not camino_mas_largo:
-        print("No se encontró ningún camino entre hojas")
-        return None, 0, None
+    etiquetas = grafo_csr.etiquetas
+    camino_mas_largo = [etiquetas[i] for i in camino]
+    mejor_par = (etiquetas[par[0]], etiquetas[par[1]])
     
     print(f" Camino topológico más largo encontrado:")
     print(f"   Desde: {mejor_par[0]} → Hasta: {mejor_par[1]}")
@@ -193,14 +175,17 @@ def analizar_componentes_conexas(componentes, variable_objetivo):
     return componentes
 
 def visualizar_division_y_seleccion(grafo_original, camino_mas_largo, componentes, 
-                                  arbol_objetivo, aristas_eliminadas, nombre_grafo, grafo_dividido):
+                                  arbol_objetivo, aristas_eliminadas, nombre_grafo, grafo_dividido,
+                                  pos=None, mostrar=True, dpi=300, formato='png'):
     """
     Visualiza el proceso de división y selección
+    pos: posiciones ya calculadas (None = spring_layout en caché, cache_layout.py); mostrar=False no abre ventana
     """
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(20, 16))
     
     # Layout consistente
-    pos = nx.spring_layout(grafo_original, k=1, iterations=50, seed=42)
+    if pos is None:
+        pos = posiciones(grafo_original, k=1, iterations=50, seed=42)
     
     # 1. Grafo original con camino más largo resaltado
     nx.draw_networkx_nodes(grafo_original, pos, ax=ax1, node_size=500, 
@@ -306,11 +291,15 @@ def visualizar_division_y_seleccion(grafo_original, camino_mas_largo, componente
     if not os.path.exists(carpeta_salida):
         os.makedirs(carpeta_salida)
     
-    ruta_imagen = os.path.join(carpeta_salida, f"arbol_objetivo_{nombre_grafo}.png")
-    plt.savefig(ruta_imagen, dpi=300, bbox_inches='tight')
-    plt.show()
+    ruta_imagen = os.path.join(carpeta_salida, f"arbol_objetivo_{nombre_grafo}.{formato}")
+    plt.savefig(ruta_imagen, dpi=dpi, bbox_inches='tight')
+    if mostrar:
+        plt.show()
+    else:
+        plt.close()
     
     print(f"Visualización guardada: {ruta_imagen}")
+    return ruta_imagen
 
 def exportar_arbol_objetivo(arbol_objetivo, grafo_original, nombre_grafo, aristas_eliminadas):
     """
@@ -363,6 +352,7 @@ def main():
     CARPETA_MST = "mst_resultados"
     MST = "W16C"
     ARCHIVO_MST = f"mst_{MST}_directa.gml"  # Modifica según necesites
+    MOSTRAR_FIGURAS = True  # False = guardar la figura sin abrir ventana (ejecución por lotes)
     
     ruta_mst = os.path.join(CARPETA_MST, ARCHIVO_MST)
     
@@ -411,7 +401,8 @@ def main():
     
     # Visualizar resultados
     visualizar_division_y_seleccion(grafo, camino_mas_largo, componentes, 
-                                  arbol_objetivo, aristas_eliminadas, nombre_grafo, grafo_dividido)
+                                  arbol_objetivo, aristas_eliminadas, nombre_grafo, grafo_dividido,
+                                  mostrar=MOSTRAR_FIGURAS)
     
     # Exportar árbol objetivo
     exportar_arbol_objetivo(arbol_objetivo, grafo, nombre_grafo, aristas_eliminadas)
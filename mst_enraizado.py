@@ -246,9 +246,11 @@ def crear_layout_jerarquico(arbol, nodo_raiz):
     
     return pos
 
-def visualizar_arbol_enraizado(arbol, nodo_raiz, nombre_grafo, carpeta_salida="mst_enraizado"):
+def visualizar_arbol_enraizado(arbol, nodo_raiz, nombre_grafo, carpeta_salida="mst_enraizado",
+                               pos=None, mostrar=True, dpi=300, formato='png'):
     """
     Visualiza el árbol enraizado de manera jerárquica (sin pygraphviz)
+    pos: posiciones ya calculadas (None = layout jerárquico); mostrar=False no abre ventana
     """
     if not os.path.exists(carpeta_salida):
         os.makedirs(carpeta_salida)
@@ -256,7 +258,8 @@ def visualizar_arbol_enraizado(arbol, nodo_raiz, nombre_grafo, carpeta_salida="m
     plt.figure(figsize=(14, 10))
     
     # Usar layout jerárquico manual
-    pos = crear_layout_jerarquico(arbol, nodo_raiz)
+    if pos is None:
+        pos = crear_layout_jerarquico(arbol, nodo_raiz)
     
     # Calcular profundidades para colorear (manejar nodos aislados)
     colores = []
@@ -364,11 +367,15 @@ def visualizar_arbol_enraizado(arbol, nodo_raiz, nombre_grafo, carpeta_salida="m
     plt.tight_layout()
     
     # Guardar imagen
-    ruta_imagen = os.path.join(carpeta_salida, f"arbol_enraizado_{nombre_grafo}_{nodo_raiz}.png")
-    plt.savefig(ruta_imagen, dpi=300, bbox_inches='tight')
-    plt.show()
+    ruta_imagen = os.path.join(carpeta_salida, f"arbol_enraizado_{nombre_grafo}_{nodo_raiz}.{formato}")
+    plt.savefig(ruta_imagen, dpi=dpi, bbox_inches='tight')
+    if mostrar:
+        plt.show()
+    else:
+        plt.close()
     
     print(f"Visualización guardada: {ruta_imagen}")
+    return ruta_imagen
 
 def exportar_arbol_enraizado(arbol, nodo_raiz, nombre_grafo, carpeta_salida="mst_enraizado"):
     """
@@ -493,6 +500,7 @@ def main():
     CARPETA_MST = "mst_resultados"
     GRAFO = "W16C"
     ARCHIVO_MST = f"mst_{GRAFO}_directa.gml"  # ← CAMBIADO de W4C_mixto a B4C_mixto
+    MOSTRAR_FIGURAS = True  # False = guardar la figura sin abrir ventana (ejecución por lotes)
     
     ruta_mst = os.path.join(CARPETA_MST, ARCHIVO_MST)
     
@@ -524,7 +532,7 @@ def main():
     profundidades, niveles, hojas, nodos_aislados = analizar_arbol_enraizado(arbol_enraizado, nodo_raiz)
     
     # Visualizar
-    visualizar_arbol_enraizado(arbol_enraizado, nodo_raiz, nombre_grafo)
+    visualizar_arbol_enraizado(arbol_enraizado, nodo_raiz, nombre_grafo, mostrar=MOSTRAR_FIGURAS)
     
     # Exportar resultados
     df_arbol, df_aristas = exportar_arbol_enraizado(arbol_enraizado, nodo_raiz, nombre_grafo)
@@ -8,6 +8,7 @@ from mpl_toolkits.axes_grid1 import make_axes_locatable
 import os
 import re
 from collections import deque
+from render import TrabajoRender, renderizar
 
 
 def cargar_y_corregir_gml(ruta_archivo):
@@ -268,9 +269,11 @@ def mostrar_estructura_arbol(arbol, nodo_raiz):
     for nivel in sorted(niveles.keys()):
         print(f"  Nivel {nivel}: {len(niveles[nivel])} nodos")
 
-def visualizar_arbol(arbol, nodo_raiz, nombre_grafo, profundidad_maxima, carpeta_salida="mst_raiz_reducido"):
+def visualizar_arbol(arbol, nodo_raiz, nombre_grafo, profundidad_maxima, carpeta_salida="mst_raiz_reducido",
+                     pos=None, mostrar=True, dpi=300, formato='png'):
     """
     Visualiza el árbol de forma jerárquica
+    pos: posiciones ya calculadas (None = layout por niveles); mostrar=False no abre ventana
     """
     if not os.path.exists(carpeta_salida):
         os.makedirs(carpeta_salida)
@@ -285,23 +288,24 @@ def visualizar_arbol(arbol, nodo_raiz, nombre_grafo, profundidad_maxima, carpeta
     profundidades = calcular_profundidades(arbol, nodo_raiz)
     
     # Crear layout jerárquico
-    pos = {}
-    niveles = {}
-    
-    for nodo, prof in profundidades.items():
-        if prof not in niveles:
-            niveles[prof] = []
-        niveles[prof].append(nodo)
-    
-    # Posicionar nodos por niveles
-    max_nivel = max(niveles.keys()) if niveles else 0
-    for nivel, nodos_nivel in niveles.items():
-        y_pos = 1.0 - (nivel / (max_nivel + 1))
-        num_nodos = len(nodos_nivel)
+    if pos is None:
+        pos = {}
+        niveles = {}
+        
+        for nodo, prof in profundidades.items():
+            if prof not in niveles:
+                niveles[prof] = []
+            niveles[prof].append(nodo)
         
-        for i, nodo in enumerate(sorted(nodos_nivel)):
-            x_pos = (i + 1) / (num_nodos + 1)
-            pos[nodo] = (x_pos, y_pos)
+        # Posicionar nodos por niveles
+        max_nivel = max(niveles.keys()) if niveles else 0
+        for nivel, nodos_nivel in niveles.items():
+            y_pos = 1.0 - (nivel / (max_nivel + 1))
+            num_nodos = len(nodos_nivel)
+            
+            for i, nodo in enumerate(sorted(nodos_nivel)):
+                x_pos = (i + 1) / (num_nodos + 1)
+                pos[nodo] = (x_pos, y_pos)
     
     # Colores por profundidad
     colores_nodos = [profundidades.get(nodo, 0) for nodo in arbol.nodes()]
@@ -351,12 +355,16 @@ def visualizar_arbol(arbol, nodo_raiz, nombre_grafo, profundidad_maxima, carpeta
     plt.tight_layout()
     
     # Guardar
-    nombre_archivo = f"arbol_reducido_{nombre_grafo}_prof{profundidad_maxima}.png"
+    nombre_archivo = f"arbol_reducido_{nombre_grafo}_prof{profundidad_maxima}.{formato}"
     ruta_completa = os.path.join(carpeta_salida, nombre_archivo)
-    plt.savefig(ruta_completa, dpi=300, bbox_inches='tight')
-    plt.show()
+    plt.savefig(ruta_completa, dpi=dpi, bbox_inches='tight')
+    if mostrar:
+        plt.show()
+    else:
+        plt.close()
     
     print(f"  Visualización guardada: {ruta_completa}")
+    return ruta_completa
 
 def exportar_resultados(arbol, nodo_raiz, nombre_grafo, profundidad_maxima, carpeta_salida="mst_raiz_reducido"):
     """
@@ -416,9 +424,11 @@ def exportar_resultados(arbol, nodo_raiz, nombre_grafo, profundidad_maxima, carp
     
     return df_nodos
 
-def procesar_base_datos(nombre_bd, limite_profundidad=2):
+def procesar_base_datos(nombre_bd, limite_profundidad=2, trabajos_render=None):
     """
     Procesa una base de datos específica
+    Con trabajos_render (lista) la figura se agrega como trabajo para
+    render.renderizar en lugar de dibujarse aquí
     """
     print("\n" + "=" * 70)
     print(f"PROCESANDO: {nombre_bd}")
@@ -467,7 +477,11 @@ def procesar_base_datos(nombre_bd, limite_profundidad=2):
         return None
     
     # 5. Visualizar
-    visualizar_arbol(arbol_reducido, nodo_raiz, nombre_bd, limite_profundidad)
+    if trabajos_render is None:
+        visualizar_arbol(arbol_reducido, nodo_raiz, nombre_bd, limite_profundidad)
+    else:
+        trabajos_render.append(TrabajoRender(visualizar_arbol,
+                                             (arbol_reducido, nodo_raiz, nombre_bd, limite_profundidad)))
     
     # 6. Exportar resultados
     df_resultados = exportar_resultados(arbol_reducido, nodo_raiz, nombre_bd, limite_profundidad)
@@ -487,6 +501,8 @@ def main():
     
     # CONFIGURACIÓN
     LIMITE_PROFUNDIDAD = 1  # Niveles a mantener desde la raíz
+    MOSTRAR_FIGURAS = False  # True = abrir cada figura (bloquea); False = render en paralelo sin ventanas
+    NIVEL_RENDER = 'publicacion'  # 'borrador', 'normal', 'publicacion' o 'vectorial' (ver render.py)
     
     # Lista de bases de datos a procesar
     bases_datos = [
@@ -500,17 +516,22 @@ def main():
     # bases_datos = ["B2C"]
     
     resultados = {}
+    trabajos_render = None if MOSTRAR_FIGURAS else []
     
     for bd in bases_datos:
         print(f"\n{'='*40}")
         print(f"INICIANDO PROCESAMIENTO DE: {bd}")
         print(f"{'='*40}")
         
-        resultado = procesar_base_datos(bd, LIMITE_PROFUNDIDAD)
+        resultado = procesar_base_datos(bd, LIMITE_PROFUNDIDAD, trabajos_render)
         
         if resultado is not None:
             resultados[bd] = resultado
     
+    # Generar las figuras en paralelo (sin ventanas; se omiten las que no cambiaron)
+    if trabajos_render:
+        renderizar(trabajos_render, nivel=NIVEL_RENDER)
+    
     # Resumen final
     print("\n" + "=" * 80)
     print("RESUMEN DEL PROCESAMIENTO")
@@ -4,6 +4,9 @@ import networkx as nx
 import matplotlib.pyplot as plt
 import os
 import sys
+from grafo_csr import GrafoCSR, EXTENSION_CSR
+from render import TrabajoRender, renderizar
+from cache_layout import posiciones
 
 # Configurar encoding para evitar problemas con caracteres Unicode
 sys.stdout.reconfigure(encoding='utf-8')
@@ -64,23 +67,56 @@ def kruskal_networkx(grafo):
     return nx.minimum_spanning_tree(grafo, weight='weight')
     #return nx.minimum_spanning_tree(grafo, weight='weight', algorithm='kruskal')
 
+def kruskal_csr(grafo):
+    """
+    Kruskal con unión-búsqueda sobre arreglos CSR (ver grafo_csr.py);
+    mismo criterio que kruskal_networkx (minimiza 'weight'). Acepta un
+    grafo de networkx o un GrafoCSR y retorna el MST como GrafoCSR (n - 1
+    aristas como máximo; .a_networkx() para exportarlo o dibujarlo).
+    """
+    if not isinstance(grafo, GrafoCSR):
+        grafo = GrafoCSR.desde_networkx(grafo)
+    return grafo.arbol_expansion_minimo(atributo='weight')
+
+def cargar_grafo_csr(ruta_archivo):
+    """
+    Carga un grafo guardado en arreglos CSR por grafo.py (sin reparsear GML)
+    """
+    grafo = GrafoCSR.cargar(ruta_archivo)
+    nombre_grafo = os.path.basename(ruta_archivo).replace('grafo_', '').replace(EXTENSION_CSR, '')
+    
+    print(f"Grafo cargado (CSR): {nombre_grafo}")
+    print(f"  Nodos: {grafo.n_nodos}")
+    print(f"  Aristas: {grafo.n_aristas}")
+    
+    return grafo, nombre_grafo
+
 def analizar_mst(grafo_original, mst, nombre_grafo):
     """
     Analiza y compara el grafo original con el MST
+
+    grafo_original: grafo de networkx o GrafoCSR (no se convierte)
     """
     print(f"\n" + "="*60)
     print(f"ARBOL DE EXPANSION MINIMA - {nombre_grafo}")
     print("="*60)
     
-    peso_total_original = sum(d['weight'] for u, v, d in grafo_original.edges(data=True))
+    if isinstance(grafo_original, GrafoCSR):
+        n_nodos_original, n_aristas_original = grafo_original.n_nodos, grafo_original.n_aristas
+        # Cada arista aparece en las filas de sus dos extremos
+        peso_total_original = float(grafo_original.weight.sum()) / 2
+    else:
+        n_nodos_original = grafo_original.number_of_nodes()
+        n_aristas_original = grafo_original.number_of_edges()
+        peso_total_original = sum(d['weight'] for u, v, d in grafo_original.edges(data=True))
     peso_total_mst = sum(d['weight'] for u, v, d in mst.edges(data=True))
     
     # Contar nodos aislados
     nodos_aislados = [nodo for nodo in mst.nodes() if mst.degree(nodo) == 0]
     
     print(f"Grafo original:")
-    print(f"  Nodos: {grafo_original.number_of_nodes()}")
-    print(f"  Aristas: {grafo_original.number_of_edges()}")
+    print(f"  Nodos: {n_nodos_original}")
+    print(f"  Aristas: {n_aristas_original}")
     print(f"  Peso total: {peso_total_original:.6f}")
     
     print(f"\nArbol de expansion minima:")
@@ -89,7 +125,7 @@ def analizar_mst(grafo_original, mst, nombre_grafo):
     print(f"  Nodos aislados: {len(nodos_aislados)}")
     print(f"  Aristas: {mst.number_of_edges()}")
     print(f"  Peso total: {peso_total_mst:.6f}")
-    print(f"  Reduccion de aristas: {grafo_original.number_of_edges() - mst.number_of_edges()}")
+    print(f"  Reduccion de aristas: {n_aristas_original - mst.number_of_edges()}")
     
     if nodos_aislados:
         print(f"  Nodos aislados: {nodos_aislados}")
@@ -102,17 +138,25 @@ def analizar_mst(grafo_original, mst, nombre_grafo):
         distancia = datos.get('distance', 0)
         print(f"  {u} <-> {v}: peso={correlacion:.6f}, dist={distancia:.6f}")
 
-def visualizar_mst_comparacion(grafo_original, mst, nombre_grafo, carpeta_salida="mst_resultados"):
+def visualizar_mst_comparacion(grafo_original, mst, nombre_grafo, carpeta_salida="mst_resultados",
+                               pos=None, mostrar=True, dpi=300, formato='png'):
     """
     Visualiza el grafo original y el MST lado a lado, marcando nodos aislados
+    grafo_original y mst: grafos de networkx o GrafoCSR (se convierten aquí, en el proceso de render)
+    pos: posiciones ya calculadas (None = spring_layout en caché, cache_layout.py); mostrar=False no abre ventana
     """
+    if isinstance(grafo_original, GrafoCSR):
+        grafo_original = grafo_original.a_networkx()
+    if isinstance(mst, GrafoCSR):
+        mst = mst.a_networkx()
     if not os.path.exists(carpeta_salida):
         os.makedirs(carpeta_salida)
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 8))
     
     # Posición consistente para ambos grafos
-    pos = nx.spring_layout(grafo_original, k=1, iterations=50, seed=42)
+    if pos is None:
+        pos = posiciones(grafo_original, k=1, iterations=50, seed=42)
     
     # Grafo original
     nx.draw_networkx_nodes(grafo_original, pos, ax=ax1, node_size=500, 
@@ -172,13 +216,17 @@ def visualizar_mst_comparacion(grafo_original, mst, nombre_grafo, carpeta_salida
     plt.tight_layout()
     
     # Guardar imagen
-    ruta_imagen = os.path.join(carpeta_salida, f"mst_{nombre_grafo}.png")
-    plt.savefig(ruta_imagen, dpi=300, bbox_inches='tight')
-    plt.show()
+    ruta_imagen = os.path.join(carpeta_salida, f"mst_{nombre_grafo}.{formato}")
+    plt.savefig(ruta_imagen, dpi=dpi, bbox_inches='tight')
+    if mostrar:
+        plt.show()
+    else:
+        plt.close()
     
     print(f"Imagen guardada: {ruta_imagen}")
     if nodos_aislados:
         print(f"Nodos aislados en el MST: {nodos_aislados}")
+    return ruta_imagen
 
 def guardar_mst_gml(mst, nombre_grafo, carpeta_salida="mst_resultados"):
     """
@@ -290,6 +338,8 @@ def main():
     
     # CONFIGURACIÓN: Elige qué grafos procesar
     GRAFOS_A_PROCESAR = []  # ← MODIFICA AQUÍ
+    MOSTRAR_FIGURAS = False  # True = abrir cada figura (bloquea); False = render en paralelo sin ventanas
+    NIVEL_RENDER = 'publicacion'  # 'borrador', 'normal', 'publicacion' o 'vectorial' (ver render.py)
     #GRAFOS_A_PROCESAR = ['B4C']  # ← MODIFICA AQUÍ
     # Opciones:
     # ['B4C_mixto']           - Solo B4C
@@ -302,9 +352,14 @@ def main():
         print("Ejecuta primero: python grafo.py")
         return
     
+    # Buscar grafos en arreglos CSR (se prefieren al GML del mismo grafo)
+    archivos_csr = [f for f in os.listdir(carpeta_grafos)
+                   if f.startswith('grafo_') and f.endswith(EXTENSION_CSR)]
+    
     # Buscar archivos GML (nuevo formato)
     archivos_gml = [f for f in os.listdir(carpeta_grafos) 
-                   if f.startswith('grafo_') and f.endswith('.gml') and not f.startswith('grafo_con_metricas_')]
+                   if f.startswith('grafo_') and f.endswith('.gml') and not f.startswith('grafo_con_metricas_')
+                   and f.replace('.gml', EXTENSION_CSR) not in archivos_csr]
     
     # Buscar archivos CSV (formato antiguo - por compatibilidad)
     archivos_csv = [f for f in os.listdir(carpeta_grafos) 
@@ -312,12 +367,14 @@ def main():
     
     # Filtrar por GRAFOS_A_PROCESAR si se especificó
     if GRAFOS_A_PROCESAR:
+        archivos_csr = [f for f in archivos_csr
+                       if any(grafo in f for grafo in GRAFOS_A_PROCESAR)]
         archivos_gml = [f for f in archivos_gml 
                        if any(grafo in f for grafo in GRAFOS_A_PROCESAR)]
         archivos_csv = [f for f in archivos_csv 
                        if any(grafo in f for grafo in GRAFOS_A_PROCESAR)]
     
-    archivos_grafo = archivos_gml + archivos_csv
+    archivos_grafo = archivos_csr + archivos_gml + archivos_csv
     
     if not archivos_grafo:
         print("No se encontraron archivos de grafos que coincidan con la configuración")
@@ -330,30 +387,39 @@ def main():
         return
     
     print(f"Archivos de grafos encontrados:")
+    for archivo in archivos_csr:
+        print(f"  - {archivo} (CSR)")
     for archivo in archivos_gml:
         print(f"  - {archivo} (GML)")
     for archivo in archivos_csv:
         print(f"  - {archivo} (CSV)")
     
+    trabajos_render = []
+    
     for archivo in archivos_grafo:
         try:
             # Determinar tipo de archivo y cargar
             ruta_completa = os.path.join(carpeta_grafos, archivo)
             
-            if archivo.endswith('.gml'):
+            # El grafo completo queda en arreglos CSR; solo el MST pasa a networkx
+            if archivo.endswith(EXTENSION_CSR):
+                grafo_original, nombre_grafo = cargar_grafo_csr(ruta_completa)
+            elif archivo.endswith('.gml'):
                 grafo_original, nombre_grafo = cargar_grafo_desde_gml(ruta_completa)
             else:
                 grafo_original, nombre_grafo = cargar_grafo_desde_csv(ruta_completa)
             
             if grafo_original is None:
                 continue
+            if not isinstance(grafo_original, GrafoCSR):
+                grafo_original = GrafoCSR.desde_networkx(grafo_original)
                 
-            if grafo_original.number_of_edges() == 0:
+            if grafo_original.n_aristas == 0:
                 print("  El grafo no tiene aristas, no se puede aplicar Kruskal")
                 continue
             
-            # Aplicar Kruskal
-            mst = kruskal_networkx(grafo_original)
+            # Aplicar Kruskal (unión-búsqueda sobre arreglos CSR)
+            mst = kruskal_csr(grafo_original).a_networkx()
             
             # Analizar resultados
             analizar_mst(grafo_original, mst, nombre_grafo)
@@ -362,7 +428,11 @@ def main():
             exportar_aristas_importantes(mst, nombre_grafo)
             
             # Visualizar
-            visualizar_mst_comparacion(grafo_original, mst, nombre_grafo)
+            if MOSTRAR_FIGURAS:
+                visualizar_mst_comparacion(grafo_original, mst, nombre_grafo)
+            else:
+                trabajos_render.append(TrabajoRender(visualizar_mst_comparacion,
+                                                     (grafo_original, mst, nombre_grafo)))
             
             # Guardar resultados en GML (nuevo formato)
             guardar_mst_gml(mst, nombre_grafo)
@@ -375,6 +445,10 @@ def main():
             import traceback
             traceback.print_exc()
     
+    # Generar las figuras en paralelo (sin ventanas; se omiten las que no cambiaron)
+    if trabajos_render:
+        renderizar(trabajos_render, nivel=NIVEL_RENDER)
+    
     print(f"\n" + "="*70)
     print("PROCESO DE KRUSKAL COMPLETADO")
     print("="*70)
@@ -0,0 +1,203 @@
+# particion_streaming.py
+import numpy as np
+import pandas as pd
+import os
+from alg import PORCENTAJES_PARTICIONES, validar_escalera, nombre_particion
+
+# Constantes empíricas del error normalizado de rango de KLL (99% de confianza)
+_KLL_COEF = 1.854
+_KLL_EXP = 0.9657
+
+
+def k_para_error(epsilon):
+    """
+    Calcula el parámetro k del sketch KLL necesario para un error
+    normalizado de rango epsilon (ej. 0.01 = 1% de las filas).
+    """
+    if not 0 < epsilon < 1:
+        raise ValueError("epsilon debe estar en el intervalo (0, 1)")
+    return max(8, int(np.ceil((_KLL_COEF / epsilon) ** (1 / _KLL_EXP))))
+
+
+class SketchKLL:
+    """
+    Sketch de cuantiles KLL (Karnin-Lang-Liberty) fusionable.
+
+    Mantiene niveles de compactadores; un elemento en el nivel h representa
+    2**h valores originales. La memoria es O(k) independiente del número de
+    filas y dos sketches construidos sobre trozos distintos se pueden
+    combinar con fusionar().
+    """
+
+    def __init__(self, k=200, c=2 / 3, semilla=None):
+        self.k = k
+        self.c = c
+        self.n = 0
+        self.niveles = [np.empty(0)]
+        self._rng = np.random.default_rng(semilla)
+
+    def error_rango(self):
+        """Error normalizado de rango esperado (fracción de filas)"""
+        return _KLL_COEF / self.k ** _KLL_EXP
+
+    def _capacidad(self, nivel):
+        altura = len(self.niveles)
+        return max(2, int(np.ceil(self.k * self.c ** (altura - nivel - 1))))
+
+    def _compactar(self):
+        hubo_cambios = True
+        while hubo_cambios:
+            hubo_cambios = False
+            for nivel in range(len(self.niveles)):
+                buffer = self.niveles[nivel]
+                if len(buffer) <= self._capacidad(nivel):
+                    continue
+
+                if nivel + 1 == len(self.niveles):
+                    self.niveles.append(np.empty(0))
+
+                buffer = np.sort(buffer)
+                # Con longitud impar un elemento queda en el nivel actual
+                resto = buffer[len(buffer) - len(buffer) % 2:]
+                pares = buffer[:len(buffer) - len(buffer) % 2]
+                promovidos = pares[self._rng.integers(2)::2]
+
+                self.niveles[nivel] = resto
+                self.niveles[nivel + 1] = np.concatenate([self.niveles[nivel + 1], promovidos])
+                hubo_cambios = True
+
+    def actualizar(self, valores):
+        """Añade un bloque de valores (los NaN se ignoran)"""
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        valores = valores[~np.isnan(valores)]
+        if len(valores) == 0:
+            return
+        self.n += len(valores)
+        self.niveles[0] = np.concatenate([self.niveles[0], valores])
+        self._compactar()
+
+    def fusionar(self, otro):
+        """Combina otro sketch en este (in-place) y retorna self"""
+        while len(self.niveles) < len(otro.niveles):
+            self.niveles.append(np.empty(0))
+        for nivel, buffer in enumerate(otro.niveles):
+            self.niveles[nivel] = np.concatenate([self.niveles[nivel], buffer])
+        self.n += otro.n
+        self._compactar()
+        return self
+
+    def cuantiles(self, qs):
+        """
+        Retorna los valores aproximados de los cuantiles qs (entre 0 y 1).
+        """
+        if self.n == 0:
+            raise ValueError("El sketch está vacío")
+
+        valores = np.concatenate(self.niveles)
+        pesos = np.concatenate([np.full(len(b), 2.0 ** h) for h, b in enumerate(self.niveles)])
+        orden = np.argsort(valores, kind='stable')
+        valores = valores[orden]
+        acumulado = np.cumsum(pesos[orden])
+
+        qs = np.atleast_1d(np.asarray(qs, dtype=np.float64))
+        posiciones = np.searchsorted(acumulado, qs * acumulado[-1], side='left')
+        return valores[np.clip(posiciones, 0, len(valores) - 1)]
+
+
+def _leer_bloques(ruta_entrada, chunksize):
+    return pd.read_csv(ruta_entrada, chunksize=chunksize)
+
+
+def particionar_csv_streaming(ruta_entrada, carpeta_salida="data", criterion="target_y",
+                              porcentajes=PORCENTAJES_PARTICIONES, chunksize=100_000,
+                              epsilon=0.005, semilla=42):
+    """
+    Genera las particiones B/W de un CSV que no cabe en memoria.
+
+    Primera pasada: construye un sketch KLL de la columna criterio y obtiene
+    los cortes de cada fracción. Segunda pasada: recorre de nuevo el archivo y
+    escribe cada fila en todas las particiones a las que pertenece.
+
+    Parámetros:
+    - ruta_entrada: CSV de entrada (ej. 'data/df_original.csv')
+    - carpeta_salida: carpeta donde se escriben B2C.csv, W2C.csv, ...
+    - criterion: columna por la cual se particiona
+    - porcentajes: fracciones de cada partición (0.5, 0.25, ...)
+    - chunksize: filas por bloque leído
+    - epsilon: error normalizado de rango admitido en los cortes
+    - semilla: semilla del sketch (compactaciones aleatorias)
+
+    Retorna:
+    - DataFrame con el resumen por partición: corte, filas obtenidas, filas
+      objetivo y error de rango real medido en la segunda pasada
+
+    Las filas de cada partición se escriben en el orden de lectura (no
+    ordenadas por el criterio).
+    """
+    if not os.path.exists(carpeta_salida):
+        os.makedirs(carpeta_salida)
+
+    # Primera pasada: sketch de cuantiles
+    sketch = SketchKLL(k=k_para_error(epsilon), semilla=semilla)
+    total_filas = 0
+    for bloque in _leer_bloques(ruta_entrada, chunksize):
+        sketch.actualizar(bloque[criterion].to_numpy())
+        total_filas += len(bloque)
+
+    print(f"Primera pasada completada: {total_filas} filas, "
+          f"error de rango esperado <= {sketch.error_rango():.4%}")
+
+    cortes = {}
+    for porc in validar_escalera(porcentajes):
+        corte_b, corte_w = sketch.cuantiles([1 - porc, porc])
+        cortes[nombre_particion('B', porc)] = ('B', porc, corte_b)
+        cortes[nombre_particion('W', porc)] = ('W', porc, corte_w)
+
+    # Segunda pasada: escribir todas las particiones a la vez
+    rutas = {nombre: os.path.join(carpeta_salida, f"{nombre}.csv") for nombre in cortes}
+    conteos = {nombre: 0 for nombre in cortes}
+    for ruta in rutas.values():
+        if os.path.exists(ruta):
+            os.remove(ruta)
+
+    for bloque in _leer_bloques(ruta_entrada, chunksize):
+        valores = bloque[criterion].to_numpy()
+        for nombre, (lado, porc, corte) in cortes.items():
+            mascara = valores >= corte if lado == 'B' else valores <= corte
+            filas = bloque[mascara]
+            if len(filas) == 0:
+                continue
+            filas.to_csv(rutas[nombre], mode='a', index=False, header=conteos[nombre] == 0)
+            conteos[nombre] += len(filas)
+
+    resumen = []
+    for nombre, (lado, porc, corte) in cortes.items():
+        objetivo = int(total_filas * porc)
+        resumen.append({
+            'particion': nombre,
+            'corte': corte,
+            'filas': conteos[nombre],
+            'filas_objetivo': objetivo,
+            'error_rango': abs(conteos[nombre] - objetivo) / total_filas if total_filas else 0.0,
+            'error_rango_esperado': sketch.error_rango(),
+            'archivo': rutas[nombre]
+        })
+        print(f"  {nombre}: corte={corte:.6f}, filas={conteos[nombre]} (objetivo {objetivo})")
+
+    return pd.DataFrame(resumen)
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("PARTICIONAMIENTO B/W POR STREAMING (FUERA DE MEMORIA)")
+    print("=" * 70)
+
+    # CONFIGURACIÓN
+    RUTA_ENTRADA = 'data/df_original.csv'
+    CARPETA_SALIDA = 'data'
+    EPSILON = 0.005       # Error de rango admitido en los cortes (0.5%)
+    CHUNKSIZE = 100_000   # Filas por bloque
+
+    df_resumen = particionar_csv_streaming(RUTA_ENTRADA, CARPETA_SALIDA,
+                                           epsilon=EPSILON, chunksize=CHUNKSIZE)
+    print(df_resumen.to_string(index=False))
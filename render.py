@@ -0,0 +1,256 @@
+# render.py
+import numpy as np
+import pandas as pd
+import networkx as nx
+import multiprocessing
+import contextlib
+import hashlib
+import inspect
+import json
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from grafo_csr import GrafoCSR
+
+# Niveles de resolución y formato de las figuras
+NIVELES_RENDER = {
+    'borrador': {'dpi': 72, 'formato': 'png'},
+    'normal': {'dpi': 150, 'formato': 'png'},
+    'publicacion': {'dpi': 300, 'formato': 'png'},
+    'vectorial': {'dpi': 300, 'formato': 'svg'}
+}
+
+# Índice de figuras generadas (archivo -> huella del último trabajo que lo escribió)
+CARPETA_RENDER = 'cache_render'
+ARCHIVO_INDICE = 'indice.json'
+
+
+class TrabajoRender:
+    """
+    Una figura por generar: una función visualizar_* de algún módulo del
+    proyecto con sus argumentos. La función debe aceptar mostrar, dpi y
+    formato y retornar la ruta del archivo que guarda.
+    """
+
+    def __init__(self, funcion, args=(), kwargs=None, descripcion=None):
+        self.funcion = funcion
+        self.args = tuple(args)
+        self.kwargs = dict(kwargs or {})
+        if descripcion is None:
+            nombre = next((a for a in self.args if isinstance(a, str)), '')
+            descripcion = f"{funcion.__name__}({nombre})"
+        self.descripcion = descripcion
+
+
+def _actualizar_huella(h, objeto):
+    """Agrega el contenido de un argumento de render al hash"""
+    if isinstance(objeto, nx.Graph):
+        h.update(type(objeto).__name__.encode())
+        h.update(repr(list(objeto.nodes(data=True))).encode())
+        h.update(repr(list(objeto.edges(data=True))).encode())
+    elif isinstance(objeto, GrafoCSR):
+        h.update(repr(objeto.etiquetas.tolist()).encode())
+        for arreglo in (objeto.indptr, objeto.indices, objeto.weight, objeto.distance):
+            h.update(np.ascontiguousarray(arreglo).data)
+    elif isinstance(objeto, np.ndarray):
+        h.update(f"{objeto.dtype.str}{objeto.shape}".encode())
+        h.update(np.ascontiguousarray(objeto).data)
+    elif isinstance(objeto, (pd.DataFrame, pd.Series)):
+        h.update(repr(list(getattr(objeto, 'columns', [objeto.name]))).encode())
+        h.update(pd.util.hash_pandas_object(objeto, index=True).to_numpy().data)
+    elif isinstance(objeto, dict):
+        h.update(b'{')
+        for clave in sorted(objeto, key=repr):
+            h.update(repr(clave).encode())
+            _actualizar_huella(h, objeto[clave])
+        h.update(b'}')
+    elif isinstance(objeto, (list, tuple, set, frozenset)):
+        h.update(type(objeto).__name__.encode())
+        for elemento in (sorted(objeto, key=repr) if isinstance(objeto, (set, frozenset)) else objeto):
+            _actualizar_huella(h, elemento)
+    else:
+        h.update(repr(objeto).encode())
+
+
+def _archivos_proyecto(modulo, carpeta, archivos):
+    """
+    Archivos .py de la carpeta del proyecto de los que depende un módulo: el
+    propio módulo y, recursivamente, los módulos del proyecto que importa
+    (por ejemplo cache_layout para las funciones visualizar_*)
+    """
+    ruta = getattr(modulo, '__file__', None)
+    if not ruta or os.path.dirname(os.path.abspath(ruta)) != carpeta or ruta in archivos:
+        return
+    archivos.add(ruta)
+    for valor in list(vars(modulo).values()):
+        if inspect.ismodule(valor):
+            dependencia = valor
+        else:
+            dependencia = sys.modules.get(getattr(valor, '__module__', None) or '')
+        if dependencia is not None:
+            _archivos_proyecto(dependencia, carpeta, archivos)
+
+
+def huella_codigo(funcion):
+    """
+    Hash del código del que depende una función de render: el fuente de su
+    módulo y de los módulos del proyecto que este importa. Editar un
+    auxiliar (cache_layout.posiciones, un visualizar_* llamado por otro)
+    invalida las figuras.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{funcion.__module__}.{funcion.__qualname__}".encode())
+    modulo = sys.modules.get(funcion.__module__)
+    ruta = getattr(modulo, '__file__', None)
+    if ruta is None:
+        try:
+            h.update(inspect.getsource(funcion).encode())
+        except (OSError, TypeError):
+            pass
+        return h.hexdigest()
+    archivos = set()
+    _archivos_proyecto(modulo, os.path.dirname(os.path.abspath(ruta)), archivos)
+    for archivo in sorted(archivos):
+        h.update(os.path.basename(archivo).encode())
+        with open(archivo, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def huella_trabajo(trabajo, opciones, codigo=None):
+    """
+    Hash blake2b de un trabajo: código del que depende la función (ver
+    huella_codigo), contenido de los argumentos y opciones de render
+    (resolución y formato).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update((codigo or huella_codigo(trabajo.funcion)).encode())
+    _actualizar_huella(h, trabajo.args)
+    _actualizar_huella(h, opciones)
+    return h.hexdigest()
+
+
+def _inicializar_proceso():
+    """Los procesos de render usan el backend Agg (sin ventanas)"""
+    os.environ['MPLBACKEND'] = 'Agg'
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _ejecutar_trabajo(funcion, args, opciones):
+    """
+    Ejecuta un trabajo y retorna (ruta, segundos, salida). La salida por
+    consola se captura para no mezclar la de varios procesos.
+    """
+    import matplotlib.pyplot as plt
+    inicio = time.perf_counter()
+    salida = io.StringIO()
+    with contextlib.redirect_stdout(salida):
+        ruta = funcion(*args, **opciones)
+    plt.close('all')
+    return ruta, time.perf_counter() - inicio, salida.getvalue()
+
+
+def _leer_indice(ruta_indice):
+    if not os.path.exists(ruta_indice):
+        return {}
+    try:
+        with open(ruta_indice, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _guardar_indice(indice, ruta_indice):
+    carpeta = os.path.dirname(ruta_indice)
+    if carpeta and not os.path.exists(carpeta):
+        os.makedirs(carpeta)
+    temporal = f"{ruta_indice}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(indice, f, indent=2, ensure_ascii=False)
+    os.replace(temporal, ruta_indice)
+
+
+def renderizar(trabajos, nivel='publicacion', n_procesos=None, forzar=False,
+               ruta_indice=os.path.join(CARPETA_RENDER, ARCHIVO_INDICE)):
+    """
+    Genera las figuras de una lista de TrabajoRender en paralelo, sin
+    ventanas (backend Agg) y sin bloquear la ejecución.
+
+    El índice guarda, por archivo de salida, la huella (código, datos y
+    opciones) del último trabajo que lo escribió y su fecha de modificación.
+    Un trabajo se omite solo si es ese último trabajo y el archivo no cambió
+    desde entonces; si otro trabajo sobrescribió la ruta, se regenera.
+
+    Parámetros:
+    - nivel: 'borrador', 'normal', 'publicacion' o 'vectorial' (NIVELES_RENDER)
+    - n_procesos: procesos de render (None = todos los núcleos; 1 = en este proceso)
+    - forzar: regenerar aunque la huella no haya cambiado
+
+    Retorna:
+    - DataFrame con una fila por trabajo: descripcion, estado
+      ('generada', 'omitida' o 'error'), ruta y segundos
+    """
+    if nivel not in NIVELES_RENDER:
+        raise ValueError(f"nivel debe ser uno de: {', '.join(NIVELES_RENDER)}")
+
+    indice = _leer_indice(ruta_indice)
+    # Huella -> archivo que escribió por última vez (solo entradas vigentes)
+    escritas = {entrada['huella']: ruta for ruta, entrada in indice.items()
+                if isinstance(entrada, dict) and 'huella' in entrada}
+    codigos = {}
+    resultados = []
+    pendientes = []
+    for trabajo in trabajos:
+        opciones = {**trabajo.kwargs, **NIVELES_RENDER[nivel], 'mostrar': False}
+        if trabajo.funcion not in codigos:
+            codigos[trabajo.funcion] = huella_codigo(trabajo.funcion)
+        huella = huella_trabajo(trabajo, opciones, codigos[trabajo.funcion])
+        ruta = escritas.get(huella)
+        if not forzar and ruta and os.path.exists(ruta) and \
+                indice[ruta].get('mtime') == os.path.getmtime(ruta):
+            resultados.append({'descripcion': trabajo.descripcion, 'estado': 'omitida',
+                               'ruta': ruta, 'segundos': 0.0})
+        else:
+            pendientes.append((trabajo, opciones, huella))
+
+    print(f"Render: {len(pendientes)} figuras por generar, "
+          f"{len(trabajos) - len(pendientes)} sin cambios (nivel '{nivel}')")
+
+    def registrar(trabajo, huella, futuro_o_resultado):
+        try:
+            ruta, segundos, _ = futuro_o_resultado()
+            ruta = os.path.normpath(ruta)
+            indice[ruta] = {'huella': huella, 'descripcion': trabajo.descripcion,
+                            'mtime': os.path.getmtime(ruta), 'fecha': time.time()}
+            resultados.append({'descripcion': trabajo.descripcion, 'estado': 'generada',
+                               'ruta': ruta, 'segundos': segundos})
+            print(f"  {trabajo.descripcion}: {ruta} ({segundos:.1f} s)")
+        except Exception as e:
+            resultados.append({'descripcion': trabajo.descripcion, 'estado': 'error',
+                               'ruta': None, 'segundos': 0.0})
+            print(f"  {trabajo.descripcion}: ERROR {e}")
+
+    n_procesos = min(n_procesos or os.cpu_count() or 1, max(len(pendientes), 1))
+    if n_procesos <= 1:
+        for trabajo, opciones, huella in pendientes:
+            registrar(trabajo, huella,
+                      lambda: _ejecutar_trabajo(trabajo.funcion, trabajo.args, opciones))
+    elif pendientes:
+        # 'spawn': procesos nuevos sin el estado de matplotlib del proceso principal
+        contexto = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=n_procesos, mp_context=contexto,
+                                 initializer=_inicializar_proceso) as ejecutor:
+            futuros = {
+                ejecutor.submit(_ejecutar_trabajo, trabajo.funcion, trabajo.args, opciones):
+                    (trabajo, huella)
+                for trabajo, opciones, huella in pendientes
+            }
+            for futuro in as_completed(futuros):
+                trabajo, huella = futuros[futuro]
+                registrar(trabajo, huella, futuro.result)
+
+    _guardar_indice(indice, ruta_indice)
+    return pd.DataFrame(resultados, columns=['descripcion', 'estado', 'ruta', 'segundos'])
@@ -3,8 +3,9 @@ import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 from alg import df_quartile
+from columnar import cargar_tabla
 
-def seleccionar_cuartil(df, columna_objetivo, porc=0.5, quartile="first", ascending=True):
+def seleccionar_cuartil(df, columna_objetivo, porc=0.5, quartile="first", ascending=True, metodo="orden"):
     """
     Selecciona y retorna un cuartil/segmento del DataFrame usando df_quartile.
 
@@ -14,11 +15,13 @@ def seleccionar_cuartil(df, columna_objetivo, porc=0.5, quartile="first", ascend
     - porc: porcentaje del segmento (por defecto 0.25 = 25%)
     - quartile: cuartil a seleccionar ('first', 'second', 'third', 'fourth', 'center')
     - ascending: ordenar ascendente o descendente (True/False)
+    - metodo: 'orden' (ordenamiento completo) o 'seleccion' (selección parcial O(n))
 
     Retorna:
     - DataFrame con el segmento seleccionado
     """
-    return df_quartile(df, criterion=columna_objetivo, porc=porc, quartile=quartile, ascending=ascending)
+    return df_quartile(df, criterion=columna_objetivo, porc=porc, quartile=quartile, ascending=ascending,
+                       metodo=metodo)
 
 
 def graficar_cuartiles(df_original, df_cuartil, columna_objetivo='target_y', label_cuartil='Cuartil seleccionado'):
@@ -46,7 +49,7 @@ def graficar_cuartiles(df_original, df_cuartil, columna_objetivo='target_y', lab
 if __name__ == "__main__":
     # Ejemplo básico para probar
     #df = pd.read_csv('data/B2C.csv')
-    df = pd.read_csv('data/df_original.csv')
+    df = cargar_tabla('data/df_original.csv')
 
     # Seleccionar el cuartil 
     #cuartil = seleccionar_cuartil(df, 'y', porc=0.0625, quartile='first', ascending=True)
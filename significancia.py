@@ -0,0 +1,205 @@
+# significancia.py
+import numpy as np
+import pandas as pd
+import os
+from scipy.stats import rankdata
+from concurrent.futures import ProcessPoolExecutor
+from correlacion_dispersa import fuentes_columnas, medias_normas, estandarizar_columnas, peso_arista
+
+# Tipos de remuestreo disponibles
+TIPOS_REMUESTREO = ('permutacion', 'bootstrap')
+
+# Medidas cuya significancia se puede estimar (Spearman = Pearson sobre rangos)
+MEDIDAS_SIGNIFICANCIA = ('pearson', 'spearman')
+
+# Memoria máxima por lote de remuestreos (bytes)
+MEMORIA_REMUESTREO = 512 * 2**20
+
+
+def _tam_lote(n, p, tipo, memoria_max):
+    """
+    Remuestreos por lote: cada uno ocupa una copia (n, p) de los datos
+    (dos en bootstrap, por el centrado) más su matriz p x p.
+    """
+    copias = 1 if tipo == 'permutacion' else 2
+    por_remuestreo = 8 * (copias * n * p + p * p)
+    return max(1, int(memoria_max // por_remuestreo))
+
+
+def _correlaciones_lote(z, indices, tipo):
+    """
+    Matrices de correlación (b, p, p) de un lote de remuestreos con un solo
+    producto matricial por lotes.
+
+    - permutacion: se permutan las filas de todas las columnas a la vez y
+      se correlacionan contra los datos originales; cada par (i, j) con
+      i != j recibe una muestra de su distribución nula.
+    - bootstrap: se toman las filas con reemplazo y se recalcula la
+      correlación (centrado y normas de cada remuestreo).
+    """
+    remuestreo = z[indices]
+    if tipo == 'permutacion':
+        # z ya tiene media 0 y norma 1 y la permutación no las cambia
+        return np.matmul(remuestreo.transpose(0, 2, 1), z)
+
+    remuestreo -= remuestreo.mean(axis=1, keepdims=True)
+    productos = np.matmul(remuestreo.transpose(0, 2, 1), remuestreo)
+    normas = np.sqrt(np.einsum('bii->bi', productos))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return productos / (normas[:, :, None] * normas[:, None, :])
+
+
+def _procesar_lotes(z, tipo, tamanos, semillas, i, j, peso_observado, metodo):
+    """
+    Procesa una serie de lotes de remuestreos (trabajo de un proceso).
+
+    Retorna, para los pares (i, j):
+    - permutacion: cuántos remuestreos alcanzan el peso observado
+    - bootstrap: las correlaciones de cada remuestreo (B, n_pares)
+    """
+    n = z.shape[0]
+    conteo = np.zeros(len(i), dtype=np.int64)
+    muestras = []
+    for tamano, semilla in zip(tamanos, semillas):
+        rng = np.random.default_rng(semilla)
+        if tipo == 'permutacion':
+            indices = rng.permuted(np.broadcast_to(np.arange(n), (tamano, n)), axis=1)
+        else:
+            indices = rng.integers(0, n, size=(tamano, n))
+
+        r = _correlaciones_lote(z, indices, tipo)[:, i, j]
+        if tipo == 'permutacion':
+            # Tolerancia relativa para no perder empates por redondeo
+            conteo += (peso_arista(r, metodo) >= peso_observado - 1e-12).sum(axis=0)
+        else:
+            muestras.append(r)
+
+    if tipo == 'permutacion':
+        return conteo
+    return np.concatenate(muestras) if muestras else np.empty((0, len(i)))
+
+
+def _indices_pares(pares, etiquetas):
+    """Índices (i, j) de los pares pedidos; por defecto todos los i < j"""
+    if pares is None:
+        return np.triu_indices(len(etiquetas), k=1)
+    posicion = {etiqueta: k for k, etiqueta in enumerate(etiquetas)}
+    i = np.array([posicion[a] for a, b in pares], dtype=np.int64)
+    j = np.array([posicion[b] for a, b in pares], dtype=np.int64)
+    return i, j
+
+
+def significancia_correlacion(datos, n_remuestreos=1000, tipo='permutacion', pares=None,
+                              metodo='absoluta', alfa=0.05, columnas=None, semilla=42,
+                              memoria_max=MEMORIA_REMUESTREO, n_procesos=1, medida='pearson'):
+    """
+    Significancia de las correlaciones de Pearson (o Spearman) por
+    remuestreo, sin bucles por par ni por remuestreo.
+
+    Los remuestreos se generan por lotes cuyo tamaño respeta memoria_max y
+    cada lote se resuelve con un producto matricial por lotes (b, p, n) @
+    (n, p), del que solo se conservan los pares pedidos.
+
+    - permutacion: p-valor empírico (1 + #{peso_b >= peso}) / (B + 1),
+      con peso = |r| ('absoluta', bilateral) o r ('directa', unilateral)
+    - bootstrap: intervalo de confianza percentil (1 - alfa) de r
+
+    Parámetros:
+    - datos: DataFrame, carpeta columnar o dict de arrays
+    - n_remuestreos: número de permutaciones o remuestreos bootstrap (B)
+    - tipo: 'permutacion' o 'bootstrap'
+    - pares: lista de pares (columna_i, columna_j); None = todos los pares
+      (por ejemplo las aristas de grafo.matriz_a_grafo)
+    - metodo: 'absoluta' o 'directa', como en grafo.py
+    - alfa: nivel para 'significativa' y para el intervalo
+    - semilla: los resultados no dependen de n_procesos
+    - memoria_max: memoria máxima por lote (bytes)
+    - n_procesos: procesos entre los que se reparten los lotes
+    - medida: 'pearson' o 'spearman' (MEDIDAS_SIGNIFICANCIA); con
+      'spearman' se remuestrean los rangos de la muestra completa (exacto
+      para la permutación, aproximado en bootstrap)
+
+    Los NaN se reemplazan por la media de su columna (como en
+    correlacion_dispersa.py).
+
+    Retorna:
+    - DataFrame con una fila por par: origen, destino, r y p_valor
+      (permutacion) o ic_inferior/ic_superior (bootstrap), más la columna
+      booleana 'significativa'
+    """
+    if tipo not in TIPOS_REMUESTREO:
+        raise ValueError(f"tipo debe ser uno de {TIPOS_REMUESTREO}")
+    if medida not in MEDIDAS_SIGNIFICANCIA:
+        raise ValueError(f"medida debe ser una de {MEDIDAS_SIGNIFICANCIA}")
+    peso_arista(np.zeros(1), metodo)
+
+    fuentes = fuentes_columnas(datos, columnas)
+    if medida == 'spearman':
+        fuentes = {col: rankdata(np.asarray(x, dtype=np.float64), nan_policy='omit')
+                   for col, x in fuentes.items()}
+    etiquetas = list(fuentes)
+    medias, normas = medias_normas(fuentes, etiquetas)
+    z = estandarizar_columnas(fuentes, etiquetas, medias, normas, np.float64)
+    n, p = z.shape
+
+    i, j = _indices_pares(pares, etiquetas)
+    r = np.clip(np.einsum('ki,ki->i', z[:, i], z[:, j]), -1.0, 1.0)
+    peso_observado = peso_arista(r, metodo)
+
+    # Lotes fijos con semillas independientes: el resultado es el mismo
+    # con cualquier número de procesos
+    tam_lote = _tam_lote(n, p, tipo, memoria_max)
+    tamanos = [min(tam_lote, n_remuestreos - inicio) for inicio in range(0, n_remuestreos, tam_lote)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+
+    n_procesos = min(n_procesos or os.cpu_count() or 1, max(len(tamanos), 1))
+    if n_procesos > 1:
+        grupos = [slice(k, None, n_procesos) for k in range(n_procesos)]
+        with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+            parciales = list(ejecutor.map(
+                _procesar_lotes, [z] * n_procesos, [tipo] * n_procesos,
+                [tamanos[g] for g in grupos], [semillas[g] for g in grupos],
+                [i] * n_procesos, [j] * n_procesos, [peso_observado] * n_procesos,
+                [metodo] * n_procesos))
+    else:
+        parciales = [_procesar_lotes(z, tipo, tamanos, semillas, i, j, peso_observado, metodo)]
+
+    resultado = pd.DataFrame({
+        'origen': [etiquetas[a] for a in i],
+        'destino': [etiquetas[b] for b in j],
+        'r': r
+    })
+    if tipo == 'permutacion':
+        conteo = np.sum(parciales, axis=0)
+        resultado['p_valor'] = (1 + conteo) / (n_remuestreos + 1)
+        resultado['significativa'] = resultado['p_valor'] <= alfa
+    else:
+        muestras = np.concatenate(parciales)
+        resultado['ic_inferior'] = np.nanpercentile(muestras, 100 * alfa / 2, axis=0)
+        resultado['ic_superior'] = np.nanpercentile(muestras, 100 * (1 - alfa / 2), axis=0)
+        resultado['significativa'] = (resultado['ic_inferior'] > 0) | (resultado['ic_superior'] < 0)
+    return resultado
+
+
+if __name__ == "__main__":
+    from correlacion import cargar_datasets_directo
+
+    print("=" * 70)
+    print("SIGNIFICANCIA DE CORRELACIONES POR REMUESTREO")
+    print("=" * 70)
+
+    # CONFIGURACIÓN
+    DATASETS_A_ANALIZAR = ['df_original']  # Lista vacía = todos los disponibles
+    TIPO = 'permutacion'   # 'permutacion' o 'bootstrap'
+    N_REMUESTREOS = 1000
+    METODO = 'directa'     # 'absoluta' o 'directa'
+    N_PROCESOS = 1
+
+    dataframes = cargar_datasets_directo()
+    for nombre, df in dataframes.items():
+        if DATASETS_A_ANALIZAR and nombre not in DATASETS_A_ANALIZAR:
+            continue
+        resultado = significancia_correlacion(df, n_remuestreos=N_REMUESTREOS, tipo=TIPO,
+                                              metodo=METODO, n_procesos=N_PROCESOS)
+        print(f"\n{nombre}: {resultado['significativa'].sum()} de {len(resultado)} pares significativos")
+        print(resultado.sort_values('r', key=np.abs, ascending=False).head(20).round(4).to_string(index=False))
@@ -0,0 +1,103 @@
+# test_alg.py
+import numpy as np
+import pandas as pd
+import pytest
+from alg import (df_quartile, MotorParticiones, seleccionar_segmento, particionar, _limites_segmento,
+                 PORCENTAJES_PARTICIONES, nombres_escalera, fraccion_particion, nombre_particion,
+                 escalera_potencias)
+
+CUARTILES = ('first', 'second', 'third', 'fourth', 'center')
+NOMBRES = nombres_escalera(PORCENTAJES_PARTICIONES + (0.3,))
+
+
+def _df_quartile_sort_values(df, criterion, porc=0.25, quartile="first", ascending=True):
+    """Implementación histórica de df_quartile (sort_values completo por llamada)"""
+    total_filas = len(df)
+    inicio, fin = _limites_segmento(total_filas, porc, quartile)
+    df_ordenado = df.sort_values(by=criterion, ascending=ascending).reset_index(drop=True)
+    if inicio < fin:
+        return df_ordenado.iloc[inicio:fin].copy()
+    return pd.DataFrame(columns=df.columns)
+
+
+def _datos(tipo, n=203, semilla=0):
+    rng = np.random.default_rng(semilla)
+    if tipo == 'continuo':
+        target = rng.normal(size=n)
+    elif tipo == 'empates':
+        target = rng.integers(0, 5, size=n)
+    else:
+        target = rng.normal(size=n)
+        target[rng.random(n) < 0.2] = np.nan
+    return pd.DataFrame({'x_1': rng.normal(size=n), 'x_2': np.arange(n), 'target_y': target},
+                        index=rng.permutation(n) + 1000)
+
+
+def _comparar(obtenido, esperado, tipo):
+    pd.testing.assert_index_equal(obtenido.index, esperado.index)
+    if tipo == 'empates':
+        # Entre filas empatadas el orden no está definido (sort_values no es
+        # estable): basta con que coincidan los valores del criterio
+        np.testing.assert_array_equal(obtenido['target_y'].to_numpy(), esperado['target_y'].to_numpy())
+    else:
+        pd.testing.assert_frame_equal(obtenido, esperado)
+
+
+@pytest.mark.parametrize('tipo', ['continuo', 'empates', 'nan'])
+@pytest.mark.parametrize('quartile', CUARTILES)
+@pytest.mark.parametrize('nombre', NOMBRES)
+def test_igual_que_sort_values(nombre, quartile, tipo):
+    df = _datos(tipo)
+    porc = fraccion_particion(nombre)
+    ascending = nombre[0] == 'W'
+    esperado = _df_quartile_sort_values(df, 'target_y', porc, quartile, ascending)
+
+    motor = MotorParticiones(df, 'target_y')
+    _comparar(df_quartile(df, 'target_y', porc, quartile, ascending), esperado, tipo)
+    _comparar(motor.segmento(porc, quartile, ascending), esperado, tipo)
+    _comparar(df_quartile(df, 'target_y', porc, quartile, ascending, metodo='seleccion'),
+              esperado, tipo)
+    seleccion = seleccionar_segmento(df, 'target_y', porc, quartile, ascending, ordenar=False)
+    assert sorted(seleccion['target_y'].fillna(np.inf)) == sorted(esperado['target_y'].fillna(np.inf))
+
+
+@pytest.mark.parametrize('n', [0, 1, 7, 8, 10])
+@pytest.mark.parametrize('quartile', CUARTILES)
+def test_tablas_pequenas(n, quartile):
+    df = _datos('continuo', n=n, semilla=n)
+    for ascending in (True, False):
+        esperado = _df_quartile_sort_values(df, 'target_y', 0.25, quartile, ascending)
+        assert len(df_quartile(df, 'target_y', 0.25, quartile, ascending)) == len(esperado)
+        assert len(df_quartile(df, 'target_y', 0.25, quartile, ascending, metodo='seleccion')) == len(esperado)
+
+
+def test_cuarto_desplazado_una_fila():
+    # Aritmética histórica: 'fourth' empieza en 3q + 1 y termina en 4q inclusive
+    assert _limites_segmento(10, 0.25, 'fourth') == (7, 9)
+    assert _limites_segmento(8, 0.25, 'cuarto') == (7, 8)
+    assert _limites_segmento(12, 0.25, 'third') == (6, 9)
+    df = pd.DataFrame({'target_y': np.arange(10.0)})
+    assert df_quartile(df, 'target_y', quartile='fourth')['target_y'].tolist() == [7.0, 8.0]
+    assert df_quartile(df, 'target_y', quartile='fourth', metodo='seleccion')['target_y'].tolist() == [7.0, 8.0]
+
+
+def test_particiones_son_prefijos_del_orden():
+    df = _datos('nan')
+    motor = MotorParticiones(df, 'target_y')
+    escalera = escalera_potencias(6)
+    posiciones = motor.particiones(escalera)
+    segmentos = particionar(df, 'target_y', escalera)
+    for porc in escalera:
+        for lado, ascending in (('B', False), ('W', True)):
+            nombre = nombre_particion(lado, porc)
+            esperado = _df_quartile_sort_values(df, 'target_y', porc, 'first', ascending)
+            pd.testing.assert_frame_equal(segmentos[nombre], esperado)
+            np.testing.assert_array_equal(df['x_2'].to_numpy()[posiciones[nombre]], esperado['x_2'].to_numpy())
+
+
+def test_parametros_invalidos():
+    df = _datos('continuo')
+    with pytest.raises(ValueError):
+        df_quartile(df, 'target_y', quartile='quinto')
+    with pytest.raises(ValueError):
+        df_quartile(df, 'target_y', metodo='otro')
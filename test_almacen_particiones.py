@@ -0,0 +1,30 @@
+# test_almacen_particiones.py
+import numpy as np
+import pandas as pd
+from alg import df_quartile, nombres_escalera, fraccion_particion
+from almacen_particiones import guardar_almacen, cargar_particion, cargar_almacen
+
+
+def _datos(n=203, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return pd.DataFrame({'x_1': rng.normal(size=n), 'x_2': rng.normal(size=n),
+                         'target_y': rng.normal(size=n)})
+
+
+def test_df_original_en_orden_original(tmp_path):
+    df = _datos()
+    guardar_almacen(df, carpeta=str(tmp_path))
+    pd.testing.assert_frame_equal(cargar_particion('df_original', str(tmp_path)), df)
+
+    ordenado = cargar_particion('df_original', str(tmp_path), orden_original=False)
+    assert ordenado['target_y'].is_monotonic_decreasing
+
+
+def test_particiones_igual_que_df_quartile(tmp_path):
+    df = _datos()
+    guardar_almacen(df, carpeta=str(tmp_path))
+    particiones = cargar_almacen(str(tmp_path))
+    for nombre in nombres_escalera():
+        esperado = df_quartile(df, 'target_y', porc=fraccion_particion(nombre),
+                               quartile='first', ascending=nombre[0] == 'W')
+        np.testing.assert_array_equal(particiones[nombre].to_numpy(), esperado.to_numpy())
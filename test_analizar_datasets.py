@@ -0,0 +1,80 @@
+# test_analizar_datasets.py
+import os
+import numpy as np
+import pandas as pd
+from almacen_particiones import guardar_almacen
+from analizar_datasets import RegistroDatasets, bytes_propios
+
+
+def _datos(n=160, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return pd.DataFrame({'x_1': rng.normal(size=n), 'x_2': rng.normal(size=n),
+                         'target_y': rng.normal(size=n)})
+
+
+def _registro_almacen(tmp_path, **opciones):
+    guardar_almacen(_datos(), carpeta=str(tmp_path / 'almacen'))
+    return RegistroDatasets(str(tmp_path), **opciones)
+
+
+def test_carga_perezosa_desde_csv(tmp_path):
+    df = _datos()
+    df.to_csv(tmp_path / 'df_original.csv', index=False)
+    registro = RegistroDatasets(str(tmp_path))
+    assert registro.nombres() == ['df_original']
+    assert registro.fallos == 0
+    pd.testing.assert_frame_equal(registro['df_original'], pd.read_csv(tmp_path / 'df_original.csv'))
+    assert registro['df_original'] is registro['df_original']
+    assert (registro.fallos, registro.aciertos) == (1, 2)
+    assert os.path.isdir(tmp_path / 'columnar' / 'df_original')
+
+
+def test_desalojo_lru_por_entradas(tmp_path):
+    registro = _registro_almacen(tmp_path, max_entradas=2)
+    registro['B2C']
+    registro['W2C']
+    registro['B2C']          # W2C pasa a ser la menos usada
+    registro['B4C']
+    assert list(registro._cache) == ['B2C', 'B4C']
+    assert registro.desalojos == 1
+    registro['W2C']
+    assert registro.fallos == 4 and registro.aciertos == 1
+
+
+def test_columnas_mapeadas_no_cuentan(tmp_path):
+    # Las particiones del almacén son vistas de archivos mapeados: aunque
+    # max_bytes sea mínimo no se desaloja nada
+    registro = _registro_almacen(tmp_path, max_bytes=1)
+    for nombre in ('B2C', 'W2C', 'B4C'):
+        assert bytes_propios(registro[nombre]) == 0
+    assert list(registro._cache) == ['B2C', 'W2C', 'B4C']
+    assert registro.desalojos == 0
+
+
+def test_desalojo_lru_por_bytes_propios(tmp_path):
+    # Con la etiqueta cada entrada tiene una columna propia (no mapeada)
+    tamanos = {nombre: bytes_propios(df) for nombre, df in
+               _registro_almacen(tmp_path, max_bytes=None, con_etiqueta=True).items()}
+    assert all(tamano > 0 for tamano in tamanos.values())
+
+    registro = RegistroDatasets(str(tmp_path), con_etiqueta=True,
+                                max_bytes=tamanos['W4C'] + tamanos['B4C'])
+    registro['W4C']
+    registro['B4C']
+    assert registro.desalojos == 0
+    registro['W4C']
+    registro['B8C']
+    assert list(registro._cache) == ['W4C', 'B8C']
+    assert registro.desalojos == 1
+
+    # Una sola entrada mayor que el límite se conserva
+    registro['df_original']
+    assert list(registro._cache) == ['df_original']
+    assert registro['df_original']['Label'].iloc[0] == 'df'
+
+
+def test_df_original_propio_en_orden_original(tmp_path):
+    registro = _registro_almacen(tmp_path, max_bytes=None)
+    df = registro['df_original']
+    pd.testing.assert_frame_equal(df, _datos())
+    assert bytes_propios(df) == df.memory_usage(index=False).sum()
@@ -0,0 +1,83 @@
+# test_cache_correlacion.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from cache_correlacion import CacheCorrelacion, huella_dataframe, huella_archivo
+from correlacion import clave_cache
+
+
+def _datos(semilla=0):
+    x = np.random.default_rng(semilla).normal(size=(100, 5))
+    return pd.DataFrame(x, columns=[f'x_{i}' for i in range(5)])
+
+
+def test_clave_cambia_con_datos_y_parametros():
+    df = _datos()
+    clave = clave_cache(df, 'absoluta')
+    assert clave_cache(df.copy(), 'absoluta') == clave
+    # Columnas no numéricas no entran en la huella
+    assert clave_cache(df.assign(Label='B2C'), 'absoluta') == clave
+
+    modificado = df.copy()
+    modificado.iloc[50, 2] += 1e-12
+    assert clave_cache(modificado, 'absoluta') != clave
+    assert clave_cache(df.rename(columns={'x_0': 'y'}), 'absoluta') != clave
+    assert clave_cache(df.astype(np.float32), 'absoluta') != clave
+    assert clave_cache(df, 'directa') != clave
+    assert clave_cache(df, 'absoluta', medida='spearman') != clave
+
+
+def test_huella_archivo_cambia_al_reescribir(tmp_path):
+    ruta = tmp_path / 'B2C.csv'
+    _datos().to_csv(ruta, index=False)
+    antes = huella_archivo(ruta)
+    assert huella_archivo(ruta) == antes
+    _datos(semilla=1).to_csv(ruta, index=False)
+    os.utime(ruta, ns=(0, os.stat(ruta).st_mtime_ns + 1))
+    assert huella_archivo(ruta) != antes
+
+
+def test_acierto_entre_instancias_y_fallo_al_borrar(tmp_path):
+    carpeta = str(tmp_path / 'cache')
+    df = _datos()
+    matriz = 1 - df.corr().abs()
+    clave = CacheCorrelacion.clave(huella_dataframe(df), 'absoluta')
+
+    cache = CacheCorrelacion(carpeta)
+    assert cache.obtener(clave) is None
+    cache.guardar(clave, matriz, 'prueba')
+
+    otra = CacheCorrelacion(carpeta)
+    pd.testing.assert_frame_equal(otra.obtener(clave), matriz)
+    assert (otra.aciertos, otra.fallos) == (1, 0)
+
+    # Un archivo eliminado a mano invalida la entrada en lugar de fallar
+    os.remove(otra._archivos(clave)[0])
+    assert otra.obtener(clave) is None
+    assert clave not in otra._indice
+
+
+def test_desalojo_lru(tmp_path):
+    matrices = {f'm{i}': 1 - _datos(semilla=i).corr().abs() for i in range(3)}
+    cache = CacheCorrelacion(str(tmp_path / 'cache'), max_bytes=10**9)
+    for clave, matriz in matrices.items():
+        cache.guardar(clave, matriz)
+    tamano = cache._indice['m0']['bytes']
+
+    # Se usa m0, así que las menos recientes son m1 y luego m2
+    cache.obtener('m0')
+    cache.max_bytes = 2 * tamano
+    cache.guardar('m3', matrices['m2'])
+    assert set(cache._indice) == {'m0', 'm3'}
+    assert cache.desalojos == 2
+    for clave in ('m1', 'm2'):
+        assert not os.path.exists(cache._archivos(clave)[0])
+
+
+def test_limpiar(tmp_path):
+    cache = CacheCorrelacion(str(tmp_path / 'cache'))
+    cache.guardar('a', 1 - _datos().corr().abs())
+    cache.limpiar()
+    assert 'a' not in cache
+    assert CacheCorrelacion(str(tmp_path / 'cache')).obtener('a') is None
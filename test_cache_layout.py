@@ -0,0 +1,101 @@
+# test_cache_layout.py
+import json
+import os
+import networkx as nx
+import numpy as np
+import pytest
+import cache_layout
+from cache_layout import posiciones, clave_layout, _leer_indice
+
+
+def _iguales(a, b):
+    return a.keys() == b.keys() and all(np.allclose(a[n], b[n]) for n in a)
+
+
+def _entradas(carpeta):
+    return sorted(f[:-len('.npz')] for f in os.listdir(carpeta) if f.endswith('.npz'))
+
+
+def test_acierto_y_misma_posicion(tmp_path):
+    carpeta = str(tmp_path / 'cache_layout')
+    G = nx.karate_club_graph()
+    primero = posiciones(G, carpeta=carpeta, seed=1)
+    assert _iguales(posiciones(G, carpeta=carpeta, seed=1), primero)
+    assert len(_entradas(carpeta)) == 1
+    # Sin caché se obtiene el mismo layout (arranque en frío, reproducible)
+    assert _iguales(nx.spring_layout(G, seed=1), primero)
+
+
+def test_clave_cambia_con_grafo_pesos_y_parametros():
+    G = nx.karate_club_graph()
+    clave = clave_layout(G, 'spring', seed=1)
+    H = G.copy()
+    H.add_edge(0, 9)
+    P = G.copy()
+    P[0][1]['weight'] = 99
+    assert clave_layout(G.copy(), 'spring', seed=1) == clave
+    assert clave_layout(H, 'spring', seed=1) != clave
+    assert clave_layout(P, 'spring', seed=1) != clave
+    assert clave_layout(G, 'spring', seed=2) != clave
+    assert clave_layout(G, 'kamada_kawai', seed=1) != clave
+
+
+def test_arranque_tibio_opcional_y_registrado(tmp_path):
+    carpeta = str(tmp_path / 'cache_layout')
+    G = nx.karate_club_graph()
+    posiciones(G, carpeta=carpeta, seed=1)
+    H = G.copy()
+    H.remove_node(33)
+
+    # Solo con tibio=True se arranca desde el layout de G
+    tibio = posiciones(H, carpeta=carpeta, seed=1, tibio=True)
+    frio = posiciones(H, carpeta=carpeta, seed=1)
+    assert _iguales(frio, nx.spring_layout(H, seed=1))
+    assert not _iguales(tibio, frio)
+
+    # El layout tibio tiene su propia entrada y registra la de origen
+    descripciones = []
+    for clave in _entradas(carpeta):
+        with open(os.path.join(carpeta, f"{clave}.json")) as f:
+            descripciones.append(json.load(f))
+    origen = clave_layout(G, 'spring', seed=1)
+    assert sorted(d['arranque_desde'] or '' for d in descripciones) == ['', '', origen]
+    assert _iguales(posiciones(H, carpeta=carpeta, seed=1), frio)
+
+
+def test_indice_incremental(tmp_path):
+    carpeta = str(tmp_path / 'cache_layout')
+    for n in range(3, 8):
+        posiciones(nx.path_graph(n), carpeta=carpeta, seed=1)
+    indice = _leer_indice(carpeta)
+    assert sorted(indice) == _entradas(carpeta)
+    assert sorted(e['n_nodos'] for e in indice.values()) == list(range(3, 8))
+
+    # Una línea a medio escribir (otro proceso) se ignora hasta completarse
+    with open(os.path.join(carpeta, cache_layout.ARCHIVO_INDICE), 'a') as f:
+        f.write('{"clave": "incompleta"')
+    assert 'incompleta' not in _leer_indice(carpeta)
+    with open(os.path.join(carpeta, cache_layout.ARCHIVO_INDICE), 'a') as f:
+        f.write(', "algoritmo": "spring", "n_nodos": 1, "fecha": 0}\n')
+    assert 'incompleta' in _leer_indice(carpeta)
+
+
+def test_poda_al_pasar_el_limite(tmp_path):
+    carpeta = str(tmp_path / 'cache_layout')
+    for n in range(3, 13):
+        posiciones(nx.path_graph(n), carpeta=carpeta, seed=1, max_layouts=10)
+    # Hasta el límite no se poda
+    assert len(_entradas(carpeta)) == 10
+
+    posiciones(nx.path_graph(13), carpeta=carpeta, seed=1, max_layouts=10)
+    entradas = _entradas(carpeta)
+    assert len(entradas) == int(10 * cache_layout.FRACCION_PODA)
+    assert sorted(_leer_indice(carpeta)) == entradas
+    # Se conserva la más reciente y se eliminan las más antiguas
+    assert clave_layout(nx.path_graph(13), 'spring', seed=1) in entradas
+    assert clave_layout(nx.path_graph(3), 'spring', seed=1) not in entradas
+
+
+def test_algoritmo_invalido(tmp_path):
+    with pytest.raises(ValueError):
+        posiciones(nx.path_graph(3), 'otro', carpeta=str(tmp_path))
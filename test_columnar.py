@@ -0,0 +1,61 @@
+# test_columnar.py
+import os
+import numpy as np
+import pandas as pd
+from columnar import cargar_tabla, ruta_columnar, leer_esquema, ARCHIVO_ESQUEMA
+
+
+def _escribir_csv(ruta, semilla=0, n=120):
+    rng = np.random.default_rng(semilla)
+    df = pd.DataFrame({'x_1': rng.normal(size=n), 'x_2': rng.integers(0, 9, size=n).astype(float),
+                       'target_y': rng.normal(size=n)})
+    df.to_csv(ruta, index=False)
+    return pd.read_csv(ruta)
+
+
+def test_ida_y_vuelta_del_csv(tmp_path):
+    ruta = str(tmp_path / 'B2C.csv')
+    df = _escribir_csv(ruta)
+    cargado = cargar_tabla(ruta)
+    assert os.path.exists(os.path.join(ruta_columnar(ruta), ARCHIVO_ESQUEMA))
+    pd.testing.assert_frame_equal(cargado, df)
+    np.testing.assert_array_equal(cargar_tabla(ruta, ['target_y'], como='matriz').ravel(),
+                                  df['target_y'].to_numpy())
+
+
+def test_sin_csv_usa_la_version_columnar(tmp_path, capsys):
+    ruta = str(tmp_path / 'B2C.csv')
+    df = _escribir_csv(ruta)
+    cargar_tabla(ruta)
+    os.remove(ruta)
+    capsys.readouterr()
+    pd.testing.assert_frame_equal(cargar_tabla(ruta), df)
+    assert 'Convirtiendo' not in capsys.readouterr().out
+
+
+def test_reconvierte_si_el_csv_es_mas_nuevo(tmp_path, capsys):
+    ruta = str(tmp_path / 'B2C.csv')
+    _escribir_csv(ruta, semilla=0)
+    cargar_tabla(ruta)
+    capsys.readouterr()
+    cargar_tabla(ruta)
+    assert 'Convirtiendo' not in capsys.readouterr().out
+
+    nuevo = _escribir_csv(ruta, semilla=1)
+    esquema = os.path.join(ruta_columnar(ruta), ARCHIVO_ESQUEMA)
+    os.utime(ruta, (os.path.getmtime(esquema) + 10,) * 2)
+    pd.testing.assert_frame_equal(cargar_tabla(ruta), nuevo)
+    assert 'Convirtiendo' in capsys.readouterr().out
+
+
+def test_reconvierte_si_cambia_el_dtype(tmp_path, capsys):
+    ruta = str(tmp_path / 'B2C.csv')
+    df = _escribir_csv(ruta)
+    cargar_tabla(ruta)
+    capsys.readouterr()
+
+    cargado = cargar_tabla(ruta, dtype='float32')
+    assert 'Convirtiendo' in capsys.readouterr().out
+    assert leer_esquema(ruta_columnar(ruta))['dtype'] == 'float32'
+    assert all(cargado[col].dtype == np.float32 for col in cargado.columns)
+    np.testing.assert_array_equal(cargado['x_1'].to_numpy(), df['x_1'].to_numpy(dtype=np.float32))
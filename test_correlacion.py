@@ -0,0 +1,53 @@
+# test_correlacion.py
+import numpy as np
+import pandas as pd
+import pytest
+from alg import df_quartile, nombres_escalera, fraccion_particion
+from correlacion import (matrices_distancia_lote, matrices_distancia_particiones,
+                         distancia_desde_correlacion)
+
+
+def _datos(n=400, p=6, semilla=0, con_nan=False):
+    rng = np.random.default_rng(semilla)
+    x = rng.normal(size=(n, p))
+    x[:, 1] -= 0.7 * x[:, 0]
+    df = pd.DataFrame(x, columns=[f'x_{i}' for i in range(p)])
+    df['target_y'] = x[:, 0] + x[:, 2] + rng.normal(0, 0.1, n)
+    if con_nan:
+        df.iloc[rng.choice(n, 40, replace=False), 2] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('metodo', ['absoluta', 'directa'])
+@pytest.mark.parametrize('con_nan', [False, True])
+def test_lote_igual_que_corr(metodo, con_nan):
+    df = _datos(con_nan=con_nan)
+    indices = np.random.default_rng(1).choice(len(df), 150, replace=False)
+    # Prefijos, rangos y slices del mismo tamaño se apilan en un solo matmul
+    particiones = [100, (100, 200), slice(250, 350), indices, 400]
+    tensor, columnas = matrices_distancia_lote(df, particiones, metodo)
+    assert columnas == list(df.columns)
+
+    esperadas = [df.iloc[:100], df.iloc[100:200], df.iloc[250:350], df.iloc[indices], df]
+    for matriz, parte in zip(tensor, esperadas):
+        np.testing.assert_allclose(
+            matriz, distancia_desde_correlacion(parte.corr(), metodo).to_numpy(), atol=1e-10)
+
+
+def test_particiones_igual_que_corr():
+    df = _datos(con_nan=True)
+    nombres = ['df_original'] + nombres_escalera()
+    distancias = matrices_distancia_particiones(df, nombres, 'directa')
+    for nombre in nombres:
+        if nombre == 'df_original':
+            parte = df
+        else:
+            parte = df_quartile(df, 'target_y', porc=fraccion_particion(nombre),
+                                quartile='first', ascending=nombre[0] == 'W')
+        np.testing.assert_allclose(distancias[nombre].to_numpy(),
+                                   (1 - parte.corr()).to_numpy(), atol=1e-10)
+
+
+def test_metodo_invalido():
+    with pytest.raises(ValueError):
+        distancia_desde_correlacion(np.eye(2), 'otra')
@@ -0,0 +1,65 @@
+# test_correlacion_dispersa.py
+import numpy as np
+import pandas as pd
+import pytest
+from correlacion_dispersa import (correlacion_dispersa, guardar_correlacion_dispersa,
+                                  cargar_correlacion_dispersa, listar_correlaciones_dispersas)
+from correlacion_knn import vecinos_correlacion
+
+
+def _datos(n=300, p=30, semilla=0):
+    rng = np.random.default_rng(semilla)
+    latentes = rng.normal(size=(n, 4))
+    x = latentes[:, rng.integers(0, 4, p)] * rng.uniform(-1.0, 1.0, p) + \
+        0.5 * rng.normal(size=(n, p))
+    return pd.DataFrame(x, columns=[f'x_{i}' for i in range(p)])
+
+
+def _pares(resultado):
+    i, j, r = resultado.tripletas()
+    return {(resultado.etiquetas[a], resultado.etiquetas[b]): v for a, b, v in zip(i, j, r)}
+
+
+@pytest.mark.parametrize('metodo', ['absoluta', 'directa'])
+@pytest.mark.parametrize('tam_bloque, memoria_max', [(7, 2**30), (7, 1), (64, 2**30)])
+def test_umbral_igual_que_corr(metodo, tam_bloque, memoria_max):
+    df = _datos()
+    umbral = 0.4
+    resultado = correlacion_dispersa(df, umbral, metodo, tam_bloque=tam_bloque,
+                                     memoria_max=memoria_max)
+    corr = df.corr().to_numpy()
+    i, j = np.triu_indices(len(corr), k=1)
+    peso = np.abs(corr[i, j]) if metodo == 'absoluta' else corr[i, j]
+    esperado = {(df.columns[a], df.columns[b]): corr[a, b]
+                for a, b in zip(i[peso >= umbral], j[peso >= umbral])}
+
+    pares = _pares(resultado)
+    assert pares.keys() == esperado.keys()
+    np.testing.assert_allclose([pares[c] for c in esperado], list(esperado.values()), atol=1e-10)
+
+
+@pytest.mark.parametrize('k', [None, 3])
+def test_ida_y_vuelta(tmp_path, k):
+    df = _datos(semilla=1)
+    if k is None:
+        resultado = correlacion_dispersa(df, 0.3, 'directa')
+    else:
+        resultado = vecinos_correlacion(df, k=k)
+    metadatos = {'dataset': 'B2C', 'medida': 'pearson'}
+    guardar_correlacion_dispersa(resultado, 'B2C_prueba', str(tmp_path), metadatos=metadatos)
+    cargada = cargar_correlacion_dispersa('B2C_prueba', str(tmp_path))
+
+    assert cargada.etiquetas == resultado.etiquetas
+    assert (cargada.umbral, cargada.metodo, cargada.k) == \
+        (resultado.umbral, resultado.metodo, resultado.k)
+    assert {c: cargada.descripcion[c] for c in metadatos} == metadatos
+    assert _pares(cargada) == _pares(resultado)
+    assert listar_correlaciones_dispersas(str(tmp_path)) == ['B2C_prueba']
+
+
+def test_umbral_invalido():
+    with pytest.raises(ValueError):
+        correlacion_dispersa(_datos(), 0.0)
+    resultado = correlacion_dispersa(_datos(), 0.5)
+    with pytest.raises(ValueError):
+        resultado.tripletas(0.3)
@@ -0,0 +1,46 @@
+# test_correlacion_knn.py
+import numpy as np
+import pandas as pd
+import pytest
+from correlacion_knn import vecinos_correlacion, recall_vecinos
+
+
+def _datos(n=300, p=20, semilla=2):
+    rng = np.random.default_rng(semilla)
+    latentes = rng.normal(size=(n, 4))
+    x = latentes[:, rng.integers(0, 4, p)] * rng.uniform(-1.0, 1.0, p) + \
+        0.5 * rng.normal(size=(n, p))
+    return pd.DataFrame(x, columns=[f'x_{i}' for i in range(p)])
+
+
+def _pares(resultado):
+    i, j, r = resultado.tripletas()
+    return {(resultado.etiquetas[a], resultado.etiquetas[b]): v for a, b, v in zip(i, j, r)}
+
+
+@pytest.mark.parametrize('tipo', ['proyeccion', 'simhash'])
+def test_exacto_con_candidatos_suficientes(tipo):
+    df = _datos()
+    # Con todas las columnas como candidatas la preselección no descarta nada
+    resultado = vecinos_correlacion(df, k=4, factor_candidatos=10, tipo=tipo)
+    assert recall_vecinos(df, resultado, n_muestra=20) == 1.0
+    corr = df.corr().to_numpy()
+    for (a, b), r in _pares(resultado).items():
+        assert r == pytest.approx(corr[df.columns.get_loc(a), df.columns.get_loc(b)], abs=1e-5)
+
+
+def test_por_losas_igual_que_en_memoria():
+    df = _datos(n=1000, p=30)
+    completo = vecinos_correlacion(df, k=3, factor_candidatos=2)
+    # memoria_max pequeña: losas de pocas filas y lotes de pares de un par
+    por_losas = vecinos_correlacion(df, k=3, factor_candidatos=2, memoria_max=4096)
+    a, b = _pares(completo), _pares(por_losas)
+    assert a.keys() == b.keys()
+    np.testing.assert_allclose([a[c] for c in a], [b[c] for c in a], atol=1e-5)
+    assert recall_vecinos(df, completo) == \
+        pytest.approx(recall_vecinos(df, completo, memoria_max=4096))
+
+
+def test_tipo_invalido():
+    with pytest.raises(ValueError):
+        vecinos_correlacion(_datos(), tipo='otro')
@@ -0,0 +1,46 @@
+# test_correlacion_prefijos.py
+import numpy as np
+import pandas as pd
+import pytest
+from alg import df_quartile, nombres_escalera, fraccion_particion
+from correlacion_prefijos import CorrelacionPrefijos
+
+
+def _datos(n=400, p=6, semilla=0, con_nan=False):
+    rng = np.random.default_rng(semilla)
+    x = rng.normal(size=(n, p))
+    x[:, 1] += 0.8 * x[:, 0]
+    df = pd.DataFrame(x, columns=[f'x_{i}' for i in range(p)])
+    df['target_y'] = x[:, 0] - x[:, 2] + rng.normal(0, 0.1, n)
+    if con_nan:
+        df.iloc[rng.choice(n, 30, replace=False), 3] = np.nan
+        df.iloc[rng.choice(n, 10, replace=False), -1] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('con_nan', [False, True])
+def test_particiones_igual_que_corr(con_nan):
+    df = _datos(con_nan=con_nan)
+    motor = CorrelacionPrefijos(df, 'target_y', tam_bloque=64)
+    for nombre in nombres_escalera():
+        esperado = df_quartile(df, 'target_y', porc=fraccion_particion(nombre), quartile='first',
+                               ascending=nombre[0] == 'W').corr()
+        np.testing.assert_allclose(motor.particion(nombre).to_numpy(), esperado.to_numpy(),
+                                   atol=1e-10)
+
+
+def test_ventanas_y_barrido_igual_que_corr():
+    df = _datos(n=300)
+    cortes = np.linspace(0, 300, 7).astype(int)
+    motor = CorrelacionPrefijos(df, 'target_y', cortes=cortes)
+    ordenado = df.sort_values('target_y', ascending=False).reset_index(drop=True)
+
+    np.testing.assert_allclose(motor.correlacion(50, 250).to_numpy(),
+                               ordenado.iloc[50:250].corr().to_numpy(), atol=1e-10)
+    for corte, matriz in zip(*motor.barrido(desde=100)):
+        np.testing.assert_allclose(matriz, ordenado.iloc[100:corte].corr().to_numpy(), atol=1e-10)
+
+
+def test_corte_fuera_de_rango():
+    with pytest.raises(ValueError):
+        CorrelacionPrefijos(_datos(n=50), 'target_y', cortes=[60])
@@ -0,0 +1,50 @@
+# test_correlacion_streaming.py
+import numpy as np
+import pandas as pd
+import pytest
+from columnar import EscritorColumnar
+from correlacion_streaming import AcumuladorPearson, correlacion_bloques, acumular_columnar
+
+
+def _datos(n=500, p=5, semilla=0, con_nan=False):
+    rng = np.random.default_rng(semilla)
+    x = rng.normal(loc=100.0, scale=3.0, size=(n, p))
+    x[:, 1] += 2.0 * x[:, 0]
+    if con_nan:
+        x[rng.random(x.shape) < 0.05] = np.nan
+    return pd.DataFrame(x, columns=[f'x_{i}' for i in range(p)])
+
+
+@pytest.mark.parametrize('con_nan', [False, True])
+@pytest.mark.parametrize('tam_bloque', [1, 37, 500])
+def test_bloques_igual_que_corr(con_nan, tam_bloque):
+    df = _datos(con_nan=con_nan)
+    bloques = (df.iloc[i:i + tam_bloque] for i in range(0, len(df), tam_bloque))
+    resultado = correlacion_bloques(bloques, columnas=df.columns)
+    np.testing.assert_allclose(resultado.to_numpy(), df.corr().to_numpy(), atol=1e-10)
+    assert list(resultado.columns) == list(df.columns)
+
+
+def test_fusionar_igual_que_una_pasada():
+    df = _datos(con_nan=True)
+    a, b = AcumuladorPearson(df.columns), AcumuladorPearson(df.columns)
+    a.actualizar(df.iloc[:123])
+    b.actualizar(df.iloc[123:])
+    np.testing.assert_allclose(a.fusionar(b).correlacion().to_numpy(), df.corr().to_numpy(),
+                               atol=1e-10)
+    np.testing.assert_allclose(a.covarianza().to_numpy(), df.cov().to_numpy(), atol=1e-8)
+
+
+def test_acumulador_vacio():
+    with pytest.raises(ValueError):
+        AcumuladorPearson().correlacion()
+
+
+def test_columnar_igual_que_corr(tmp_path):
+    df = _datos(n=1000)
+    escritor = EscritorColumnar(tmp_path / 'tabla', df.columns, len(df))
+    escritor.escribir(df.to_numpy())
+    escritor.cerrar()
+    acumulador = acumular_columnar(tmp_path / 'tabla', n_procesos=1, tam_bloque=128)
+    np.testing.assert_allclose(acumulador.correlacion().to_numpy(), df.corr().to_numpy(),
+                               atol=1e-10)
@@ -0,0 +1,97 @@
+# test_dependencia.py
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import kendalltau, spearmanr
+from dependencia import spearman, kendall, dcor, parcial, matriz_dependencia
+
+
+def _valores(n=60, semilla=0, con_nan=False):
+    """Columnas continuas, dependientes y con empates (discretas)"""
+    rng = np.random.default_rng(semilla)
+    x = rng.normal(size=n)
+    valores = np.column_stack([
+        x,
+        x ** 2 + 0.3 * rng.normal(size=n),
+        rng.normal(size=n),
+        rng.integers(0, 4, size=n).astype(float),
+        np.round(x + rng.normal(size=n))
+    ])
+    if con_nan:
+        valores[rng.random(valores.shape) < 0.1] = np.nan
+    return valores
+
+
+def _por_pares(valores, funcion):
+    """Matriz de referencia par a par con las filas completas de cada par"""
+    p = valores.shape[1]
+    matriz = np.eye(p)
+    for i in range(p):
+        for j in range(i + 1, p):
+            completas = ~np.isnan(valores[:, i]) & ~np.isnan(valores[:, j])
+            matriz[i, j] = matriz[j, i] = funcion(valores[completas, i], valores[completas, j])
+    return matriz
+
+
+def _dcor_ingenuo(x, y):
+    """Correlación de distancia (estadístico V) con las matrices n x n doblemente centradas"""
+    def centrada(v):
+        d = np.abs(v[:, None] - v[None, :])
+        return d - d.mean(axis=0) - d.mean(axis=1)[:, None] + d.mean()
+    a, b = centrada(x), centrada(y)
+    return np.sqrt((a * b).mean() / np.sqrt((a * a).mean() * (b * b).mean()))
+
+
+@pytest.mark.parametrize('con_nan', [False, True])
+@pytest.mark.parametrize('memoria_max', [None, 1])
+def test_spearman_kendall_igual_que_scipy(con_nan, memoria_max):
+    valores = _valores(con_nan=con_nan)
+    opciones = {} if memoria_max is None else {'memoria_max': memoria_max}
+    np.testing.assert_allclose(spearman(valores, **opciones),
+                               _por_pares(valores, lambda x, y: spearmanr(x, y).statistic),
+                               atol=1e-12)
+    np.testing.assert_allclose(kendall(valores, **opciones),
+                               _por_pares(valores, lambda x, y: kendalltau(x, y).statistic),
+                               atol=1e-12)
+
+
+@pytest.mark.parametrize('con_nan', [False, True])
+def test_dcor_igual_que_ingenuo(con_nan):
+    valores = _valores(n=80, semilla=1, con_nan=con_nan)
+    np.testing.assert_allclose(dcor(valores), _por_pares(valores, _dcor_ingenuo), atol=1e-10)
+    np.testing.assert_allclose(dcor(valores, memoria_max=1), dcor(valores), atol=1e-12)
+
+
+def test_parcial_sin_contraccion_es_inversa_de_la_correlacion():
+    valores = _valores(n=200, semilla=2)
+    precision = np.linalg.inv(np.corrcoef(valores, rowvar=False))
+    diagonal = np.sqrt(np.diag(precision))
+    esperado = -precision / np.outer(diagonal, diagonal)
+    np.fill_diagonal(esperado, 1.0)
+    np.testing.assert_allclose(parcial(valores, contraccion=0), esperado, atol=1e-10)
+
+
+def test_parcial_columna_constante_queda_nan():
+    valores = _valores(n=50, semilla=3)
+    valores[:, 2] = 1.0
+    matriz = parcial(valores)
+    assert np.isnan(matriz[2]).all() and np.isnan(matriz[:, 2]).all()
+    assert np.isfinite(np.delete(np.delete(matriz, 2, axis=0), 2, axis=1)).all()
+
+
+@pytest.mark.parametrize('n', [30, 4])
+def test_parcial_ledoit_wolf_igual_que_sklearn(n):
+    covariance = pytest.importorskip('sklearn.covariance')
+    valores = np.random.default_rng(4).normal(size=(n, 8))
+    valores[:, 1] += valores[:, 0]
+    z = (valores - valores.mean(axis=0)) / valores.std(axis=0)
+    precision = np.linalg.inv(covariance.LedoitWolf().fit(z).covariance_)
+    diagonal = np.sqrt(np.diag(precision))
+    esperado = -precision / np.outer(diagonal, diagonal)
+    np.fill_diagonal(esperado, 1.0)
+    np.testing.assert_allclose(parcial(valores), esperado, atol=1e-10)
+
+
+def test_matriz_dependencia_medida_invalida():
+    with pytest.raises(ValueError):
+        matriz_dependencia(pd.DataFrame(_valores()), medida='otra')
@@ -0,0 +1,65 @@
+# test_generador_sintetico.py
+import numpy as np
+import pytest
+import generador_sintetico
+from columnar import abrir_columnas, leer_esquema
+from generador_sintetico import generar_columnar, modelo_main, modelo_aleatorio
+
+
+def _leer(carpeta):
+    return {col: np.array(valores) for col, valores in abrir_columnas(carpeta).items()}
+
+
+@pytest.fixture
+def unidades_pequenas(monkeypatch):
+    # Varias unidades de semilla con pocas filas
+    monkeypatch.setattr(generador_sintetico, 'FILAS_POR_SEMILLA', 64)
+
+
+@pytest.mark.parametrize('dtype', ['float64', 'float32'])
+def test_misma_salida_con_cualquier_tam_bloque(tmp_path, unidades_pequenas, dtype):
+    modelo = modelo_main()
+    referencia = None
+    for tam_bloque in (1000, 7, 64, 100, 333):
+        carpeta = str(tmp_path / f'bloque_{tam_bloque}')
+        generar_columnar(modelo, 1000, carpeta, tam_bloque=tam_bloque, semilla=3, dtype=dtype)
+        datos = _leer(carpeta)
+        if referencia is None:
+            referencia = datos
+            continue
+        assert datos.keys() == referencia.keys()
+        for col in referencia:
+            np.testing.assert_array_equal(datos[col], referencia[col])
+        assert (leer_esquema(carpeta)['desplazamientos'] ==
+                leer_esquema(str(tmp_path / 'bloque_1000'))['desplazamientos'])
+
+
+def test_semilla_distinta_cambia_la_salida(tmp_path):
+    modelo = modelo_aleatorio(10, semilla=0)
+    generar_columnar(modelo, 200, str(tmp_path / 'a'), semilla=1)
+    generar_columnar(modelo, 200, str(tmp_path / 'b'), semilla=2)
+    a, b = _leer(str(tmp_path / 'a')), _leer(str(tmp_path / 'b'))
+    assert not all(np.array_equal(a[col], b[col]) for col in a)
+
+
+@pytest.mark.parametrize('dtype', ['float64', 'float32'])
+def test_minimo_tras_desplazamiento(tmp_path, unidades_pequenas, dtype):
+    modelo = modelo_main()
+    opciones = dict(tam_bloque=100, semilla=5, dtype=dtype)
+    generar_columnar(modelo, 700, str(tmp_path / 'crudo'), positivos=False, **opciones)
+    generar_columnar(modelo, 700, str(tmp_path / 'positivo'), **opciones)
+    crudo, positivo = _leer(str(tmp_path / 'crudo')), _leer(str(tmp_path / 'positivo'))
+    desplazamientos = leer_esquema(str(tmp_path / 'positivo'))['desplazamientos']
+
+    for col in crudo:
+        assert positivo[col].dtype == np.dtype(dtype)
+        minimo = crudo[col].min()
+        if minimo < 0:
+            # col - min en el tipo de salida: el mínimo queda exactamente en 0
+            np.testing.assert_array_equal(positivo[col], crudo[col] - minimo)
+            assert positivo[col].min() == 0
+            assert desplazamientos[col] == -float(minimo)
+        else:
+            np.testing.assert_array_equal(positivo[col], crudo[col])
+            assert col not in desplazamientos
+        assert (positivo[col] >= 0).all()
@@ -0,0 +1,70 @@
+# test_grafo.py
+import numpy as np
+import pandas as pd
+import networkx as nx
+import pytest
+from grafo import barrido_umbral, matriz_a_grafo, matriz_a_grafo_csr
+from matriz_compacta import guardar_matriz_compacta, cargar_matriz_compacta
+
+UMBRALES = [0.95, 0.9, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.2, 0.1]
+
+
+def _matriz_distancia(p=40, semilla=0):
+    """Matriz de distancia 1 - |r| con grupos de variables correlacionadas"""
+    rng = np.random.default_rng(semilla)
+    latentes = rng.normal(size=(300, 5))
+    x = latentes[:, rng.integers(0, 5, p)] * rng.uniform(0.2, 1.0, p) + rng.normal(size=(300, p))
+    columnas = [f'x_{i}' for i in range(p)]
+    return 1 - pd.DataFrame(x, columns=columnas).corr().abs()
+
+
+def _desde_cero(matriz, umbral):
+    """Mismas columnas de barrido_umbral, reconstruyendo el grafo del umbral"""
+    G = matriz_a_grafo(matriz, umbral)
+    n = G.number_of_nodes()
+    return {
+        'umbral': umbral,
+        'n_aristas': G.number_of_edges(),
+        'densidad': nx.density(G),
+        'grado_promedio': 2 * G.number_of_edges() / n,
+        'n_componentes': nx.number_connected_components(G),
+        'tamano_componente_max': max(len(c) for c in nx.connected_components(G)),
+        'nodos_aislados': nx.number_of_isolates(G)
+    }
+
+
+@pytest.mark.parametrize('semilla', [0, 1, 2])
+def test_barrido_igual_que_recalcular(semilla):
+    matriz = _matriz_distancia(semilla=semilla)
+    curva = barrido_umbral(matriz, UMBRALES)
+    esperado = pd.DataFrame([_desde_cero(matriz, u) for u in sorted(UMBRALES, reverse=True)])
+    pd.testing.assert_frame_equal(curva, esperado, check_dtype=False)
+
+
+def test_barrido_misma_curva_para_cada_entrada(tmp_path):
+    matriz = _matriz_distancia(semilla=3)
+    guardar_matriz_compacta(matriz, 'prueba', str(tmp_path))
+    referencia = barrido_umbral(matriz, UMBRALES)
+
+    compacta = barrido_umbral(cargar_matriz_compacta('prueba', str(tmp_path)), UMBRALES)
+    pd.testing.assert_frame_equal(compacta, referencia)
+    # Con un GrafoCSR solo cuentan las aristas que ya tiene (umbral 0.1 aquí)
+    csr = barrido_umbral(matriz_a_grafo_csr(matriz, min(UMBRALES)), UMBRALES)
+    pd.testing.assert_frame_equal(csr, referencia)
+
+
+def test_barrido_umbrales_desordenados_y_repetidos():
+    matriz = _matriz_distancia(semilla=4)
+    curva = barrido_umbral(matriz, [0.3, 0.8, 0.3, 0.5])
+    assert curva['umbral'].tolist() == [0.8, 0.5, 0.3]
+    assert curva['n_aristas'].is_monotonic_increasing
+    assert curva['n_componentes'].is_monotonic_decreasing
+
+
+def test_barrido_sin_umbrales():
+    matriz = _matriz_distancia(semilla=5)
+    columnas = barrido_umbral(matriz, UMBRALES).columns
+    for entrada in (matriz, matriz_a_grafo_csr(matriz, 0.5)):
+        curva = barrido_umbral(entrada, [])
+        assert curva.empty
+        pd.testing.assert_index_equal(curva.columns, columnas)
@@ -0,0 +1,97 @@
+# test_grafo_csr.py
+import numpy as np
+import networkx as nx
+import pytest
+from grafo_csr import GrafoCSR
+from mst_kruskal import kruskal_csr
+
+
+def _grafo_aleatorio(n=60, p=0.08, semilla=0):
+    """Grafo de networkx con pesos distintos (MST único) y varias componentes"""
+    G = nx.gnp_random_graph(n, p, seed=semilla)
+    G = nx.relabel_nodes(G, {i: f'x_{i}' for i in G.nodes()})
+    rng = np.random.default_rng(semilla)
+    for (u, v), w in zip(G.edges(), rng.permutation(G.number_of_edges())):
+        peso = (w + 1) / (G.number_of_edges() + 1)
+        G[u][v]['weight'] = peso
+        G[u][v]['distance'] = 1.0 - peso
+    return G
+
+
+def _aristas(G):
+    return {frozenset((u, v)): (d['weight'], d['distance']) for u, v, d in G.edges(data=True)}
+
+
+@pytest.mark.parametrize('semilla', [0, 1, 2])
+def test_ida_y_vuelta_networkx(semilla):
+    G = _grafo_aleatorio(semilla=semilla)
+    csr = GrafoCSR.desde_networkx(G)
+    assert (csr.n_nodos, csr.n_aristas) == (G.number_of_nodes(), G.number_of_edges())
+    H = csr.a_networkx()
+    assert set(H.nodes()) == set(G.nodes())
+    assert _aristas(H) == _aristas(G)
+    assert dict(zip(csr.etiquetas.tolist(), csr.grado().tolist())) == dict(G.degree())
+
+
+@pytest.mark.parametrize('semilla', [0, 1, 2])
+def test_componentes_igual_que_networkx(semilla):
+    G = _grafo_aleatorio(semilla=semilla)
+    csr = GrafoCSR.desde_networkx(G)
+    n_componentes, etiqueta = csr.componentes()
+    assert n_componentes == nx.number_connected_components(G)
+    grupos = {}
+    for nodo, c in zip(csr.etiquetas.tolist(), etiqueta.tolist()):
+        grupos.setdefault(c, set()).add(nodo)
+    assert sorted(map(sorted, grupos.values())) == \
+        sorted(map(sorted, nx.connected_components(G)))
+
+
+@pytest.mark.parametrize('atributo', ['weight', 'distance'])
+@pytest.mark.parametrize('semilla', [0, 1, 2])
+def test_arbol_expansion_minimo_igual_que_networkx(atributo, semilla):
+    G = _grafo_aleatorio(semilla=semilla)
+    mst = GrafoCSR.desde_networkx(G).arbol_expansion_minimo(atributo=atributo)
+    esperado = nx.minimum_spanning_tree(G, weight=atributo)
+    assert _aristas(mst.a_networkx()) == _aristas(esperado)
+    # Bosque: se conservan los nodos aislados y una componente por árbol
+    assert mst.n_nodos == G.number_of_nodes()
+    assert mst.componentes()[0] == nx.number_connected_components(G)
+
+
+def test_kruskal_csr_acepta_networkx_y_csr():
+    G = _grafo_aleatorio(semilla=4)
+    desde_nx = kruskal_csr(G)
+    desde_csr = kruskal_csr(GrafoCSR.desde_networkx(G))
+    assert _aristas(desde_nx.a_networkx()) == _aristas(desde_csr.a_networkx())
+
+
+def test_distancias_y_camino_igual_que_networkx():
+    G = _grafo_aleatorio(n=40, p=0.15, semilla=5)
+    csr = GrafoCSR.desde_networkx(G)
+    origen = csr.indice('x_0')
+    esperadas = nx.single_source_shortest_path_length(G, 'x_0')
+    distancias = csr.distancias_topologicas(origen)
+    for i, nodo in enumerate(csr.etiquetas.tolist()):
+        assert distancias[i] == esperadas.get(nodo, np.inf)
+
+    destino = max(esperadas, key=esperadas.get)
+    camino = csr.camino(origen, csr.indice(destino))
+    assert len(camino) - 1 == esperadas[destino]
+    assert all(G.has_edge(csr.etiquetas[a], csr.etiquetas[b]) for a, b in zip(camino, camino[1:]))
+
+
+def test_camino_mas_largo_de_un_arbol():
+    arbol = nx.minimum_spanning_tree(_grafo_aleatorio(n=30, p=0.3, semilla=6))
+    csr = GrafoCSR.desde_networkx(arbol)
+    camino, longitud, (a, b) = csr.camino_mas_largo()
+    assert longitud == nx.diameter(arbol)
+    assert (camino[0], camino[-1]) == (a, b)
+
+
+def test_guardar_y_cargar(tmp_path):
+    csr = GrafoCSR.desde_networkx(_grafo_aleatorio(semilla=7))
+    ruta = csr.guardar(str(tmp_path / 'grafo_prueba'))
+    cargado = GrafoCSR.cargar(ruta)
+    assert cargado.etiquetas.tolist() == csr.etiquetas.tolist()
+    for atributo in ('indptr', 'indices', 'weight', 'distance'):
+        np.testing.assert_array_equal(getattr(cargado, atributo), getattr(csr, atributo))
@@ -0,0 +1,53 @@
+# test_matriz_compacta.py
+import numpy as np
+import pandas as pd
+import pytest
+from matriz_compacta import (guardar_matriz_compacta, cargar_matriz_compacta,
+                             listar_matrices_compactas)
+
+
+def _matriz(n=25, semilla=0):
+    x = np.random.default_rng(semilla).normal(size=(200, n))
+    return 1 - pd.DataFrame(x, columns=[f'x_{i}' for i in range(n)]).corr().abs()
+
+
+@pytest.mark.parametrize('dtype, tolerancia', [('float64', 0), ('float32', 1e-7),
+                                               ('float16', 1e-3)])
+def test_ida_y_vuelta(tmp_path, dtype, tolerancia):
+    matriz = _matriz()
+    guardar_matriz_compacta(matriz, 'B2C_directa', str(tmp_path), dtype=dtype)
+    compacta = cargar_matriz_compacta('B2C_directa', str(tmp_path))
+
+    assert compacta.shape == matriz.shape
+    assert compacta.columns.tolist() == matriz.columns.tolist()
+    assert compacta.triangulo.dtype == np.dtype(dtype)
+    np.testing.assert_allclose(compacta.a_dataframe().to_numpy(), matriz.to_numpy(),
+                               atol=tolerancia)
+
+
+def test_accesos_sin_reconstruir(tmp_path):
+    matriz = _matriz(n=12, semilla=1)
+    guardar_matriz_compacta(matriz, 'prueba', str(tmp_path))
+    compacta = cargar_matriz_compacta('prueba', str(tmp_path))
+    valores = matriz.to_numpy()
+
+    for i in (0, 5, 11):
+        np.testing.assert_array_equal(compacta.fila(i), valores[i])
+        np.testing.assert_array_equal(compacta.fila_superior(i), valores[i, i:])
+    assert compacta.valor('x_7', 'x_2') == valores[7, 2]
+    np.testing.assert_array_equal(compacta.bloque([3, 9], ['x_0', 'x_10']),
+                                  valores[np.ix_([3, 9], [0, 10])])
+
+
+def test_metadatos_en_el_json(tmp_path):
+    metadatos = {'dataset': 'B2C', 'medida': 'spearman', 'metodo': 'directa'}
+    guardar_matriz_compacta(_matriz(n=4), 'B2C_spearman_directa', str(tmp_path),
+                            metadatos=metadatos)
+    compacta = cargar_matriz_compacta('B2C_spearman_directa', str(tmp_path))
+    assert {c: compacta.descripcion[c] for c in metadatos} == metadatos
+    assert listar_matrices_compactas(str(tmp_path)) == ['B2C_spearman_directa']
+
+
+def test_matriz_no_cuadrada(tmp_path):
+    with pytest.raises(ValueError):
+        guardar_matriz_compacta(np.zeros((3, 4)), 'mal', str(tmp_path))
@@ -0,0 +1,69 @@
+# test_metricas_dispersas.py
+import numpy as np
+import networkx as nx
+import pytest
+from grafo_csr import GrafoCSR
+from metricas_dispersas import (adyacencia, clustering, numero_nucleo, centralidades_muestreadas,
+                                metricas_dispersas)
+
+
+def _grafos():
+    """Grafos aleatorios, uno de ellos con varias componentes y nodos aislados"""
+    desconectado = nx.disjoint_union(nx.gnp_random_graph(25, 0.2, seed=3),
+                                     nx.barabasi_albert_graph(20, 2, seed=4))
+    desconectado.add_nodes_from([100, 101])
+    return {
+        'gnp': nx.gnp_random_graph(40, 0.15, seed=1),
+        'barabasi': nx.barabasi_albert_graph(50, 3, seed=2),
+        'desconectado': desconectado,
+        'karate': nx.karate_club_graph()
+    }
+
+
+def _por_nodo(grafo, valores):
+    return dict(zip(grafo.etiquetas.tolist(), np.asarray(valores).tolist()))
+
+
+def _comparar(obtenido, esperado):
+    assert obtenido.keys() == esperado.keys()
+    np.testing.assert_allclose([obtenido[n] for n in esperado], list(esperado.values()),
+                               atol=1e-10)
+
+
+@pytest.mark.parametrize('nombre', list(_grafos()))
+def test_exacto_igual_que_networkx(nombre):
+    G = _grafos()[nombre]
+    grafo = GrafoCSR.desde_networkx(G)
+    centralidades = centralidades_muestreadas(grafo, n_pivotes=grafo.n_nodos)
+    assert centralidades['n_pivotes'] == grafo.n_nodos
+    assert centralidades['error_intermediacion'] == 0.0
+
+    _comparar(_por_nodo(grafo, centralidades['intermediacion']), nx.betweenness_centrality(G))
+    _comparar(_por_nodo(grafo, centralidades['cercania']), nx.closeness_centrality(G))
+    _comparar(_por_nodo(grafo, clustering(adyacencia(grafo))), nx.clustering(G))
+    _comparar(_por_nodo(grafo, numero_nucleo(grafo)), nx.core_number(G))
+
+
+def test_muestreado_dentro_de_la_cota():
+    G = nx.barabasi_albert_graph(300, 3, seed=5)
+    grafo = GrafoCSR.desde_networkx(G)
+    centralidades = centralidades_muestreadas(grafo, n_pivotes=100, semilla=0)
+    exacta = nx.betweenness_centrality(G)
+    error = max(abs(v - exacta[n]) for n, v in
+                _por_nodo(grafo, centralidades['intermediacion']).items())
+    assert 0 < centralidades['error_intermediacion']
+    assert error <= centralidades['error_intermediacion']
+
+
+def test_metricas_igual_que_networkx():
+    G = _grafos()['desconectado']
+    for u, v in G.edges():
+        G[u][v]['weight'] = 0.5
+    metricas = metricas_dispersas(G, 'prueba', n_pivotes=1000)
+    assert metricas['n_componentes'] == nx.number_connected_components(G)
+    assert metricas['clustering_promedio'] == pytest.approx(nx.average_clustering(G))
+    assert metricas['nucleo_max'] == max(nx.core_number(G).values())
+    assert metricas['fuerza_promedio'] == pytest.approx(
+        np.mean([d for _, d in G.degree(weight='weight')]))
+    assert metricas['intermediacion_max'] == pytest.approx(
+        max(nx.betweenness_centrality(G).values()))
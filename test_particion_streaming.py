@@ -0,0 +1,80 @@
+# test_particion_streaming.py
+import numpy as np
+import pandas as pd
+import pytest
+from particion_streaming import SketchKLL, k_para_error, particionar_csv_streaming
+
+CUANTILES = np.linspace(0.01, 0.99, 99)
+
+
+def _error_rango(ordenados, valores, qs):
+    """Error normalizado de rango de cada valor estimado respecto a su cuantil"""
+    rangos = np.searchsorted(ordenados, valores, side='right') / len(ordenados)
+    return np.abs(rangos - qs)
+
+
+@pytest.mark.parametrize('semilla', [0, 1, 2])
+@pytest.mark.parametrize('epsilon', [0.01, 0.005])
+def test_error_dentro_de_la_cota(semilla, epsilon):
+    rng = np.random.default_rng(semilla)
+    datos = rng.lognormal(size=200_000)
+    sketch = SketchKLL(k=k_para_error(epsilon), semilla=semilla)
+    for inicio in range(0, len(datos), 7_000):
+        sketch.actualizar(datos[inicio:inicio + 7_000])
+
+    assert sketch.n == len(datos)
+    assert sketch.error_rango() <= epsilon
+    errores = _error_rango(np.sort(datos), sketch.cuantiles(CUANTILES), CUANTILES)
+    assert errores.max() <= epsilon
+
+
+def test_memoria_acotada():
+    sketch = SketchKLL(k=200, semilla=0)
+    sketch.actualizar(np.random.default_rng(0).normal(size=500_000))
+    # O(k): la suma geométrica de capacidades es ~ k / (1 - c) más un mínimo por nivel
+    assert sum(len(b) for b in sketch.niveles) <= 3 * 200 + 2 * len(sketch.niveles)
+
+
+def test_fusionar_dentro_de_la_cota():
+    rng = np.random.default_rng(3)
+    datos = rng.normal(size=(4, 50_000))
+    epsilon = 0.01
+    sketch = SketchKLL(k=k_para_error(epsilon), semilla=0)
+    for i, trozo in enumerate(datos):
+        parcial = SketchKLL(k=sketch.k, semilla=i + 1)
+        parcial.actualizar(trozo)
+        sketch.fusionar(parcial)
+
+    assert sketch.n == datos.size
+    errores = _error_rango(np.sort(datos.ravel()), sketch.cuantiles(CUANTILES), CUANTILES)
+    assert errores.max() <= epsilon
+
+
+def test_ignora_nan_y_vacio():
+    sketch = SketchKLL(k=50)
+    with pytest.raises(ValueError):
+        sketch.cuantiles(0.5)
+    sketch.actualizar([np.nan, 1.0, np.nan, 3.0])
+    assert sketch.n == 2
+    with pytest.raises(ValueError):
+        k_para_error(1.5)
+
+
+def test_particionar_csv_dentro_de_la_cota(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 40_000
+    df = pd.DataFrame({'x_1': rng.normal(size=n), 'target_y': rng.gamma(2.0, size=n)})
+    ruta = tmp_path / 'df_original.csv'
+    df.to_csv(ruta, index=False)
+
+    epsilon = 0.01
+    resumen = particionar_csv_streaming(ruta, tmp_path / 'salida', chunksize=5_000,
+                                        epsilon=epsilon)
+    assert (resumen['error_rango'] <= epsilon).all()
+    for fila in resumen.itertuples():
+        particion = pd.read_csv(fila.archivo)
+        assert len(particion) == fila.filas
+        if fila.particion.startswith('B'):
+            assert particion['target_y'].min() >= fila.corte
+        else:
+            assert particion['target_y'].max() <= fila.corte
@@ -0,0 +1,78 @@
+# test_render.py
+import os
+import sys
+import importlib
+import numpy as np
+from render import TrabajoRender, renderizar, huella_codigo
+
+
+def visualizar_prueba(nombre, valores, carpeta, mostrar=True, dpi=300, formato='png'):
+    """Función de render mínima: escribe los valores en un archivo de texto"""
+    ruta = os.path.join(carpeta, f"{nombre}.{formato}.txt")
+    with open(ruta, 'w') as f:
+        f.write(f"{dpi} {np.asarray(valores).tolist()}")
+    return ruta
+
+
+def _renderizar(trabajos, indice, **opciones):
+    resultado = renderizar(trabajos, nivel='borrador', n_procesos=1, ruta_indice=str(indice),
+                           **opciones)
+    return resultado['estado'].tolist()
+
+
+def test_omite_sin_cambios_y_regenera_al_cambiar(tmp_path):
+    indice = tmp_path / 'cache_render' / 'indice.json'
+    v1 = TrabajoRender(visualizar_prueba, ('g', np.arange(3), str(tmp_path)))
+
+    assert _renderizar([v1], indice) == ['generada']
+    assert _renderizar([v1], indice) == ['omitida']
+    # Otro nivel de render es otra huella
+    assert renderizar([v1], nivel='normal', n_procesos=1,
+                      ruta_indice=str(indice))['estado'].tolist() == ['generada']
+    assert _renderizar([v1], indice, forzar=True) == ['generada']
+
+
+def test_ruta_sobrescrita_por_otro_trabajo(tmp_path):
+    indice = tmp_path / 'indice.json'
+    v1 = TrabajoRender(visualizar_prueba, ('g', np.arange(3), str(tmp_path)))
+    v2 = TrabajoRender(visualizar_prueba, ('g', np.arange(4), str(tmp_path)))
+    ruta = os.path.join(str(tmp_path), 'g.png.txt')
+
+    assert _renderizar([v1], indice) == ['generada']
+    assert _renderizar([v2], indice) == ['generada']
+    # v1 y v2 escriben la misma ruta: volver a v1 debe regenerar el archivo
+    assert _renderizar([v1], indice) == ['generada']
+    assert open(ruta).read().endswith('[0, 1, 2]')
+    assert _renderizar([v1], indice) == ['omitida']
+
+
+def test_archivo_modificado_o_borrado(tmp_path):
+    indice = tmp_path / 'indice.json'
+    trabajo = TrabajoRender(visualizar_prueba, ('g', np.arange(3), str(tmp_path)))
+    ruta = os.path.join(str(tmp_path), 'g.png.txt')
+    _renderizar([trabajo], indice)
+
+    os.utime(ruta, ns=(0, os.stat(ruta).st_mtime_ns + 10**9))
+    assert _renderizar([trabajo], indice) == ['generada']
+    os.remove(ruta)
+    assert _renderizar([trabajo], indice) == ['generada']
+    assert os.path.exists(ruta)
+
+
+def test_huella_codigo_incluye_modulos_importados(tmp_path, monkeypatch):
+    (tmp_path / 'auxiliar_prueba.py').write_text("ESCALA = 1\n")
+    (tmp_path / 'figuras_prueba.py').write_text(
+        "import auxiliar_prueba\n\n"
+        "def visualizar(mostrar=True, dpi=300, formato='png'):\n"
+        "    return auxiliar_prueba.ESCALA\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    modulo = importlib.import_module('figuras_prueba')
+    try:
+        antes = huella_codigo(modulo.visualizar)
+        assert huella_codigo(modulo.visualizar) == antes
+        # Editar solo el módulo auxiliar invalida las figuras
+        (tmp_path / 'auxiliar_prueba.py').write_text("ESCALA = 2\n")
+        assert huella_codigo(modulo.visualizar) != antes
+    finally:
+        sys.modules.pop('figuras_prueba', None)
+        sys.modules.pop('auxiliar_prueba', None)
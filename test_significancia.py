@@ -0,0 +1,71 @@
+# test_significancia.py
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import kstest, spearmanr
+from significancia import significancia_correlacion
+
+
+def _independientes(n=80, p=20, semilla=0):
+    x = np.random.default_rng(semilla).normal(size=(n, p))
+    return pd.DataFrame(x, columns=[f'x_{i}' for i in range(p)])
+
+
+def _correlacionados(n=150, semilla=1):
+    rng = np.random.default_rng(semilla)
+    x = rng.normal(size=n)
+    return pd.DataFrame({'a': x, 'b': x + 0.5 * rng.normal(size=n), 'c': rng.normal(size=n)})
+
+
+def test_p_valores_uniformes_bajo_independencia():
+    resultado = significancia_correlacion(_independientes(), n_remuestreos=499,
+                                          tipo='permutacion', metodo='absoluta')
+    p_valores = resultado['p_valor'].to_numpy()
+    assert len(p_valores) == 190
+    assert kstest(p_valores, 'uniform').pvalue > 0.01
+    assert resultado['significativa'].mean() < 0.15
+
+
+def test_detecta_correlacion():
+    resultado = significancia_correlacion(_correlacionados(), n_remuestreos=199,
+                                          pares=[('a', 'b')], metodo='directa')
+    assert resultado['p_valor'].iloc[0] == pytest.approx(1 / 200)
+    assert resultado['significativa'].iloc[0]
+
+
+@pytest.mark.parametrize('tipo', ['permutacion', 'bootstrap'])
+def test_igual_con_varios_procesos(tipo):
+    df = _independientes(n=60, p=6)
+    # memoria_max pequeña: varios lotes que se reparten entre los procesos
+    opciones = dict(n_remuestreos=200, tipo=tipo, semilla=7, memoria_max=20_000)
+    uno = significancia_correlacion(df, n_procesos=1, **opciones)
+    varios = significancia_correlacion(df, n_procesos=3, **opciones)
+    pd.testing.assert_frame_equal(uno, varios)
+
+
+def test_intervalo_bootstrap_contiene_r():
+    df = pd.concat([_correlacionados(), _independientes(n=150, p=4)], axis=1)
+    resultado = significancia_correlacion(df, n_remuestreos=400, tipo='bootstrap')
+    assert ((resultado['ic_inferior'] <= resultado['r']) &
+            (resultado['r'] <= resultado['ic_superior'])).all()
+    fila = resultado[(resultado['origen'] == 'a') & (resultado['destino'] == 'b')].iloc[0]
+    assert fila['ic_inferior'] > 0 and fila['significativa']
+
+
+def test_spearman_usa_rangos():
+    df = _correlacionados()
+    df['b'] = np.exp(3 * df['b'])
+    resultado = significancia_correlacion(df, n_remuestreos=10, medida='spearman',
+                                          metodo='directa')
+    esperado = spearmanr(df).statistic
+    np.testing.assert_allclose(resultado['r'], esperado[np.triu_indices(3, k=1)], atol=1e-12)
+
+
+def test_parametros_invalidos():
+    df = _correlacionados()
+    with pytest.raises(ValueError):
+        significancia_correlacion(df, tipo='jackknife')
+    with pytest.raises(ValueError):
+        significancia_correlacion(df, medida='kendall')
+    with pytest.raises(ValueError):
+        significancia_correlacion(df, metodo='otro')
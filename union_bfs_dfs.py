@@ -3,6 +3,8 @@ import pandas as pd
 import os
 import glob
 from pathlib import Path
+from alg import pares_escalera
+from almacen_particiones import escalera_actual
 
 def cargar_variables_bfs_bic():
     """
@@ -14,8 +16,8 @@ def cargar_variables_bfs_bic():
     
     variables_bfs_bic = {}
     
-    # Configuraciones BiC a procesar
-    configuraciones_bic = ['B2C', 'B4C', 'B8C', 'B16C']
+    # Configuraciones BiC a procesar (descubiertas a partir de la escalera)
+    configuraciones_bic = [config_b for config_b, _ in pares_escalera(escalera_actual())]
     
     for config in configuraciones_bic:
         print(f"\n📂 Buscando archivos BFS para {config}...")
@@ -64,8 +66,8 @@ def cargar_variables_dfs_wic():
     
     variables_dfs_wic = {}
     
-    # Configuraciones WiC a procesar
-    configuraciones_wic = ['W2C', 'W4C', 'W8C', 'W16C']
+    # Configuraciones WiC a procesar (descubiertas a partir de la escalera)
+    configuraciones_wic = [config_w for _, config_w in pares_escalera(escalera_actual())]
     
     for config in configuraciones_wic:
         print(f"\n📂 Buscando archivos DFS para {config}...")
@@ -116,12 +118,7 @@ def calcular_uniones_por_configuracion(variables_bfs_bic, variables_dfs_wic):
     uniones_por_config = {}
     
     # Pares correspondientes (B2C-W2C, B4C-W4C, etc.)
-    pares_config = [
-        ('B2C', 'W2C'),
-        ('B4C', 'W4C'),
-        ('B8C', 'W8C'),
-        ('B16C', 'W16C')
-    ]
+    pares_config = pares_escalera(escalera_actual())
     
     for config_b, config_w in pares_config:
         print(f"\n🔗 Calculando {config_b} ∪ {config_w}...")
@@ -381,7 +378,7 @@ def generar_reporte_estadisticas(variables_bfs_bic, variables_dfs_wic,
     total_variables_b = 0
     total_variables_w = 0
     
-    for config in ['B2C', 'B4C', 'B8C', 'B16C']:
+    for config, _ in pares_escalera(escalera_actual()):
         if config in variables_bfs_bic:
             count = len(variables_bfs_bic[config])
             total_variables_b += count
@@ -389,7 +386,7 @@ def generar_reporte_estadisticas(variables_bfs_bic, variables_dfs_wic,
     
     print("-" * 40)
     
-    for config in ['W2C', 'W4C', 'W8C', 'W16C']:
+    for _, config in pares_escalera(escalera_actual()):
         if config in variables_dfs_wic:
             count = len(variables_dfs_wic[config])
             total_variables_w += count